@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                              MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+name: zia_metrics
+type: aggregate
+short_description: Summarizes the ZIA API calls made by each play
+version_added: "1.4.0"
+description:
+  - Aggregates the C(_zia_metrics) entries returned by the modules of the collection
+    when C(ZIA_METRICS=true) is set on the host running the modules.
+  - At the end of every play it displays the total number of API calls, the time spent
+    in the API, the number of rate limited (429) responses, how the sessions were
+    obtained and the endpoints that took the most time.
+  - Rate limited responses are counted when the request scheduler retries them, which
+    it does unless C(ZIA_RATE_LIMIT=false) is set. The SDK retries them out of sight otherwise.
+requirements:
+  - Enable the callback in C(ansible.cfg) with C(callbacks_enabled = zscaler.ziacloud.zia_metrics).
+options:
+  top:
+    description: Number of endpoints displayed, sorted by total time.
+    type: int
+    default: 10
+    env:
+      - name: ZIA_METRICS_TOP
+    ini:
+      - section: callback_zia_metrics
+        key: top
+  output:
+    description:
+      - Path of a JSON file receiving the aggregated metrics of every play.
+    type: path
+    env:
+      - name: ZIA_METRICS_OUTPUT
+    ini:
+      - section: callback_zia_metrics
+        key: output
+"""
+
+import json
+
+from ansible.plugins.callback import CallbackBase
+
+
+class CallbackModule(CallbackBase):
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = "aggregate"
+    CALLBACK_NAME = "zscaler.ziacloud.zia_metrics"
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self, *args, **kwargs):
+        super(CallbackModule, self).__init__(*args, **kwargs)
+        self._play = None
+        self._plays = []
+
+    @staticmethod
+    def _new_play(name):
+        return {
+            "name": name,
+            "tasks": 0,
+            "task_time": 0.0,
+            "calls": 0,
+            "latency": 0.0,
+            "throttled": 0,
+            "logins": {},
+            "login_time": 0.0,
+            "endpoints": {},
+        }
+
+    def _add(self, metrics):
+        play = self._play
+        if play is None:
+            play = self._play = self._new_play("")
+        play["tasks"] += 1
+        play["task_time"] += metrics.get("task_time", 0)
+        play["calls"] += metrics.get("total_calls", 0)
+        play["latency"] += metrics.get("total_latency", 0)
+        play["throttled"] += metrics.get("throttled", 0)
+        login = metrics.get("login")
+        if login:
+            play["logins"][login["source"]] = play["logins"].get(login["source"], 0) + 1
+            play["login_time"] += login["latency"]
+        for call in metrics.get("calls", []):
+            key = "%s %s" % (call["method"], call["endpoint"])
+            endpoint = play["endpoints"].setdefault(
+                key, {"calls": 0, "time": 0.0, "errors": 0, "throttled": 0, "bytes": 0}
+            )
+            endpoint["calls"] += 1
+            endpoint["time"] += call["latency"]
+            endpoint["bytes"] += call.get("size", 0)
+            endpoint["throttled"] += call["retries"] + (call["status"] == 429)
+            if call["status"] >= 400:
+                endpoint["errors"] += 1
+
+    def _collect(self, result):
+        results = [result._result] + list(result._result.get("results") or [])
+        for item in results:
+            if isinstance(item, dict) and isinstance(item.get("_zia_metrics"), dict):
+                self._add(item["_zia_metrics"])
+
+    def _flush(self):
+        play = self._play
+        self._play = None
+        if play is None or not play["tasks"]:
+            return
+        self._plays.append(play)
+
+        logins = ", ".join(
+            "%d %s" % (count, source)
+            for source, count in sorted(play["logins"].items())
+        )
+        self._display.display(
+            "ZIA API metrics for play %s: %d calls in %.2fs over %d tasks (%.2fs), "
+            "%d rate limited, sessions: %s (%.2fs)"
+            % (
+                play["name"] or "(unnamed)",
+                play["calls"],
+                play["latency"],
+                play["tasks"],
+                play["task_time"],
+                play["throttled"],
+                logins or "none",
+                play["login_time"],
+            )
+        )
+        endpoints = sorted(
+            play["endpoints"].items(), key=lambda item: item[1]["time"], reverse=True
+        )
+        for key, endpoint in endpoints[: self.get_option("top")]:
+            self._display.display(
+                "  %-50s %6d calls %9.2fs %6d errors %6d rate limited %10d bytes"
+                % (
+                    key,
+                    endpoint["calls"],
+                    endpoint["time"],
+                    endpoint["errors"],
+                    endpoint["throttled"],
+                    endpoint["bytes"],
+                )
+            )
+
+    def v2_playbook_on_play_start(self, play):
+        self._flush()
+        self._play = self._new_play(play.get_name().strip())
+
+    def v2_runner_on_ok(self, result):
+        self._collect(result)
+
+    def v2_runner_on_failed(self, result, ignore_errors=False):
+        self._collect(result)
+
+    def v2_playbook_on_stats(self, stats):
+        self._flush()
+        output = self.get_option("output")
+        if output and self._plays:
+            with open(output, "w") as f:
+                json.dump({"plays": self._plays}, f, indent=2, sort_keys=True)
@@ -136,3 +136,67 @@ options:
             - enabled
             - disabled
 """
+
+    PAGING = r"""
+options:
+    page_size:
+        description:
+            - Number of objects requested per API call when listing the collection.
+        type: int
+        required: false
+        default: 1000
+        version_added: "1.4.0"
+    max_results:
+        description:
+            - Maximum number of objects returned.
+            - No further pages are requested once it is reached.
+        type: int
+        required: false
+        version_added: "1.4.0"
+    concurrency:
+        description:
+            - Maximum number of pages fetched in parallel when listing the whole collection.
+            - Requests are delayed when the API reports that the rate limit is reached.
+            - Set to 1 to fetch the pages one after the other.
+        type: int
+        required: false
+        default: 4
+        version_added: "1.4.0"
+"""
+
+    PLUGIN_CREDENTIALS = r"""
+options:
+    username:
+        description:
+            - A string that contains the email ID of the API admin.
+        type: str
+        env:
+            - name: ZIA_USERNAME
+    password:
+        description:
+            - A string that contains the password for the API admin.
+        type: str
+        env:
+            - name: ZIA_PASSWORD
+    api_key:
+        description:
+            - A string that contains the obfuscated API key.
+        type: str
+        env:
+            - name: ZIA_API_KEY
+    cloud:
+        description:
+            - The Zscaler cloud name was provisioned for your organization.
+        type: str
+        env:
+            - name: ZIA_CLOUD
+        choices:
+            - zscloud
+            - zscaler
+            - zscalerone
+            - zscalertwo
+            - zscalerthree
+            - zscalerbeta
+            - zscalergov
+            - zscalerten
+"""
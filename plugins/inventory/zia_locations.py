@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                              MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+name: zia_locations
+short_description: Builds an inventory of the ZIA locations and sub-locations
+version_added: "1.4.0"
+description:
+  - Adds a host for each ZIA location and sub-location of the tenant. Sub-locations are
+    named C(<parent>/<sub-location>) as their names are only unique within their parent.
+  - Locations, sub-locations, static IPs and GRE tunnels are listed in bulk, with a few
+    paginated API calls per collection instead of one call per location.
+  - Hosts are grouped by country (C(zia_country_<country>)), profile (C(zia_profile_<profile>))
+    and parent location (C(zia_parent_<parent>)). Top level locations are also in the
+    C(zia_locations) group and sub-locations in the C(zia_sub_locations) group.
+  - The name of the inventory source must end with C(zia_locations.yml) or C(zia_locations.yaml).
+  - Enable the inventory cache to reuse the API results of a previous run for up to
+    C(cache_timeout) seconds.
+requirements:
+  - Zscaler SDK Python can be obtained from PyPI U(https://pypi.org/project/zscaler-sdk-python/)
+extends_documentation_fragment:
+  - constructed
+  - inventory_cache
+  - zscaler.ziacloud.fragments.plugin_credentials
+options:
+  plugin:
+    description: Token that ensures this is a source file for this plugin.
+    required: true
+    choices: ["zscaler.ziacloud.zia_locations"]
+  sub_locations:
+    description: Adds the sub-locations of every location.
+    type: bool
+    default: true
+  static_ips:
+    description:
+      - Sets the C(zia_static_ips) variable of every location to the static IPs
+        it is configured with.
+    type: bool
+    default: true
+  gre_tunnels:
+    description:
+      - Sets the C(zia_gre_tunnels) variable of every location to the GRE tunnels
+        whose source IP is one of its IP addresses.
+    type: bool
+    default: true
+  page_size:
+    description: Number of objects requested per API call.
+    type: int
+    default: 1000
+  concurrency:
+    description:
+      - Maximum number of API calls sent in parallel, to fetch the pages of a collection
+        and the sub-locations of several locations.
+    type: int
+    default: 4
+"""
+
+EXAMPLES = r"""
+# zia_locations.yml
+plugin: zscaler.ziacloud.zia_locations
+
+# Cache the API results for an hour, group the hosts by time zone, add a
+# group for the locations requiring authentication and use the first static
+# IP of each location as its address
+plugin: zscaler.ziacloud.zia_locations
+cache: true
+cache_plugin: ansible.builtin.jsonfile
+cache_connection: ~/.cache/ansible/zia
+cache_timeout: 3600
+keyed_groups:
+  - key: zia_location.tz
+    prefix: zia_tz
+groups:
+  zia_auth_required: zia_location.auth_required
+compose:
+  ansible_host: zia_static_ips[0].ip_address
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from ansible.errors import AnsibleError
+from ansible.module_utils.common.text.converters import to_native
+from ansible.plugins.inventory import BaseInventoryPlugin, Cacheable, Constructable
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_pagination import (
+    MAX_CONCURRENCY,
+    list_items,
+)
+from ansible_collections.zscaler.ziacloud.plugins.plugin_utils.zia_plugin import (
+    plugin_client,
+    quiet_sdk,
+)
+
+
+class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
+    NAME = "zscaler.ziacloud.zia_locations"
+
+    def verify_file(self, path):
+        if super(InventoryModule, self).verify_file(path):
+            return path.endswith(("zia_locations.yml", "zia_locations.yaml"))
+        return False
+
+    def _fetch(self):
+        """Lists the collections describing the locations of the tenant."""
+        client = plugin_client(self)
+        page_size = self.get_option("page_size")
+        concurrency = max(1, min(self.get_option("concurrency"), MAX_CONCURRENCY))
+
+        def fetch(path, params=None):
+            return list_items(
+                client, path, params, page_size=page_size, concurrency=concurrency
+            )
+
+        with quiet_sdk():
+            data = dict(locations=fetch("locations"), sub_locations=[])
+            if self.get_option("sub_locations"):
+                # The lite listing tells which locations have sub-locations,
+                # only those are queried for the details of their sub-locations
+                lite = fetch(
+                    "locations/lite",
+                    dict(includeSubLocations="true", includeParentLocations="true"),
+                )
+                parents = sorted(
+                    set(loc["parent_id"] for loc in lite if loc.get("parent_id"))
+                )
+                with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                    for subs in pool.map(
+                        lambda parent: fetch("locations/%s/sublocations" % parent),
+                        parents,
+                    ):
+                        data["sub_locations"].extend(subs)
+            data["static_ips"] = (
+                fetch("staticIP") if self.get_option("static_ips") else []
+            )
+            data["gre_tunnels"] = (
+                fetch("greTunnels") if self.get_option("gre_tunnels") else []
+            )
+        return data
+
+    def _add_group(self, name, host):
+        group = self.inventory.add_group(self._sanitize_group_name(name))
+        self.inventory.add_child(group, host)
+
+    def _populate(self, data):
+        static_ips = dict((ip["ip_address"], ip) for ip in data["static_ips"])
+        tunnels = dict((t["source_ip"], t) for t in data["gre_tunnels"])
+        parents = dict((loc["id"], loc) for loc in data["locations"])
+        strict = self.get_option("strict")
+
+        self.inventory.add_group("zia_locations")
+        self.inventory.add_group("zia_sub_locations")
+        for location in data["locations"] + data["sub_locations"]:
+            parent = parents.get(location.get("parent_id"))
+            if parent is not None:
+                host = self.inventory.add_host(
+                    "%s/%s" % (parent["name"], location["name"]),
+                    group="zia_sub_locations",
+                )
+                self._add_group("zia_parent_%s" % parent["name"], host)
+            else:
+                host = self.inventory.add_host(location["name"], group="zia_locations")
+            if location.get("country"):
+                self._add_group("zia_country_%s" % location["country"].lower(), host)
+            if location.get("profile"):
+                self._add_group("zia_profile_%s" % location["profile"].lower(), host)
+
+            ip_addresses = location.get("ip_addresses") or []
+            host_vars = dict(
+                zia_location=location,
+                zia_parent=parent["name"] if parent is not None else None,
+                zia_static_ips=[
+                    static_ips[ip] for ip in ip_addresses if ip in static_ips
+                ],
+                zia_gre_tunnels=[tunnels[ip] for ip in ip_addresses if ip in tunnels],
+            )
+            for key, value in host_vars.items():
+                self.inventory.set_variable(host, key, value)
+
+            self._set_composite_vars(
+                self.get_option("compose"), host_vars, host, strict=strict
+            )
+            self._add_host_to_composed_groups(
+                self.get_option("groups"), host_vars, host, strict=strict
+            )
+            self._add_host_to_keyed_groups(
+                self.get_option("keyed_groups"), host_vars, host, strict=strict
+            )
+
+    def parse(self, inventory, loader, path, cache=True):
+        super(InventoryModule, self).parse(inventory, loader, path, cache)
+        self._read_config_data(path)
+
+        cache_key = self.get_cache_key(path)
+        use_cache = self.get_option("cache") and cache
+        update_cache = self.get_option("cache") and not cache
+        data = None
+        if use_cache:
+            try:
+                data = self._cache[cache_key]
+            except KeyError:
+                update_cache = True
+        if data is None:
+            try:
+                data = self._fetch()
+            except AnsibleError:
+                raise
+            except Exception as e:
+                raise AnsibleError(
+                    "Failed to list the ZIA locations: %s" % to_native(e)
+                )
+        if update_cache:
+            self._cache[cache_key] = data
+        self._populate(data)
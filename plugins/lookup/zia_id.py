@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                              MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+name: zia_id
+short_description: Resolves the names of ZIA objects to their IDs
+version_added: "1.4.0"
+description:
+  - Returns the IDs of the ZIA objects of a type with the given names, in the order of the names,
+    to fill the ID lists of the rule modules without an info task per name.
+  - The objects of a type are listed once with bulk requests and indexed by name, however many
+    names are resolved.
+  - The indexes are kept in memory and, unless C(cache=false), persisted per tenant in
+    C(ZIA_CACHE_DIR) for C(cache_ttl) seconds, so the following tasks and forks of the play
+    resolve names without calling the API or logging in. A change made by a module of the
+    collection to the objects of a type drops its index.
+  - Use it with C(query) or C(wantlist=true) to get a list, even for a single name.
+requirements:
+  - Zscaler SDK Python can be obtained from PyPI U(https://pypi.org/project/zscaler-sdk-python/)
+extends_documentation_fragment:
+  - zscaler.ziacloud.fragments.plugin_credentials
+options:
+  _terms:
+    description:
+      - The object type, followed by the names to resolve. Names can also be given as lists.
+      - "The object types are C(department), C(dlp_dictionary), C(dlp_engine),
+        C(dlp_notification_template), C(group), C(ip_destination_group), C(ip_source_group),
+        C(label), C(location), C(location_group), C(network_app_group), C(network_service),
+        C(network_service_group), C(time_window), C(url_category) and C(zpa_gateway)."
+    required: true
+  cache:
+    description:
+      - Persists the indexes in C(ZIA_CACHE_DIR). Set to C(false) to list the objects in
+        every task.
+    type: bool
+    default: true
+  cache_ttl:
+    description: Number of seconds a persisted index is reused.
+    type: int
+    default: 300
+    env:
+      - name: ZIA_INDEX_CACHE_TTL
+  on_missing:
+    description:
+      - What to do when no object has one of the names. With C(warn) and C(ignore) the name
+        is left out of the result.
+    type: str
+    choices: ["error", "warn", "ignore"]
+    default: error
+"""
+
+EXAMPLES = r"""
+- name: Create a URL filtering rule for two locations and a group
+  zscaler.ziacloud.zia_url_filtering_rules:
+    provider: "{{ zia_cloud }}"
+    name: "Block Gambling"
+    order: 1
+    action: BLOCK
+    url_categories: ["GAMBLING"]
+    locations: "{{ query('zscaler.ziacloud.zia_id', 'location', 'Site-A', 'Site-B') }}"
+    groups: "{{ query('zscaler.ziacloud.zia_id', 'group', 'Finance') }}"
+
+- name: Resolve a list of names, skipping the ones that do not exist
+  ansible.builtin.set_fact:
+    label_ids: "{{ query('zscaler.ziacloud.zia_id', 'label', label_names, on_missing='warn') }}"
+"""
+
+RETURN = r"""
+_raw:
+  description: The IDs of the objects, in the order of the names.
+  type: list
+  elements: raw
+"""
+
+from ansible.errors import AnsibleError, AnsibleLookupError
+from ansible.module_utils.common.text.converters import to_native
+from ansible.plugins.lookup import LookupBase
+from ansible.utils.display import Display
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
+from ansible_collections.zscaler.ziacloud.plugins.plugin_utils.zia_plugin import (
+    LazyClient,
+    quiet_sdk,
+)
+
+display = Display()
+
+# object type -> resource of ZIAResourceIndex
+OBJECT_TYPES = {
+    "department": "departments",
+    "dlp_dictionary": "dlp_dictionaries",
+    "dlp_engine": "dlp_engines",
+    "dlp_notification_template": "dlp_notification_templates",
+    "group": "groups",
+    "ip_destination_group": "ip_destination_groups",
+    "ip_source_group": "ip_source_groups",
+    "label": "rule_labels",
+    "location": "locations",
+    "location_group": "location_groups",
+    "network_app_group": "network_app_groups",
+    "network_service": "network_services",
+    "network_service_group": "network_service_groups",
+    "time_window": "time_windows",
+    "url_category": "url_categories",
+    "zpa_gateway": "zpa_gateways",
+}
+
+
+class LookupModule(LookupBase):
+    def run(self, terms, variables=None, **kwargs):
+        self.set_options(var_options=variables, direct=kwargs)
+        if not terms:
+            raise AnsibleLookupError("The object type is required")
+        object_type = terms[0]
+        if object_type not in OBJECT_TYPES:
+            raise AnsibleLookupError(
+                "Unsupported object type '%s', expected one of: %s"
+                % (object_type, ", ".join(sorted(OBJECT_TYPES)))
+            )
+        names = []
+        for term in terms[1:]:
+            names.extend(term if isinstance(term, list) else [term])
+
+        index = ZIAResourceIndex(
+            LazyClient(self),
+            OBJECT_TYPES[object_type],
+            persistent=self.get_option("cache"),
+            ttl=self.get_option("cache_ttl"),
+        )
+        on_missing = self.get_option("on_missing")
+        ids = []
+        with quiet_sdk():
+            for name in names:
+                try:
+                    item = index.get_by_name(name)
+                except AnsibleError:
+                    raise
+                except Exception as e:
+                    raise AnsibleLookupError(
+                        "Failed to list the %s objects: %s"
+                        % (object_type, to_native(e))
+                    )
+                if item is not None:
+                    ids.append(item["id"])
+                elif on_missing == "error":
+                    raise AnsibleLookupError(
+                        "No %s named '%s' was found" % (object_type, name)
+                    )
+                elif on_missing == "warn":
+                    display.warning("No %s named '%s' was found" % (object_type, name))
+        return ids
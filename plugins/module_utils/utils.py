@@ -25,38 +25,55 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-from ansible.module_utils.basic import missing_required_lib
+from importlib.util import find_spec
 
-try:
-    from netaddr import IPAddress, AddrFormatError
+from ansible.module_utils.basic import missing_required_lib
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_tables import (
+    ISO3166_ALPHA2,
+    TIMEZONES,
+)
 
-    HAS_NETADDR = True
-    ADDR_IMPORT_ERROR = None  # Set to None when import is successful
-except ImportError:
-    IPAddress = None  # Setting to None to indicate unavailability
-    HAS_NETADDR = False
-    ADDR_IMPORT_ERROR = missing_required_lib("netaddr")  # Store the error for reporting
+# netaddr is imported by the function using it, most modules never do
+HAS_NETADDR = find_spec("netaddr") is not None
+ADDR_IMPORT_ERROR = None if HAS_NETADDR else missing_required_lib("netaddr")
 
 
 def validate_iso3166_alpha2(country_code):
     """
     Validates if the provided country code is a valid 2-letter ISO3166 Alpha2 code.
 
-    :param country_code: 2-letter country code
+    :param country_code: 2-letter country code, case insensitive
     :return: True if valid, False otherwise
     """
+    return isinstance(country_code, str) and country_code.upper() in ISO3166_ALPHA2
+
+
+def validate_timezone(timezone_id):
+    """
+    Validates if the provided ID is a valid IANA time zone, such as
+    "America/Los_Angeles".
+    """
+    return timezone_id in TIMEZONES
+
+
+def localize(time_obj, timezone_id):
+    """
+    Returns the naive datetime ``time_obj`` as an aware datetime in the given
+    IANA time zone. Uses the time zone data of the system, or the data
+    bundled with pytz when the system has none.
+    """
     try:
-        import pycountry
+        from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+        try:
+            return time_obj.replace(tzinfo=ZoneInfo(timezone_id))
+        except ZoneInfoNotFoundError:
+            pass
     except ImportError:
-        raise ImportError(
-            "The pycountry module is required to validate ISO3166 Alpha2 country codes."
-        )
+        pass
+    import pytz
 
-    try:
-        country = pycountry.countries.get(alpha_2=country_code)
-        return country is not None
-    except AttributeError:
-        return False
+    return pytz.timezone(timezone_id).localize(time_obj)
 
 
 def deleteNone(_dict):
@@ -109,6 +126,7 @@ def is_valid_ipv4_or_range(value):
         raise ImportError(
             ADDR_IMPORT_ERROR
         )  # Raise the captured ImportError if netaddr is missing
+    from netaddr import IPAddress, AddrFormatError
 
     try:
         if "-" in value:  # If it's a range
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                              MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Deferred activation of ZIA configuration changes.
+
+Every successful write sent through ``ZIAClientHelper`` records a "dirty"
+marker for the tenant in the collection cache directory. A single
+``zia_activation_status`` task with ``only_if_changed: true``, typically a
+handler or the last task of the play, then activates once for all the
+changes made by the previous tasks and clears the marker. The time of the
+last activation is kept, so that data cached from the API, such as tenant
+snapshots, can tell whether the configuration changed since they were taken.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import binascii
+import fcntl
+import os
+import time
+
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_cache import (
+    cache_dir,
+    read_json,
+    remove_file,
+    tenant_key,
+    write_json,
+)
+
+# Writes that do not change the configuration to activate
+_NO_ACTIVATION_PATHS = (
+    "authenticatedSession",
+    "status",
+    "urlLookup",
+    "urlCategories/review/domains",
+    "zscsb",
+)
+
+ACTIVE = "ACTIVE"
+POLL_INITIAL_DELAY = 1.0
+POLL_MAX_DELAY = 30.0
+
+
+def requires_activation(method, path):
+    """Returns True if a successful request changes the configuration."""
+    if method.upper() in ("GET", "HEAD"):
+        return False
+    path = path.lstrip("/").split("?")[0]
+    return not any(
+        path == prefix or path.startswith(prefix + "/")
+        for prefix in _NO_ACTIVATION_PATHS
+    )
+
+
+class ZIAActivationTracker:
+    """
+    Dirty marker of a tenant: set by every configuration change, cleared
+    once the changes are activated.
+    """
+
+    def __init__(self, username, cloud):
+        key = tenant_key(username, cloud)
+        self.path = os.path.join(cache_dir(), "dirty-%s.json" % key)
+        self.lock_path = self.path + ".lock"
+        self.activated_path = os.path.join(cache_dir(), "activated-%s.json" % key)
+
+    def _locked(self, action):
+        fd = os.open(self.lock_path, os.O_WRONLY | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            return action()
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def mark_dirty(self):
+        marker = {
+            "updated": time.time(),
+            "token": binascii.hexlify(os.urandom(8)).decode("ascii"),
+        }
+        self._locked(lambda: write_json(self.path, marker))
+
+    def pending(self):
+        """Returns the marker of the changes not activated yet, or None."""
+        marker = read_json(self.path)
+        return marker if isinstance(marker, dict) else None
+
+    def clear(self, marker):
+        """
+        Removes the marker, unless a change was recorded after ``marker``
+        was read, in which case that change still needs an activation.
+        """
+
+        def remove():
+            if marker is not None and self.pending() == marker:
+                remove_file(self.path)
+
+        self._locked(remove)
+
+    def mark_activated(self):
+        """Records that the configuration of the tenant was just activated."""
+        write_json(self.activated_path, {"activated": time.time()})
+
+    def last_change(self):
+        """
+        Returns the time of the last configuration change or activation
+        recorded for the tenant, or None.
+        """
+        times = []
+        marker = self.pending()
+        if marker is not None:
+            times.append(marker.get("updated", 0))
+        activated = read_json(self.activated_path)
+        if isinstance(activated, dict):
+            times.append(activated.get("activated", 0))
+        return max(times) if times else None
+
+
+def wait_for_activation(client, timeout, sleep=time.sleep):
+    """
+    Polls the activation status with an exponential backoff until it is
+    ACTIVE or ``timeout`` seconds have passed. Returns the last status.
+    """
+    deadline = time.time() + timeout
+    delay = POLL_INITIAL_DELAY
+    while True:
+        status = client.activate.status()
+        remaining = deadline - time.time()
+        if status == ACTIVE or remaining <= 0:
+            return status
+        sleep(min(delay, remaining))
+        delay = min(delay * 2, POLL_MAX_DELAY)
@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                              MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Backups of the policy of a ZIA tenant.
+
+A backup is a directory holding one gzip compressed JSON lines file per
+collection and a ``manifest.json`` file listing the collections with the
+number of objects and the SHA-256 hash of the uncompressed content of each
+file. The objects are written as they are listed, with the snake_case keys
+returned by the SDK, and the result of the modules only carries the
+manifest.
+
+``BACKUP_RESOURCES`` is also the restore order: the labels, URL categories
+and firewall objects come before the rules referencing them. Objects that
+are recreated on restore get a new ID, the references of the following
+resources are rewritten with ``remap_references``.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import glob
+import gzip
+import hashlib
+import json
+import os
+import time
+
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_cache import (
+    read_json,
+    remove_file,
+    write_json,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_diff import (
+    IGNORE,
+    changed_fields,
+    field_spec,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    CLOUD_APP_CONTROL_RULE_TYPES,
+    RESOURCES,
+)
+
+BACKUP_FORMAT = 1
+MANIFEST = "manifest.json"
+
+BACKUP_RESOURCES = [
+    "rule_labels",
+    "url_categories",
+    "ip_source_groups",
+    "ip_destination_groups",
+    "network_services",
+    "network_service_groups",
+    "network_app_groups",
+    "url_filtering_rules",
+    "firewall_rules",
+    "dlp_web_rules",
+    "forwarding_control_rules",
+    "cloud_app_control_rules",
+]
+
+# Attribute -> resource of the objects it references
+REFERENCES = {
+    "labels": "rule_labels",
+    "url_categories": "url_categories",
+    "dest_ip_categories": "url_categories",
+    "src_ip_groups": "ip_source_groups",
+    "dest_ip_groups": "ip_destination_groups",
+    "nw_services": "network_services",
+    "services": "network_services",
+    "nw_service_groups": "network_service_groups",
+    "nw_application_groups": "network_app_groups",
+}
+
+# Attributes computed by the API, never compared nor sent back
+READ_ONLY = (
+    "id",
+    "access_control",
+    "creation_time",
+    "last_modified_by",
+    "last_modified_time",
+    "modified_by",
+    "modified_time",
+    "custom_ip_ranges_count",
+    "custom_urls_count",
+    "db_categorized_urls",
+    "editable",
+    "ip_ranges_retaining_parent_category_count",
+    "urls_retaining_parent_category_count",
+    "val",
+)
+
+
+def resource_scopes(resource):
+    """Returns the scopes a resource is listed with, [None] if it has none."""
+    if "{scope}" in RESOURCES[resource][0]:
+        return list(CLOUD_APP_CONTROL_RULE_TYPES)
+    return [None]
+
+
+def collection_of(resource, scope=None):
+    return RESOURCES[resource][0].format(scope=scope)
+
+
+def object_name(item):
+    """Name of an object; predefined URL categories only have an ID."""
+    return item.get("name") or item.get("configured_name") or item.get("id")
+
+
+def predefined(item):
+    """Whether an object is built in, it cannot be created nor deleted."""
+    return bool(
+        item.get("predefined")
+        or item.get("default_rule")
+        or item.get("type") == "PREDEFINED"
+        or item.get("custom_category") is False
+    )
+
+
+def object_differences(backed_up, live):
+    """Returns the attributes of a backed up object that differ from the live one."""
+    schema = dict(
+        (key, field_spec(IGNORE) if key in READ_ONLY else field_spec())
+        for key in set(backed_up) | set(live)
+    )
+    return changed_fields(backed_up, live, schema)
+
+
+def payload(item):
+    """Returns the body of the create and update requests of a backed up object."""
+    from zscaler.utils import convert_keys
+
+    return convert_keys(
+        dict((key, value) for key, value in item.items() if key not in READ_ONLY)
+    )
+
+
+def _line(item):
+    return json.dumps(item, sort_keys=True).encode("utf-8") + b"\n"
+
+
+def content_hash(items):
+    """Returns the hash a collection holding ``items`` has in the manifest."""
+    digest = hashlib.sha256()
+    for item in items:
+        digest.update(_line(item))
+    return digest.hexdigest()
+
+
+def remap_references(item, id_maps):
+    """
+    Rewrites in place the references of ``item`` to objects that have a new
+    ID, ``id_maps`` maps each resource to a dict of old to new IDs.
+    """
+    for key, resource in REFERENCES.items():
+        id_map = id_maps.get(resource)
+        value = item.get(key)
+        if not id_map or not value:
+            continue
+        references = value if isinstance(value, list) else [value]
+        for i, reference in enumerate(references):
+            if isinstance(reference, dict):
+                new_id = id_map.get(str(reference.get("id")))
+                if new_id is not None:
+                    reference["id"] = new_id
+            elif str(reference) in id_map:
+                references[i] = id_map[str(reference)]
+
+
+class ZIABackup:
+    """
+    Backup directory of a tenant.
+
+    Example:
+        backup = ZIABackup(path)
+        backup.write_collection("urlFilteringRules", rules)
+        backup.write_manifest(entries)
+    """
+
+    def __init__(self, path):
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.manifest_path = os.path.join(self.path, MANIFEST)
+        self._manifest = None
+
+    def manifest(self):
+        """Returns the manifest of the backup, or None if there is none."""
+        if self._manifest is None:
+            manifest = read_json(self.manifest_path)
+            if isinstance(manifest, dict) and manifest.get("format") == BACKUP_FORMAT:
+                self._manifest = manifest
+        return self._manifest
+
+    def write_collection(self, resource, scope, items):
+        """
+        Streams the objects of a collection to its file.
+
+        :return: The manifest entry of the collection.
+        """
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path, mode=0o700, exist_ok=True)
+        collection = collection_of(resource, scope)
+        name = "%s.jsonl.gz" % collection.replace("/", "_")
+        tmp_path = os.path.join(self.path, "%s.%d.tmp" % (name, os.getpid()))
+        digest = hashlib.sha256()
+        count = 0
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            with os.fdopen(fd, "wb") as raw:
+                # A fixed mtime keeps the files of identical backups identical
+                with gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+                    for item in items:
+                        line = _line(item)
+                        digest.update(line)
+                        f.write(line)
+                        count += 1
+            os.replace(tmp_path, os.path.join(self.path, name))
+        except Exception:
+            remove_file(tmp_path)
+            raise
+        return dict(
+            resource=resource,
+            scope=scope,
+            collection=collection,
+            file=name,
+            count=count,
+            sha256=digest.hexdigest(),
+        )
+
+    def write_manifest(self, entries):
+        manifest = {
+            "format": BACKUP_FORMAT,
+            "created": time.time(),
+            "collections": entries,
+        }
+        write_json(self.manifest_path, manifest)
+        self._manifest = manifest
+        files = set(entry["file"] for entry in entries)
+        for path in glob.glob(os.path.join(self.path, "*.jsonl.gz")):
+            if os.path.basename(path) not in files:
+                remove_file(path)
+        return manifest
+
+    def entries(self, resource):
+        """Returns the manifest entries of a resource, one per scope."""
+        return [
+            entry
+            for entry in (self.manifest() or {}).get("collections", [])
+            if entry["resource"] == resource
+        ]
+
+    def read_collection(self, entry):
+        """
+        Returns the objects of a collection, after checking that the file
+        matches the hash of the manifest.
+        """
+        digest = hashlib.sha256()
+        items = []
+        with gzip.open(os.path.join(self.path, entry["file"]), "rb") as f:
+            for line in f:
+                digest.update(line)
+                items.append(json.loads(line.decode("utf-8")))
+        if digest.hexdigest() != entry["sha256"]:
+            raise ValueError(
+                "%s does not match the hash of the backup manifest" % entry["file"]
+            )
+        return items
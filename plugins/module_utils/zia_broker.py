@@ -0,0 +1,427 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                              MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Persistent ZIA API connection shared by all module executions of a play.
+
+The first module that runs with ``ZIA_PERSISTENT_CONNECTION=true`` forks a
+small daemon listening on a Unix socket in the collection cache directory.
+The daemon logs in once and keeps a keep-alive HTTP connection pool open;
+subsequent modules forward their API calls to it instead of logging in and
+opening new TLS connections themselves. The daemon exits on its own after
+``ZIA_PERSISTENT_CONNECTION_IDLE_TIMEOUT`` seconds without requests.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import base64
+import fcntl
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_cache import (
+    cache_dir,
+    env_flag,
+    env_int,
+    remove_file,
+    tenant_key,
+)
+
+DEFAULT_IDLE_TIMEOUT = 300
+SPAWN_TIMEOUT = 30
+MAX_RATE_LIMIT_RETRIES = 5
+
+# Hop-by-hop and encoding headers no longer apply once the body is decoded
+_DROPPED_RESPONSE_HEADERS = ("content-encoding", "transfer-encoding", "content-length")
+
+
+class ZIABrokerError(Exception):
+    """Raised when the persistent connection daemon cannot be reached."""
+
+
+def _send_frame(sock, obj):
+    payload = json.dumps(obj).encode("utf-8")
+    sock.sendall(struct.pack("!I", len(payload)) + payload)
+
+
+def _recv_exact(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv_frame(sock):
+    header = _recv_exact(sock, 4)
+    if header is None:
+        return None
+    payload = _recv_exact(sock, struct.unpack("!I", header)[0])
+    if payload is None:
+        return None
+    return json.loads(payload.decode("utf-8"))
+
+
+def _credential_digest(username, password, api_key, cloud):
+    raw = "|".join([username, password, api_key, cloud])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class _BrokerRequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        server = self.server
+        while True:
+            try:
+                request = _recv_frame(self.request)
+            except (OSError, ValueError):
+                return
+            if request is None:
+                return
+            server.touch(1)
+            try:
+                if request.get("auth") != server.digest:
+                    reply = {"error": "credentials do not match this connection"}
+                else:
+                    reply = server.dispatch(request)
+            except Exception as e:
+                reply = {"error": str(e)}
+            finally:
+                server.touch(-1)
+            try:
+                _send_frame(self.request, reply)
+            except OSError:
+                return
+
+
+class ZIABrokerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Daemon side of the persistent connection."""
+
+    daemon_threads = True
+
+    def __init__(
+        self, socket_path, base_url, username, password, api_key, cloud, idle_timeout
+    ):
+        import requests
+
+        self.base_url = base_url
+        self.username = username
+        self.password = password
+        self.api_key = api_key
+        self.digest = _credential_digest(username, password, api_key, cloud)
+        self.idle_timeout = idle_timeout
+        self.http = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=32)
+        self.http.mount("https://", adapter)
+        self.http.mount("http://", adapter)
+        self.session_id = None
+        self._auth_lock = threading.Lock()
+        self._activity_lock = threading.Lock()
+        self._in_flight = 0
+        self._last_activity = time.time()
+
+        socketserver.UnixStreamServer.__init__(self, socket_path, _BrokerRequestHandler)
+        os.chmod(socket_path, 0o600)
+
+    def touch(self, delta):
+        with self._activity_lock:
+            self._in_flight += delta
+            self._last_activity = time.time()
+
+    def idle(self):
+        with self._activity_lock:
+            return (
+                self._in_flight == 0
+                and time.time() - self._last_activity > self.idle_timeout
+            )
+
+    def login(self, headers):
+        from zscaler.utils import obfuscate_api_key
+
+        api_obf = obfuscate_api_key(list(self.api_key))
+        resp = self.http.post(
+            self.base_url + "/authenticatedSession",
+            json={
+                "apiKey": api_obf["key"],
+                "username": self.username,
+                "password": self.password,
+                "timestamp": api_obf["timestamp"],
+            },
+            headers=headers,
+            timeout=60,
+        )
+        if resp.status_code > 299:
+            raise ZIABrokerError(
+                "ZIA authentication failed with status %s: %s"
+                % (resp.status_code, resp.text)
+            )
+        self.session_id = resp.cookies.get("JSESSIONID")
+        return self.session_id
+
+    def logout(self):
+        if self.session_id is None:
+            return
+        try:
+            self.http.delete(
+                self.base_url + "/authenticatedSession",
+                cookies={"JSESSIONID": self.session_id},
+                timeout=30,
+            )
+        except Exception:
+            pass
+
+    def current_session(self, headers, stale=None):
+        with self._auth_lock:
+            if self.session_id is None or self.session_id == stale:
+                self.login(headers)
+            return self.session_id
+
+    def dispatch(self, request):
+        url = "%s/%s" % (self.base_url, request["path"].lstrip("/"))
+        headers = request.get("headers") or {}
+        session_id = self.current_session(headers)
+        relogged = False
+        rate_limited = 0
+        # The module's request scheduler retries rate limited requests itself
+        max_retries = (
+            MAX_RATE_LIMIT_RETRIES if request.get("retry_rate_limited", True) else 0
+        )
+        while True:
+            resp = self.http.request(
+                method=request["method"],
+                url=url,
+                json=request.get("json"),
+                params=request.get("params"),
+                data=request.get("data"),
+                headers=headers,
+                cookies={"JSESSIONID": session_id},
+                timeout=request.get("timeout"),
+            )
+            if resp.status_code == 401 and not relogged:
+                session_id = self.current_session(headers, stale=session_id)
+                relogged = True
+                continue
+            if resp.status_code == 429 and rate_limited < max_retries:
+                time.sleep(int(resp.headers.get("Retry-After", 2)))
+                rate_limited += 1
+                continue
+            break
+        return {
+            "status": resp.status_code,
+            "reason": resp.reason,
+            "url": resp.url,
+            "headers": dict(
+                (k, v)
+                for k, v in resp.headers.items()
+                if k.lower() not in _DROPPED_RESPONSE_HEADERS
+            ),
+            "body": base64.b64encode(resp.content).decode("ascii"),
+        }
+
+    def serve_until_idle(self):
+        def watchdog():
+            while not self.idle():
+                time.sleep(1)
+            self.shutdown()
+
+        threading.Thread(target=watchdog, daemon=True).start()
+        try:
+            self.serve_forever(poll_interval=0.5)
+        finally:
+            self.logout()
+            self.server_close()
+            remove_file(self.server_address)
+
+
+class ZIABrokerClient:
+    """Module side of the persistent connection."""
+
+    def __init__(self, username, password, api_key, cloud, timeout=240):
+        self.username = username
+        self.password = password
+        self.api_key = api_key
+        self.cloud = cloud
+        self.timeout = timeout
+        self.digest = _credential_digest(username, password, api_key, cloud)
+        self.socket_path = os.path.join(
+            cache_dir(), "broker-%s.sock" % tenant_key(username, cloud)
+        )
+        # One connection per thread, the frames of concurrent requests
+        # must not interleave on a shared socket
+        self._local = threading.local()
+
+    @property
+    def _sock(self):
+        return getattr(self._local, "sock", None)
+
+    @_sock.setter
+    def _sock(self, sock):
+        self._local.sock = sock
+
+    @staticmethod
+    def enabled():
+        return env_flag("ZIA_PERSISTENT_CONNECTION")
+
+    @staticmethod
+    def supports(path, data):
+        # Sandbox submissions go to a different host and carry binary bodies
+        return "zscsb" not in path and (data is None or isinstance(data, str))
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout + 30)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def _spawn(self, base_url):
+        """Forks the daemon unless another process started it meanwhile."""
+        lock_path = self.socket_path + ".lock"
+        fd = os.open(lock_path, os.O_WRONLY | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                return self._connect()
+            except OSError:
+                remove_file(self.socket_path)
+
+            pid = os.fork()
+            if pid == 0:
+                self._run_daemon(base_url)
+            os.waitpid(pid, 0)
+
+            deadline = time.time() + SPAWN_TIMEOUT
+            while True:
+                try:
+                    return self._connect()
+                except OSError:
+                    if time.time() > deadline:
+                        raise
+                    time.sleep(0.05)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def _run_daemon(self, base_url):
+        # Runs in the forked child: detach from the module process so Ansible
+        # does not wait on it, then serve until idle.
+        try:
+            os.setsid()
+            if os.fork() != 0:
+                os._exit(0)
+            devnull = os.open(os.devnull, os.O_RDWR)
+            for fd in (0, 1, 2):
+                os.dup2(devnull, fd)
+            try:
+                max_fd = os.sysconf("SC_OPEN_MAX")
+            except (AttributeError, ValueError):
+                max_fd = 1024
+            os.closerange(3, max_fd)
+            server = ZIABrokerServer(
+                self.socket_path,
+                base_url,
+                self.username,
+                self.password,
+                self.api_key,
+                self.cloud,
+                env_int("ZIA_PERSISTENT_CONNECTION_IDLE_TIMEOUT", DEFAULT_IDLE_TIMEOUT),
+            )
+            server.serve_until_idle()
+        finally:
+            os._exit(0)
+
+    def send(
+        self,
+        base_url,
+        method,
+        path,
+        json=None,
+        params=None,
+        data=None,
+        headers=None,
+        retry_rate_limited=True,
+    ):
+        """
+        Sends an API request through the daemon and returns it as a
+        ``requests.Response``. Rate limited requests are retried by the
+        daemon unless ``retry_rate_limited`` is false.
+        """
+        import requests
+        from requests.structures import CaseInsensitiveDict
+
+        request = dict(
+            auth=self.digest,
+            method=method,
+            path=path,
+            json=json,
+            params=params,
+            data=data,
+            headers=headers,
+            timeout=self.timeout,
+            retry_rate_limited=retry_rate_limited,
+        )
+        try:
+            if self._sock is None:
+                try:
+                    self._sock = self._connect()
+                except OSError:
+                    self._sock = self._spawn(base_url)
+            _send_frame(self._sock, request)
+            reply = _recv_frame(self._sock)
+        except (OSError, ValueError) as e:
+            self.close()
+            raise ZIABrokerError("persistent connection failed: %s" % e)
+        if reply is None:
+            self.close()
+            raise ZIABrokerError("persistent connection closed unexpectedly")
+        if "error" in reply:
+            raise ZIABrokerError(reply["error"])
+
+        resp = requests.models.Response()
+        resp.status_code = reply["status"]
+        resp.reason = reply["reason"]
+        resp.url = reply["url"]
+        resp.headers = CaseInsensitiveDict(reply["headers"])
+        resp._content = base64.b64decode(reply["body"])
+        return resp
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
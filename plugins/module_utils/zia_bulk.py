@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                              MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Declarative reconciliation of a whole list of ZIA objects in one task.
+
+The bulk modules fetch a collection once through ``ZIAResourceIndex``, plan
+every create, update and delete in memory with ``plan_changes`` and only then
+send the calls that are actually needed with ``apply_changes``. For ordered
+collections such as policy rules, ``plan_order`` computes the smallest set of
+rules to move so that inserting a rule does not update every rule below it.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import copy
+
+from ansible.module_utils._text import to_native
+
+CREATE = "create"
+UPDATE = "update"
+DELETE = "delete"
+UNCHANGED = "unchanged"
+
+
+def _name(item):
+    return item.get("name")
+
+
+def plan_changes(
+    desired_items, index, differences, purge=False, protected=None, name_of=None
+):
+    """
+    Computes the changes needed to reach the desired list of objects.
+
+    :param desired_items: List of dicts with at least ``name`` and ``state``
+        and optionally ``id``.
+    :param index: ZIAResourceIndex of the collection.
+    :param differences: Callable ``(desired, existing)`` returning the list
+        of attribute names that differ.
+    :param purge: Also delete the existing objects missing from
+        ``desired_items``.
+    :param protected: Callable returning True for existing objects that
+        ``purge`` must keep, such as predefined rules.
+    :param name_of: Callable returning the name of a desired or existing
+        object, for collections whose objects have no ``name`` attribute.
+        The existing objects are then matched by that name.
+    :return: List of change dicts with ``action``, ``name``, ``id``,
+        ``changed_fields``, ``desired`` and ``current`` keys. Deletions come
+        first, the other changes follow in the order of ``desired_items``.
+    """
+    by_name = None
+    if name_of is None:
+        name_of = _name
+    else:
+        by_name = dict((name_of(item), item) for item in index.values())
+
+    seen_names = set()
+    matched_ids = set()
+    deletes = []
+    changes = []
+    for desired in desired_items:
+        name = name_of(desired)
+        if name in seen_names:
+            raise ValueError("Duplicate entry '%s' in the desired list" % name)
+        seen_names.add(name)
+
+        if desired.get("id") is not None:
+            current = index.get_by_id(desired["id"])
+        elif by_name is not None:
+            current = copy.deepcopy(by_name.get(name))
+        else:
+            current = index.get_by_name(name)
+        if current is not None:
+            matched_ids.add(str(current.get("id")))
+
+        change = dict(
+            name=name,
+            id=current.get("id") if current else None,
+            changed_fields=[],
+            desired=desired,
+            current=current,
+        )
+        if desired.get("state", "present") == "absent":
+            if current is None:
+                change["action"] = UNCHANGED
+                changes.append(change)
+            else:
+                change["action"] = DELETE
+                deletes.append(change)
+        elif current is None:
+            change["action"] = CREATE
+            changes.append(change)
+        else:
+            change["changed_fields"] = differences(desired, current)
+            change["action"] = UPDATE if change["changed_fields"] else UNCHANGED
+            changes.append(change)
+
+    if purge:
+        for current in index.values():
+            if str(current.get("id")) in matched_ids:
+                continue
+            if protected is not None and protected(current):
+                continue
+            deletes.append(
+                dict(
+                    action=DELETE,
+                    name=name_of(current),
+                    id=current.get("id"),
+                    changed_fields=[],
+                    desired=None,
+                    current=dict(current),
+                )
+            )
+    return deletes + changes
+
+
+def _heaviest_increasing_subsequence(values, weights):
+    """
+    Returns the indexes of the strictly increasing subsequence of ``values``
+    with the largest total weight. ``values`` must be distinct non-negative
+    integers.
+    """
+    size = max(values) + 1 if values else 0
+    # Fenwick tree of (best weight, index) over the values seen so far
+    tree = [(0, None)] * (size + 1)
+    previous = [None] * len(values)
+    best = (0, None)
+    for i, value in enumerate(values):
+        prefix = (0, None)
+        j = value
+        while j > 0:
+            if tree[j][0] > prefix[0]:
+                prefix = tree[j]
+            j -= j & -j
+        entry = (prefix[0] + weights[i], i)
+        previous[i] = prefix[1]
+        if entry[0] > best[0]:
+            best = entry
+        j = value + 1
+        while j <= size:
+            if entry[0] > tree[j][0]:
+                tree[j] = entry
+            j += j & -j
+
+    result = set()
+    i = best[1]
+    while i is not None:
+        result.add(i)
+        i = previous[i]
+    return result
+
+
+def plan_order(changes, existing_items, order_key="order"):
+    """
+    Computes the order sent for every created or updated object of an ordered
+    collection, moving as few existing objects as possible.
+
+    Objects whose desired ``order_key`` is set are placed at that position,
+    the other existing objects keep their relative position and new objects
+    without an order are appended. The largest set of existing objects that
+    already appear in their final relative order (an increasing subsequence
+    of their final positions) is left alone; only the remaining objects and
+    the new ones are inserted, in ascending final position, right after their
+    final predecessor. The API shifts the objects below on every insertion,
+    so the order of the other objects never needs to be updated.
+
+    :param changes: List returned by ``plan_changes``.
+    :param existing_items: All the objects of the collection.
+    :param order_key: Attribute holding the position of an object.
+    :return: The changes in the order they must be applied: deletions, then
+        creations and moves in ascending final position, then the in place
+        updates and the unchanged objects. The order to send is set in the
+        ``desired`` dict of every creation and update.
+    """
+    deleted = set(str(c["id"]) for c in changes if c["action"] == DELETE)
+    ordered = sorted(
+        (item for item in existing_items if (item.get(order_key) or 0) > 0),
+        key=lambda item: item[order_key],
+    )
+    # The API renumbers the remaining objects from the first order on deletion
+    base = ordered[0][order_key] if ordered else 1
+    current = [
+        str(item.get("id")) for item in ordered if str(item.get("id")) not in deleted
+    ]
+    current_keys = set(current)
+
+    managed = {}
+    positioned = []
+    appended = []
+    for i, change in enumerate(changes):
+        if change["action"] == DELETE or change["desired"] is None:
+            continue
+        if change["desired"].get("state", "present") == "absent":
+            continue
+        key = str(change["id"]) if change["current"] is not None else "new-%d" % i
+        if change["current"] is not None and key not in current_keys:
+            # Objects outside of the ordered range, such as the default rule
+            continue
+        managed[key] = change
+        if change["desired"].get(order_key) is not None:
+            positioned.append((change["desired"][order_key], i, key))
+        elif change["current"] is None:
+            appended.append(key)
+
+    positioned_keys = set(key for unused, unused_i, key in positioned)
+    unpositioned = [key for key in current if key not in positioned_keys] + appended
+    final = [None] * (len(unpositioned) + len(positioned))
+    for position, unused, key in sorted(positioned):
+        slot = min(max(position - base, 0), len(final) - 1)
+        while final[slot] is not None:
+            slot = (slot + 1) % len(final)
+        final[slot] = key
+    unpositioned.reverse()
+    final = [key if key is not None else unpositioned.pop() for key in final]
+
+    final_index = dict((key, i) for i, key in enumerate(final))
+    # Objects without a desired order must keep their place
+    pinned = len(current) + 1
+    kept = _heaviest_increasing_subsequence(
+        [final_index[key] for key in current],
+        [1 if key in positioned_keys else pinned for key in current],
+    )
+    staying = set(current[i] for i in kept)
+
+    moves = []
+    moved = set()
+    simulated = list(current)
+    for i, key in enumerate(final):
+        if key in staying:
+            continue
+        if key in simulated:
+            simulated.remove(key)
+        at = simulated.index(final[i - 1]) + 1 if i > 0 else 0
+        simulated.insert(at, key)
+        moves.append(key)
+        moved.add(key)
+        change = managed.get(key)
+        if change is None:
+            # Objects without a desired order always keep their place
+            raise ValueError(
+                "Unable to keep the position of '%s', list it with an explicit %s"
+                % (key, order_key)
+            )
+        change["desired"][order_key] = base + at
+        fields = [f for f in change["changed_fields"] if f != order_key]
+        if change["action"] != CREATE:
+            change["action"] = UPDATE
+            change["changed_fields"] = fields + [order_key]
+
+    in_place = []
+    for key, change in managed.items():
+        if key in moved:
+            continue
+        change["desired"][order_key] = base + final_index[key]
+        change["changed_fields"] = [
+            f for f in change["changed_fields"] if f != order_key
+        ]
+        if change["action"] == UPDATE and not change["changed_fields"]:
+            change["action"] = UNCHANGED
+        in_place.append(change)
+
+    moving = [managed[key] for key in moves]
+    deletions = [c for c in changes if c["action"] == DELETE]
+    managed_changes = set(id(c) for c in managed.values())
+    others = [
+        c for c in changes if c["action"] != DELETE and id(c) not in managed_changes
+    ]
+    return deletions + moving + in_place + others
+
+
+def apply_changes(module, changes, create, update, delete, delete_many=None):
+    """
+    Sends the API calls of the planned changes, or only reports them in check
+    mode. A failing change does not stop the others.
+
+    :param create: Callable ``(desired)`` returning the created object.
+    :param update: Callable ``(desired, current)`` returning the updated object.
+    :param delete: Callable ``(current)`` deleting the object.
+    :param delete_many: Callable ``(currents)`` deleting a list of objects,
+        used instead of ``delete`` for collections with a bulk delete API.
+        The deletions are sent before the other changes, as with ``delete``.
+    :return: Tuple ``(changed, report, failed)`` where ``report`` holds one
+        entry per change and ``failed`` the number of changes that failed.
+    """
+    changed = False
+    failed = 0
+    report = []
+    deletions = []
+    for change in changes:
+        action = change["action"]
+        entry = dict(
+            name=change["name"],
+            id=change["id"],
+            action=action,
+            changed_fields=change["changed_fields"],
+        )
+        report.append(entry)
+        if action == UNCHANGED:
+            continue
+        changed = True
+        if module.check_mode:
+            continue
+        if action == DELETE and delete_many is not None:
+            deletions.append((change["current"], entry))
+            continue
+        failed += _delete_all(delete_many, deletions)
+        try:
+            if action == CREATE:
+                result = create(change["desired"])
+                entry["id"] = result.get("id") if result else None
+            elif action == UPDATE:
+                update(change["desired"], change["current"])
+            else:
+                delete(change["current"])
+        except Exception as e:
+            failed += 1
+            entry["failed"] = True
+            entry["msg"] = to_native(e)
+    failed += _delete_all(delete_many, deletions)
+    return changed, report, failed
+
+
+def _delete_all(delete_many, deletions):
+    """Deletes the queued objects, returns the number of failed deletions."""
+    if not deletions:
+        return 0
+    queued = list(deletions)
+    del deletions[:]
+    try:
+        delete_many([current for current, unused in queued])
+    except Exception as e:
+        for unused, entry in queued:
+            entry["failed"] = True
+            entry["msg"] = to_native(e)
+        return len(queued)
+    return 0
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                              MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import hashlib
+import json
+import os
+import time
+
+DEFAULT_CACHE_DIR = os.path.join("~", ".ansible", "tmp", "zia")
+DEFAULT_SESSION_CACHE_TTL = 1800
+
+
+def env_flag(name, default=False):
+    """
+    Returns the boolean value of an environment variable.
+
+    :param name: Name of the environment variable
+    :param default: Value returned when the variable is not set
+    :return: True if the variable is set to a truthy value, False otherwise
+    """
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def env_int(name, default):
+    """
+    Returns the integer value of an environment variable, or the default
+    when the variable is unset or not a valid integer.
+    """
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def env_float(name, default):
+    """
+    Returns the float value of an environment variable, or the default
+    when the variable is unset or not a valid number.
+    """
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def cache_dir():
+    """
+    Returns the directory used by the collection for its on-disk caches,
+    creating it with owner-only permissions if it does not exist yet.
+    """
+    path = os.path.expanduser(os.getenv("ZIA_CACHE_DIR") or DEFAULT_CACHE_DIR)
+    if not os.path.isdir(path):
+        os.makedirs(path, mode=0o700, exist_ok=True)
+    return path
+
+
+def tenant_key(*parts):
+    """Builds a stable, filesystem safe key from the given identifiers."""
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+def read_json(path):
+    """Reads a JSON cache file, returning None if it is missing or unreadable."""
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def write_json(path, data):
+    """
+    Atomically writes a JSON cache file readable and writable only by the
+    current user (mode 0600).
+    """
+    tmp_path = "%s.%d.tmp" % (path, os.getpid())
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def remove_file(path):
+    """Removes a cache file, ignoring it if it does not exist."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class ZIASessionCache:
+    """
+    Stores an authenticated ZIA session on disk so that consecutive module
+    executions against the same (username, cloud) reuse a single login.
+
+    The cache is opt-in and controlled by environment variables:
+
+    * ``ZIA_SESSION_CACHE`` - enables the cache when set to ``true``.
+    * ``ZIA_SESSION_CACHE_TTL`` - lifetime of a cached session in seconds.
+    * ``ZIA_CACHE_DIR`` - directory holding the cache files.
+    """
+
+    def __init__(self, username, cloud, ttl=None):
+        self.ttl = (
+            ttl
+            if ttl is not None
+            else env_int("ZIA_SESSION_CACHE_TTL", DEFAULT_SESSION_CACHE_TTL)
+        )
+        self.path = os.path.join(
+            cache_dir(), "session-%s.json" % tenant_key(username, cloud)
+        )
+
+    @staticmethod
+    def enabled():
+        return env_flag("ZIA_SESSION_CACHE")
+
+    def load(self):
+        """
+        Returns the cached session, or None if there is no cached session or
+        it is older than the configured TTL.
+        """
+        entry = read_json(self.path)
+        if not isinstance(entry, dict) or not entry.get("session_id"):
+            return None
+        if time.time() - entry.get("created", 0) >= self.ttl:
+            self.clear()
+            return None
+        return entry
+
+    def store(self, session_id, auth_details):
+        write_json(
+            self.path,
+            {
+                "session_id": session_id,
+                "auth_details": auth_details,
+                "created": time.time(),
+            },
+        )
+
+    def clear(self):
+        remove_file(self.path)
@@ -21,22 +21,45 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import datetime
 import os
 import platform
+import time
+from importlib.util import find_spec
+from traceback import format_exc
 from ansible.module_utils.basic import missing_required_lib, env_fallback
 from ansible.module_utils import ansible_release
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_activation import (
+    ZIAActivationTracker,
+    requires_activation,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_broker import (
+    ZIABrokerClient,
+    ZIABrokerError,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_cache import (
+    ZIASessionCache,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_metrics import (
+    ZIAMetrics,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_ratelimit import (
+    PassThroughLimiter,
+    ZIARequestScheduler,
+)
 
 # Initialize import error variables
 ZSCALER_IMPORT_ERROR = None
 VERSION_IMPORT_ERROR = None
 
-try:
-    from zscaler.zia import ZIAClientHelper as ZIA
-
-    HAS_ZSCALER = True
-except ImportError as e:
-    ZIA = object  # Default to object if import fails
-    HAS_ZSCALER = False
+# Importing the SDK takes most of a module's start up time. It is imported
+# when the first client is created, so that modules failing their argument
+# validation, ansible-doc and the sanity tests do not pay for it.
+HAS_ZSCALER = find_spec("zscaler") is not None
+if not HAS_ZSCALER:
     ZSCALER_IMPORT_ERROR = missing_required_lib("zscaler")
 
 try:
@@ -51,6 +74,10 @@ except ImportError as e:
         "plugins.module_utils.version (version information)"
     )
 
+# Attempts of a request failing to connect, as the SDK makes
+CONNECTION_ATTEMPTS = 5
+CONNECTION_RETRY_DELAY = 5
+
 VALID_ZIA_CLOUD = {
     "zscaler",
     "zscloud",
@@ -82,18 +109,18 @@ class ConnectionHelper:
             )
 
 
-class ZIAClientHelper(ZIA):
+class _ZIAClient:
+    """
+    Behavior of the collection's client, combined with the SDK client class
+    by ``_client_class()``.
+    """
+
     def __init__(self, module):
-        if not HAS_ZSCALER:
-            module.fail_json(
-                msg="The 'zscaler' library is required for this module.",
-                exception=ZSCALER_IMPORT_ERROR,
-            )
-        if not HAS_VERSION:
-            module.fail_json(
-                msg="Failed to import the version from the collection's module_utils.",
-                exception=VERSION_IMPORT_ERROR,
-            )
+        # Opt-in instrumentation, returned as _zia_metrics in the module result
+        self.metrics = None
+        if ZIAMetrics.enabled():
+            self.metrics = ZIAMetrics()
+            self.metrics.attach(module)
 
         # Initialize provider to an empty dict if None
         provider = module.params.get("provider") or {}
@@ -127,13 +154,223 @@ class ZIAClientHelper(ZIA):
         if cloud_env not in VALID_ZIA_CLOUD:
             module.fail_json(msg=f"Invalid ZIA Cloud environment '{cloud_env}'.")
 
+        # Opt-in on-disk session cache shared by every task of the run
+        self._session_cache = None
+        if ZIASessionCache.enabled():
+            self._session_cache = ZIASessionCache(username, cloud_env)
+
+        # Opt-in persistent connection: the daemon owns the login, so the
+        # SDK must not authenticate while it is being initialized.
+        self._broker = None
+        self._defer_login = False
+        if ZIABrokerClient.enabled():
+            self._broker = ZIABrokerClient(username, password, api_key, cloud_env)
+            self._defer_login = True
+
+        # Configuration changes are recorded for a deferred activation
+        self.activation_tracker = ZIAActivationTracker(username, cloud_env)
+
+        # Requests of every fork share the tenant's rate limits
+        self._scheduler = None
+        if ZIARequestScheduler.enabled():
+            self._scheduler = ZIARequestScheduler(username, cloud_env)
+
         super().__init__(
             username=username, password=password, api_key=api_key, cloud=cloud_env
         )
+        self._defer_login = False
+        if self._scheduler is not None:
+            self.rate_limiter = PassThroughLimiter()
 
         ansible_version = ansible_release.__version__
         self.user_agent = f"ziacloud-ansible/{ansible_version} (collection/{ansible_collection_version}) ({platform.system().lower()} {platform.machine()})"
 
+    def authenticate(self):
+        """
+        Reuses a cached session when the session cache is enabled, otherwise
+        creates a new ZIA authentication session and stores it in the cache.
+        """
+        if self._defer_login:
+            if self.metrics is not None:
+                self.metrics.record_login("broker", 0)
+            return None
+
+        started = time.time()
+        if self._session_cache is not None:
+            cached = self._session_cache.load()
+            if cached is not None:
+                self.session_id = cached["session_id"]
+                self.auth_details = cached["auth_details"]
+                self.session_refreshed = datetime.datetime.fromtimestamp(
+                    cached["created"]
+                )
+                if self.metrics is not None:
+                    self.metrics.record_login("cache", time.time() - started)
+                return None
+
+        resp = super().authenticate()
+        if self._session_cache is not None and self.session_id:
+            self._session_cache.store(self.session_id, self.auth_details)
+        if self.metrics is not None:
+            self.metrics.record_login("login", time.time() - started)
+        return resp
+
+    def send(self, method, path, json=None, params=None, data=None, headers=None):
+        started = time.time()
+        # Every attempt goes through request(), the scheduler retries the
+        # rate limited ones. Without the scheduler the SDK retries them out
+        # of sight and a call reports no retries.
+        attempts = []
+
+        def request():
+            attempts.append(None)
+            return self._send(method, path, json, params, data, headers)
+
+        if self._scheduler is not None:
+            resp = self._scheduler.send(method, request)
+        else:
+            resp = request()
+        if self.metrics is not None:
+            self.metrics.record(
+                method,
+                path,
+                resp.status_code,
+                time.time() - started,
+                retries=len(attempts) - 1,
+                size=len(resp.content or b""),
+            )
+        # Any write makes the cached name indexes of the collection stale
+        if method != "GET":
+            ZIAResourceIndex.invalidate_path(self, path)
+            if resp.status_code < 300 and requires_activation(method, path):
+                self.activation_tracker.mark_dirty()
+        return resp
+
+    def _send(self, method, path, json, params, data, headers):
+        if self._broker is not None and self._broker.supports(path, data):
+            request_headers = self.headers.copy()
+            request_headers["User-Agent"] = self.user_agent
+            if headers is not None:
+                request_headers.update(headers)
+            try:
+                return self._broker.send(
+                    self.url,
+                    method,
+                    path,
+                    json=json,
+                    params=params,
+                    data=data,
+                    headers=request_headers,
+                    retry_rate_limited=self._scheduler is None,
+                )
+            except ZIABrokerError:
+                # Fall back to a direct connection for the rest of the task
+                self._broker = None
+
+        resp = self._request(method, path, json, params, data, headers)
+        # A cached session may have been invalidated server side (logout, idle
+        # timeout), drop it and log in again once before giving up.
+        if resp.status_code == 401 and self._session_cache is not None:
+            self._session_cache.clear()
+            self.session_id = None
+            self.auth_details = None
+            self.authenticate()
+            resp = self._request(method, path, json, params, data, headers)
+        return resp
+
+    def _request(self, method, path, json, params, data, headers):
+        """
+        Sends a request with the SDK, or once when the scheduler is active:
+        the SDK retries rate limited requests itself, after Retry-After but
+        without pausing the other requesters of the tenant.
+        """
+        if self._scheduler is None or "zscsb" in path:
+            # Sandbox submissions go to another API, left to the SDK
+            return super().send(
+                method, path, json=json, params=params, data=data, headers=headers
+            )
+        import requests
+
+        url = "%s/%s" % (self.url, path.lstrip("/"))
+        request_headers = self.headers.copy()
+        request_headers["User-Agent"] = self.user_agent
+        if headers is not None:
+            request_headers.update(headers)
+        cache_key = self.cache.create_key(url, params)
+        if method == "GET" and self.cache.contains(cache_key):
+            return self.cache.get(cache_key)
+        if self.is_session_expired():
+            self.authenticate()
+        attempt = 1
+        while True:
+            try:
+                resp = requests.request(
+                    method=method,
+                    url=url,
+                    json=json,
+                    data=data,
+                    params=params,
+                    headers=request_headers,
+                    timeout=self.timeout,
+                    cookies={"JSESSIONID": self.session_id},
+                )
+                break
+            except requests.RequestException:
+                # Connection errors are retried like the SDK does
+                if attempt >= CONNECTION_ATTEMPTS:
+                    raise
+                attempt += 1
+                time.sleep(CONNECTION_RETRY_DELAY)
+        if method != "GET":
+            self.cache.delete(cache_key)
+        elif resp.status_code == 200:
+            self.cache.add(cache_key, resp)
+        return resp
+
+
+_CLIENT_CLASS = None
+
+
+def _client_class():
+    """Imports the SDK and returns the client class, built once per process."""
+    global _CLIENT_CLASS
+    if _CLIENT_CLASS is None:
+        from zscaler.zia import ZIAClientHelper as ZIA
+
+        _CLIENT_CLASS = type("ZIAClientHelper", (_ZIAClient, ZIA), {})
+    return _CLIENT_CLASS
+
+
+class ZIAClientHelper:
+    """
+    ZIA API client of the modules, a subclass of the SDK's ``ZIAClientHelper``
+    created on first use.
+
+    Example:
+        client = ZIAClientHelper(module)
+        rules = client.firewall.list_rules()
+    """
+
+    def __new__(cls, module):
+        if not HAS_ZSCALER:
+            module.fail_json(
+                msg="The 'zscaler' library is required for this module.",
+                exception=ZSCALER_IMPORT_ERROR,
+            )
+        if not HAS_VERSION:
+            module.fail_json(
+                msg="Failed to import the version from the collection's module_utils.",
+                exception=VERSION_IMPORT_ERROR,
+            )
+        try:
+            client_class = _client_class()
+        except ImportError:
+            module.fail_json(
+                msg="Failed to import the 'zscaler' library.",
+                exception=format_exc(),
+            )
+        return client_class(module)
+
     @staticmethod
     def zia_argument_spec():
         return dict(
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                              MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Concurrent execution of dependent API operations.
+
+``run_graph`` runs a set of tasks in a thread pool, starting every task as
+soon as the tasks it depends on have succeeded, so independent chains of
+operations (such as the objects of different sites) progress in parallel.
+The requests of all threads are paced by the client's rate limiter.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from ansible.module_utils._text import to_native
+
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+def topological_order(tasks, dependencies):
+    """
+    Returns the task keys in an order where every task comes after the tasks
+    it depends on.
+
+    :raises ValueError: if a dependency is unknown or the graph has a cycle.
+    """
+    pending = dict((key, set(dependencies.get(key, ()))) for key in tasks)
+    for key, requires in pending.items():
+        unknown = requires - set(tasks)
+        if unknown:
+            raise ValueError(
+                "Task %s depends on unknown tasks %s" % (key, sorted(unknown))
+            )
+    order = []
+    while pending:
+        ready = [key for key, requires in pending.items() if not requires]
+        if not ready:
+            raise ValueError("Dependency cycle between tasks %s" % sorted(pending))
+        for key in ready:
+            del pending[key]
+            order.append(key)
+        for requires in pending.values():
+            requires.difference_update(ready)
+    return order
+
+
+def run_graph(tasks, dependencies, concurrency):
+    """
+    Runs callables in dependency order, up to ``concurrency`` at a time.
+
+    A task whose dependency failed or was skipped is skipped; the other
+    tasks keep running.
+
+    :param tasks: Dict of task key to a callable without arguments.
+    :param dependencies: Dict of task key to the keys of the tasks that
+        must succeed before it starts.
+    :param concurrency: Maximum number of tasks running at the same time.
+    :return: Dict of task key to a dict with ``status`` and either the
+        ``result`` of the callable or the error ``msg``.
+    """
+    order = topological_order(tasks, dependencies)
+    requires = dict((key, set(dependencies.get(key, ()))) for key in tasks)
+    dependents = dict((key, []) for key in tasks)
+    for key in order:
+        for dependency in requires[key]:
+            dependents[dependency].append(key)
+
+    outcomes = {}
+
+    def skip(key):
+        for dependent in dependents[key]:
+            if dependent not in outcomes:
+                outcomes[dependent] = dict(
+                    status=SKIPPED, msg="Skipped because %s did not succeed" % key
+                )
+                skip(dependent)
+
+    ready = [key for key in order if not requires[key]]
+    running = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        while ready or running:
+            while ready and len(running) < concurrency:
+                key = ready.pop(0)
+                running[pool.submit(tasks[key])] = key
+            done, unused = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = running.pop(future)
+                try:
+                    outcomes[key] = dict(status=SUCCEEDED, result=future.result())
+                except Exception as e:
+                    outcomes[key] = dict(status=FAILED, msg=to_native(e))
+                    skip(key)
+                    continue
+                for dependent in dependents[key]:
+                    requires[dependent].discard(key)
+                    if not requires[dependent] and dependent not in outcomes:
+                        ready.append(dependent)
+    return outcomes
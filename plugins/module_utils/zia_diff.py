@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                              MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Declarative, schema driven comparison of desired and existing ZIA objects.
+
+A schema maps every compared attribute to a field spec built with ``field_spec``.
+The kind of a field tells ``diff`` how to compare its values:
+
+* ``AUTO`` - lists are compared as sets, references ``{"id": ...}`` are
+  reduced to their ID, anything else is compared as is.
+* ``SCALAR`` - plain equality.
+* ``SET`` - unordered list; ``None`` and ``[]`` are equal.
+* ``LIST`` - ordered list; ``None`` and ``[]`` are equal.
+* ``ID_REFS`` - list of IDs on the desired side, list of ``{"id": ...}``
+  references (or IDs) on the API side.
+* ``REF`` - single ``{"id": ...}`` reference or ID.
+* ``FLOAT`` - numbers compared after rounding, see
+  ``diff_suppress_func_coordinate``.
+* ``DICT`` - nested object, compared after dropping the ``ignore`` keys.
+* ``IGNORE`` - computed by the API, never compared.
+
+Every attribute is visited once and lists are hashed rather than sorted, so
+the cost of a comparison stays linear in the size of the objects.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+
+AUTO = "auto"
+SCALAR = "scalar"
+SET = "set"
+LIST = "list"
+ID_REFS = "id_refs"
+REF = "ref"
+FLOAT = "float"
+DICT = "dict"
+IGNORE = "ignore"
+
+_LIST_KINDS = (AUTO, SET, LIST, ID_REFS)
+
+
+def field_spec(kind=AUTO, default=None, skip_unset=False, current=None, **options):
+    """
+    Builds the spec of a compared attribute.
+
+    :param kind: How the values are compared, see the module documentation.
+    :param default: Value assumed when either side is None.
+    :param skip_unset: Do not compare the attribute when the desired value
+        is None, instead of treating it as a request to clear it.
+    :param current: Callable returning the value of the attribute from the
+        whole API object, for attributes the API names or encodes differently.
+    :param options: ``places`` for FLOAT fields (default 6), ``ignore`` for
+        DICT fields and ``keys`` to project the objects of SET fields.
+    """
+    spec = dict(kind=kind, default=default, skip_unset=skip_unset, current=current)
+    spec.update(options)
+    return spec
+
+
+def enabled_from_state(obj):
+    """Rule APIs return ``state: ENABLED|DISABLED`` for the ``enabled`` attribute."""
+    if "state" in obj:
+        return obj["state"] == "ENABLED"
+    return obj.get("enabled")
+
+
+def rule_schema(params, **fields):
+    """
+    Returns the schema of a policy rule: every parameter is compared with
+    ``AUTO`` except ``id`` (only compared when set) and ``enabled`` (read
+    from ``state``), unless overridden by ``fields``.
+    """
+    schema = dict((name, field_spec()) for name in params)
+    schema["id"] = field_spec(SCALAR, skip_unset=True)
+    if "enabled" in schema:
+        schema["enabled"] = field_spec(SCALAR, current=enabled_from_state)
+    schema.update(fields)
+    return schema
+
+
+def _hashable(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True)
+    return value
+
+
+def _ref_id(value):
+    return value.get("id") if isinstance(value, dict) else value
+
+
+def _as_set(values, keys=None):
+    result = set()
+    for value in values or ():
+        if isinstance(value, dict):
+            if keys is not None:
+                value = dict((k, value.get(k)) for k in keys)
+            elif "id" in value:
+                value = value["id"]
+        result.add(_hashable(value))
+    return result
+
+
+def _normalize(spec, value):
+    kind = spec["kind"]
+    if value is None:
+        value = spec["default"]
+    if kind in (SET, ID_REFS) or (kind == AUTO and isinstance(value, list)):
+        return frozenset(_as_set(value, spec.get("keys")))
+    if kind == LIST:
+        return [_hashable(v) for v in value or ()]
+    if kind == REF or (kind == AUTO and isinstance(value, dict) and "id" in value):
+        return _ref_id(value)
+    if kind == FLOAT:
+        if value is None:
+            return None
+        try:
+            return round(float(value), spec.get("places", 6))
+        except (TypeError, ValueError):
+            return value
+    if kind == DICT and isinstance(value, dict):
+        ignore = spec.get("ignore", ())
+        return dict((k, v) for k, v in value.items() if k not in ignore)
+    return value
+
+
+def _empty(spec, value):
+    # None and an empty list are the same for list like fields
+    if value is None:
+        return spec["kind"] in _LIST_KINDS
+    return isinstance(value, frozenset) and not value
+
+
+def diff(desired, current, schema):
+    """
+    Compares a desired object with the object returned by the API.
+
+    :param desired: Dict of the desired attributes.
+    :param current: Dict of the existing object, or None.
+    :param schema: Dict mapping attribute names to ``field_spec`` specs.
+    :return: List of ``{"field", "current", "desired"}`` dicts, one per
+        attribute that differs, in schema order.
+    """
+    current = current or {}
+    differences = []
+    for name, spec in schema.items():
+        if spec["kind"] == IGNORE:
+            continue
+        desired_value = desired.get(name)
+        if desired_value is None and spec["skip_unset"]:
+            continue
+        if spec["current"] is not None:
+            current_value = spec["current"](current)
+        else:
+            current_value = current.get(name)
+
+        normalized_desired = _normalize(spec, desired_value)
+        normalized_current = _normalize(spec, current_value)
+        if normalized_desired == normalized_current:
+            continue
+        if _empty(spec, normalized_desired) and _empty(spec, normalized_current):
+            continue
+        differences.append(
+            dict(field=name, current=current_value, desired=desired_value)
+        )
+    return differences
+
+
+def changed_fields(desired, current, schema):
+    """Returns the names of the attributes that differ."""
+    return [d["field"] for d in diff(desired, current, schema)]
+
+
+def clear_unset(desired, current, schema):
+    """
+    Sets the list attributes left unset in ``desired`` to an empty list when
+    the existing object has values for them, so that an update sent with
+    the merged object clears them.
+    """
+    current = current or {}
+    for name, spec in schema.items():
+        if spec["kind"] == IGNORE or spec["skip_unset"] or name == "enabled":
+            continue
+        if desired.get(name) is None:
+            if spec["current"] is not None:
+                current_value = spec["current"](current)
+            else:
+                current_value = current.get(name)
+            if isinstance(current_value, list):
+                desired[name] = []
+    return desired
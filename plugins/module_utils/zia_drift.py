@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                              MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Drift of a ZIA tenant from desired-state files.
+
+A desired-state file is a YAML (or JSON) mapping of resource types, named
+like the ``zia_index`` resources, to lists of objects written with the
+options of the matching resource module:
+
+    url_filtering_rules:
+      - name: Block Gambling
+        action: BLOCK
+        url_categories: [GAMBLING]
+    rule_labels:
+      - name: Corporate
+
+Every object is looked up by name in the index of its collection and
+compared with the field specs the resource modules use. Only the attributes
+an object sets are compared.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+from importlib.util import find_spec
+
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_diff import (
+    diff,
+    field_spec,
+    rule_schema,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_firewall import (
+    FIREWALL_RULE_SCHEMA,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    CLOUD_APP_CONTROL_RULE_TYPES,
+    RESOURCES,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_schemas import (
+    FIELD_SPECS as RESOURCE_FIELD_SPECS,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_url_filtering import (
+    URL_FILTERING_RULE_SCHEMA,
+    validate_additional_fields,
+    validate_and_convert_time_fields,
+)
+
+HAS_YAML = find_spec("yaml") is not None
+
+DESIRED_STATE_EXTENSIONS = (".yml", ".yaml", ".json")
+
+# Attributes compared differently from ``AUTO``, per resource type
+FIELD_SPECS = dict(
+    RESOURCE_FIELD_SPECS,
+    firewall_rules=FIREWALL_RULE_SCHEMA,
+    url_filtering_rules=URL_FILTERING_RULE_SCHEMA,
+)
+
+
+# Options of the resource modules that are not attributes of the object
+NOT_COMPARED = ("state", "rule_type")
+
+IN_SYNC = "in_sync"
+DRIFTED = "drifted"
+MISSING = "missing"
+UNEXPECTED = "unexpected"
+INVALID = "invalid"
+STATUSES = (IN_SYNC, DRIFTED, MISSING, UNEXPECTED, INVALID)
+
+
+def _prepare_url_filtering_rule(rule):
+    # Same conversions as the module, size_quota is set in MB for instance
+    validate_and_convert_time_fields(rule)
+    validate_additional_fields(rule)
+
+
+# Conversions applied to a desired object before it is compared
+PREPARE = {
+    "url_filtering_rules": _prepare_url_filtering_rule,
+}
+
+
+def desired_state_files(path):
+    """Returns the desired-state files below ``path``, in a stable order."""
+    if os.path.isfile(path):
+        return [path]
+    files = []
+    for root, dirs, names in os.walk(path):
+        dirs.sort()
+        files.extend(
+            os.path.join(root, name)
+            for name in sorted(names)
+            if name.endswith(DESIRED_STATE_EXTENSIONS)
+        )
+    return files
+
+
+def load_desired_state(path):
+    """
+    Reads the desired-state files below ``path``.
+
+    :return: Dict mapping every resource type to a list of
+        ``(file, object)`` tuples, in file order.
+    :raises ValueError: When a file is not a mapping of supported resource
+        types to lists of objects.
+    """
+    import yaml
+
+    desired = {}
+    for file_path in desired_state_files(path):
+        with open(file_path) as f:
+            content = yaml.safe_load(f)
+        if content is None:
+            continue
+        if not isinstance(content, dict):
+            raise ValueError("%s is not a mapping of resource types" % file_path)
+        for resource, objects in content.items():
+            if resource not in RESOURCES:
+                raise ValueError(
+                    "Unsupported resource type '%s' in %s" % (resource, file_path)
+                )
+            if not isinstance(objects, list) or not all(
+                isinstance(obj, dict) for obj in objects
+            ):
+                raise ValueError(
+                    "%s of %s must be a list of objects" % (resource, file_path)
+                )
+            desired.setdefault(resource, []).extend((file_path, obj) for obj in objects)
+    return desired
+
+
+def name_key(resource, obj):
+    """Returns the attribute the object is looked up by, None if it has none."""
+    for key in RESOURCES[resource][2]:
+        if obj.get(key) is not None:
+            return key
+    return None
+
+
+def object_scope(resource, obj):
+    """
+    Returns the scope of the collection holding the object.
+
+    :raises ValueError: When a Cloud App Control rule has no valid rule_type.
+    """
+    if "{scope}" not in RESOURCES[resource][0]:
+        return None
+    rule_type = obj.get("rule_type")
+    if rule_type not in CLOUD_APP_CONTROL_RULE_TYPES:
+        raise ValueError(
+            "rule_type must be one of %s" % ", ".join(CLOUD_APP_CONTROL_RULE_TYPES)
+        )
+    return rule_type
+
+
+def drift_schema(resource, obj):
+    """Returns the schema comparing the attributes the desired object sets."""
+    names = [name for name in obj if name not in NOT_COMPARED]
+    specs = FIELD_SPECS.get(resource, {})
+    if resource.endswith("_rules"):
+        schema = rule_schema(names, **specs)
+    else:
+        schema = dict((name, field_spec()) for name in names)
+        schema.update(specs)
+    return dict((name, schema[name]) for name in names)
+
+
+def object_drift(resource, obj, current):
+    """
+    Compares a desired object with the live one.
+
+    :param obj: Dict of the desired object, with the resource module options.
+    :param current: Dict of the live object, or None if it does not exist.
+    :return: Tuple of the status and of the list of ``diff`` differences.
+    """
+    if obj.get("state", "present") == "absent":
+        return (UNEXPECTED if current is not None else IN_SYNC), []
+    if current is None:
+        return MISSING, []
+    obj = dict(obj)
+    if resource in PREPARE:
+        PREPARE[resource](obj)
+    differences = diff(obj, current, drift_schema(resource, obj))
+    return (DRIFTED if differences else IN_SYNC), differences
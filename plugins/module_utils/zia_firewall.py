@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                              MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Helpers shared by the Cloud Firewall Filtering rule modules.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.utils import (
+    deleteNone,
+    validate_iso3166_alpha2,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_diff import (
+    SCALAR,
+    changed_fields,
+    clear_unset,
+    field_spec,
+    rule_schema,
+)
+
+FIREWALL_RULE_PARAMS = [
+    "id",
+    "name",
+    "order",
+    "rank",
+    "locations",
+    "location_groups",
+    "departments",
+    "groups",
+    "users",
+    "time_windows",
+    "action",
+    "enabled",
+    "description",
+    "device_groups",
+    "devices",
+    "enable_full_logging",
+    "src_ips",
+    "src_ip_groups",
+    "src_ipv6_groups",
+    "dest_addresses",
+    "dest_ip_categories",
+    "dest_countries",
+    "source_countries",
+    "exclude_src_countries",
+    "dest_ip_groups",
+    "dest_ipv6_groups",
+    "nw_services",
+    "nw_service_groups",
+    "nw_applications",
+    "nw_application_groups",
+    "app_services",
+    "app_service_groups",
+    "labels",
+    "device_trust_levels",
+    "workload_groups",
+]
+
+
+def firewall_rule_spec():
+    """Returns the argument spec describing a single Cloud Firewall Filtering rule."""
+    id_spec = dict(
+        type="list",
+        elements="int",
+        required=False,
+    )
+    return dict(
+        id=dict(type="int", required=False),
+        name=dict(type="str", required=True),
+        description=dict(type="str", required=False),
+        enabled=dict(type="bool", required=False),
+        order=dict(type="int", required=False),
+        rank=dict(type="int", required=False, default=7),
+        device_groups=id_spec,
+        devices=id_spec,
+        nw_applications=id_spec,
+        dest_ip_groups=id_spec,
+        dest_ipv6_groups=id_spec,
+        nw_services=id_spec,
+        nw_service_groups=id_spec,
+        nw_application_groups=id_spec,
+        app_services=id_spec,
+        app_service_groups=id_spec,
+        labels=id_spec,
+        locations=id_spec,
+        location_groups=id_spec,
+        departments=id_spec,
+        groups=id_spec,
+        users=id_spec,
+        time_windows=id_spec,
+        src_ip_groups=id_spec,
+        src_ipv6_groups=id_spec,
+        workload_groups=id_spec,
+        src_ips=dict(type="list", elements="str", required=False),
+        dest_addresses=dict(type="list", elements="str", required=False),
+        dest_ip_categories=dict(type="list", elements="str", required=False),
+        dest_countries=dict(type="list", elements="str", required=False),
+        source_countries=dict(type="list", elements="str", required=False),
+        exclude_src_countries=dict(type="bool", required=False),
+        enable_full_logging=dict(type="bool", default=False, required=False),
+        action=dict(
+            type="str",
+            required=False,
+            choices=["ALLOW", "BLOCK_DROP", "BLOCK_RESET", "BLOCK_ICMP", "EVAL_NWAPP"],
+        ),
+        device_trust_levels=dict(
+            type="list",
+            elements="str",
+            required=False,
+            choices=[
+                "ANY",
+                "UNKNOWN_DEVICETRUSTLEVEL",
+                "LOW_TRUST",
+                "MEDIUM_TRUST",
+                "HIGH_TRUST",
+            ],
+        ),
+    )
+
+
+def validate_countries(rule):
+    """
+    Validates the ISO3166 Alpha2 country codes of the rule and prepends the
+    'COUNTRY_' prefix expected by the API.
+    """
+    for attr, label in (
+        ("source_countries", "source"),
+        ("dest_countries", "destination"),
+    ):
+        country_codes = rule.get(attr)
+        if not country_codes:
+            continue
+        validated_countries = []
+        for country_code in country_codes:
+            if not validate_iso3166_alpha2(country_code):
+                raise ValueError(
+                    f"The {label} country code '{country_code}' is not a valid ISO3166 Alpha2 code. "
+                    "Please visit the following site for reference: "
+                    "https://en.wikipedia.org/wiki/List_of_ISO_3166_country_codes"
+                )
+            validated_countries.append(f"COUNTRY_{country_code}")
+        rule[attr] = validated_countries
+
+    # Validation for exclude_src_countries and source_countries
+    if rule.get("exclude_src_countries") and not rule.get("source_countries"):
+        raise ValueError(
+            "When 'exclude_src_countries' is set to True, 'source_countries' must be specified with at least one country."
+        )
+
+
+def is_protected_rule(rule):
+    """Default and predefined rules cannot be deleted."""
+    return bool(rule.get("default_rule", False) or rule.get("predefined", False))
+
+
+FIREWALL_RULE_SCHEMA = rule_schema(
+    FIREWALL_RULE_PARAMS,
+    # Only compared when specified in the playbook
+    exclude_src_countries=field_spec(SCALAR, skip_unset=True),
+)
+
+
+def rule_differences(rule, existing_rule):
+    """
+    Compares a desired rule with the rule returned by the API.
+
+    List attributes left unset in the desired rule are cleared on update, so
+    they are set to an empty list in ``rule`` as a side effect.
+
+    :param rule: Dict of the desired rule, keyed by FIREWALL_RULE_PARAMS.
+    :param existing_rule: Dict of the existing rule, or None.
+    :return: List of the attribute names that differ.
+    """
+    differences = changed_fields(rule, existing_rule, FIREWALL_RULE_SCHEMA)
+    clear_unset(rule, existing_rule, FIREWALL_RULE_SCHEMA)
+    return differences
+
+
+def rule_payload(rule):
+    """Builds the keyword arguments of the SDK add_rule/update_rule calls."""
+    return deleteNone(
+        dict(
+            name=rule.get("name"),
+            order=rule.get("order"),
+            rank=rule.get("rank"),
+            action=rule.get("action"),
+            enabled=rule.get("enabled"),
+            description=rule.get("description"),
+            enable_full_logging=rule.get("enable_full_logging"),
+            src_ips=rule.get("src_ips"),
+            dest_addresses=rule.get("dest_addresses"),
+            dest_ip_categories=rule.get("dest_ip_categories"),
+            dest_countries=rule.get("dest_countries"),
+            source_countries=rule.get("source_countries"),
+            exclude_src_countries=rule.get("exclude_src_countries"),
+            device_trust_levels=rule.get("device_trust_levels"),
+            device_groups=rule.get("device_groups"),
+            devices=rule.get("devices"),
+            nw_applications=rule.get("nw_applications"),
+            dest_ip_groups=rule.get("dest_ip_groups"),
+            dest_ipv6_groups=rule.get("dest_ipv6_groups"),
+            nw_services=rule.get("nw_services"),
+            nw_service_groups=rule.get("nw_service_groups"),
+            nw_application_groups=rule.get("nw_application_groups"),
+            app_services=rule.get("app_services"),
+            app_service_groups=rule.get("app_service_groups"),
+            labels=rule.get("labels"),
+            locations=rule.get("locations"),
+            location_groups=rule.get("location_groups"),
+            departments=rule.get("departments"),
+            groups=rule.get("groups"),
+            users=rule.get("users"),
+            time_windows=rule.get("time_windows"),
+            src_ip_groups=rule.get("src_ip_groups"),
+            src_ipv6_groups=rule.get("src_ipv6_groups"),
+            workload_groups=rule.get("workload_groups"),
+        )
+    )
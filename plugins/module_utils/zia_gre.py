@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                              MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Virtual IP and internal range selection for GRE tunnels.
+
+Creating a GRE tunnel needs the two closest diverse virtual IPs (VIPs) of its
+source IP and, for a numbered tunnel, an available internal /29 range. The
+VIP recommendations of a source IP rarely change, so they are cached per
+tenant in the collection cache directory for ``ZIA_VIP_CACHE_TTL`` seconds.
+``GREInternalRanges`` lists the available ranges once for a batch of tunnels
+and hands a distinct range to each of them.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_cache import (
+    cache_dir,
+    env_int,
+    read_json,
+    tenant_key,
+    write_json,
+)
+
+DEFAULT_VIP_CACHE_TTL = 86400
+VIP_CONCURRENCY = 4
+
+# Recommendations fetched in this process, keyed by tenant and source IP
+_VIPS = {}
+_VIPS_LOCK = threading.Lock()
+
+
+def _vip_cache_path(tenant):
+    return os.path.join(cache_dir(), "vips-%s.json" % tenant)
+
+
+def tunnel_vips(tunnel):
+    """
+    Returns the ``(primary, secondary)`` VIP IDs of an existing tunnel, or
+    None if it does not have both.
+    """
+    primary = (tunnel.get("primary_dest_vip") or {}).get("id")
+    secondary = (tunnel.get("secondary_dest_vip") or {}).get("id")
+    if primary is None or secondary is None:
+        return None
+    return primary, secondary
+
+
+def closest_diverse_vips(client, source_ip):
+    """
+    Returns the IDs of the closest VIP of ``source_ip`` and of the closest
+    VIP in another city, as ``get_closest_diverse_vip_ids`` does, reusing a
+    cached recommendation when there is one.
+    """
+    ttl = env_int("ZIA_VIP_CACHE_TTL", DEFAULT_VIP_CACHE_TTL)
+    tenant = tenant_key(
+        getattr(client, "username", None), getattr(client, "env_cloud", None)
+    )
+    with _VIPS_LOCK:
+        vips = _VIPS.get((tenant, source_ip))
+    if vips is not None:
+        return vips
+
+    path = _vip_cache_path(tenant)
+    cached = read_json(path) if ttl > 0 else None
+    entry = (cached or {}).get(source_ip)
+    if isinstance(entry, dict) and time.time() - entry.get("created", 0) < ttl:
+        vips = tuple(entry["vips"])
+    else:
+        vips = tuple(client.traffic.get_closest_diverse_vip_ids(source_ip))
+        if ttl > 0:
+            # Other forks may have added recommendations since the file was read
+            cached = read_json(path) or {}
+            cached[source_ip] = {"created": time.time(), "vips": list(vips)}
+            write_json(path, cached)
+    with _VIPS_LOCK:
+        _VIPS[(tenant, source_ip)] = vips
+    return vips
+
+
+def recommend_vips(client, source_ips):
+    """Returns the closest diverse VIPs of several source IPs, fetched in parallel."""
+    source_ips = sorted(set(source_ips))
+    if not source_ips:
+        return {}
+
+    def recommend(source_ip):
+        return source_ip, closest_diverse_vips(client, source_ip)
+
+    with ThreadPoolExecutor(max_workers=min(VIP_CONCURRENCY, len(source_ips))) as pool:
+        return dict(pool.map(recommend, source_ips))
+
+
+class GREInternalRanges:
+    """
+    Available internal ranges of numbered GRE tunnels, listed once.
+
+    Example:
+        ranges = GREInternalRanges(client, count=len(new_tunnels))
+        tunnel["internal_ip_range"] = ranges.allocate()
+    """
+
+    def __init__(self, client, count=1):
+        """
+        :param count: Number of ranges listed, at least the number of
+            tunnels that will call ``allocate``.
+        """
+        self.client = client
+        self.count = max(count, 1)
+        self._ranges = None
+        self._lock = threading.Lock()
+
+    def allocate(self):
+        """Returns a range that no other tunnel of the batch was given."""
+        with self._lock:
+            if self._ranges is None:
+                ranges = self.client.traffic.list_gre_ranges(limit=self.count)
+                self._ranges = list(ranges) if ranges else []
+            if not self._ranges:
+                raise Exception("No available IP ranges found.")
+            first_range = self._ranges.pop(0)
+            return "%s-%s" % (
+                first_range["start_ip_address"],
+                first_range["end_ip_address"],
+            )
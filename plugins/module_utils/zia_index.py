@@ -0,0 +1,366 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                              MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Name to object indexes for ZIA resource collections.
+
+Modules look up existing objects by name (or another unique attribute) by
+listing the whole collection. ``ZIAResourceIndex`` lists a collection once,
+builds hash indexes from it and shares them within the process. When
+``ZIA_INDEX_CACHE=true`` the index is also persisted per tenant in the
+collection cache directory, so the following tasks of the run reuse it for up
+to ``ZIA_INDEX_CACHE_TTL`` seconds. Any write sent through
+``ZIAClientHelper`` to a collection drops its index.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import copy
+import os
+import time
+
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_cache import (
+    cache_dir,
+    env_flag,
+    env_int,
+    read_json,
+    remove_file,
+    tenant_key,
+    write_json,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_pagination import (
+    list_items,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_snapshot import (
+    snapshot_items,
+)
+
+DEFAULT_INDEX_CACHE_TTL = 300
+
+# resource -> (API collection path, list function, indexed attributes)
+# The path may contain a "{scope}" placeholder for collections that are
+# partitioned by a type, such as the Cloud App Control rules.
+RESOURCES = {
+    "cloud_app_control_rules": (
+        "webApplicationRules/{scope}",
+        lambda client, scope: client.cloudappcontrol.list_rules(rule_type=scope),
+        ("name",),
+    ),
+    "departments": (
+        "departments",
+        lambda client, scope: client.users.list_departments(),
+        ("name",),
+    ),
+    "dlp_dictionaries": (
+        "dlpDictionaries",
+        lambda client, scope: client.dlp.list_dicts(),
+        ("name",),
+    ),
+    "dlp_engines": (
+        "dlpEngines",
+        lambda client, scope: client.dlp.list_dlp_engines(),
+        ("name",),
+    ),
+    "dlp_notification_templates": (
+        "dlpNotificationTemplates",
+        lambda client, scope: client.dlp.list_dlp_templates(),
+        ("name",),
+    ),
+    "dlp_web_rules": (
+        "webDlpRules",
+        lambda client, scope: client.web_dlp.list_rules(),
+        ("name",),
+    ),
+    "firewall_rules": (
+        "firewallFilteringRules",
+        lambda client, scope: client.firewall.list_rules(),
+        ("name",),
+    ),
+    "forwarding_control_rules": (
+        "forwardingRules",
+        lambda client, scope: client.forwarding_control.list_rules(),
+        ("name",),
+    ),
+    "gre_tunnels": (
+        "greTunnels",
+        lambda client, scope: client.traffic.list_gre_tunnels(),
+        ("source_ip",),
+    ),
+    "groups": (
+        "groups",
+        lambda client, scope: client.users.list_groups(),
+        ("name",),
+    ),
+    "ip_destination_groups": (
+        "ipDestinationGroups",
+        lambda client, scope: client.firewall.list_ip_destination_groups(),
+        ("name",),
+    ),
+    "ip_source_groups": (
+        "ipSourceGroups",
+        lambda client, scope: client.firewall.list_ip_source_groups(),
+        ("name",),
+    ),
+    "location_groups": (
+        "locations/groups",
+        lambda client, scope: client.locations.list_location_groups(),
+        ("name",),
+    ),
+    "locations": (
+        "locations",
+        lambda client, scope: client.locations.list_locations(),
+        ("name",),
+    ),
+    "network_app_groups": (
+        "networkApplicationGroups",
+        lambda client, scope: client.firewall.list_network_app_groups(),
+        ("name",),
+    ),
+    "network_service_groups": (
+        "networkServiceGroups",
+        lambda client, scope: client.firewall.list_network_svc_groups(),
+        ("name",),
+    ),
+    "network_services": (
+        "networkServices",
+        lambda client, scope: client.firewall.list_network_services(),
+        ("name",),
+    ),
+    "rule_labels": (
+        "ruleLabels",
+        lambda client, scope: client.labels.list_labels(),
+        ("name",),
+    ),
+    "static_ips": (
+        "staticIP",
+        # The SDK requests the first page only. The list functions always
+        # call the API, the index reads the snapshot itself.
+        lambda client, scope: list_items(client, "staticIP", snapshot=False),
+        ("ip_address",),
+    ),
+    "time_windows": (
+        "timeWindows",
+        lambda client, scope: client.firewall.list_time_windows(),
+        ("name",),
+    ),
+    "url_categories": (
+        "urlCategories",
+        lambda client, scope: client.url_categories.list_categories(),
+        ("configured_name",),
+    ),
+    "url_filtering_rules": (
+        "urlFilteringRules",
+        lambda client, scope: client.url_filtering.list_rules(),
+        ("name",),
+    ),
+    "vpn_credentials": (
+        "vpnCredentials",
+        lambda client, scope: client.traffic.list_vpn_credentials(),
+        ("fqdn", "ip_address"),
+    ),
+    "zpa_gateways": (
+        "zpaGateways",
+        lambda client, scope: client.zpa_gateway.list_gateways(),
+        ("name",),
+    ),
+}
+
+# Scopes of the Cloud App Control rules
+CLOUD_APP_CONTROL_RULE_TYPES = [
+    "SOCIAL_NETWORKING",
+    "STREAMING_MEDIA",
+    "WEBMAIL",
+    "INSTANT_MESSAGING",
+    "BUSINESS_PRODUCTIVITY",
+    "ENTERPRISE_COLLABORATION",
+    "SALES_AND_MARKETING",
+    "SYSTEM_AND_DEVELOPMENT",
+    "CONSUMER",
+    "HOSTING_PROVIDER",
+    "IT_SERVICES",
+    "FILE_SHARE",
+    "DNS_OVER_HTTPS",
+    "HUMAN_RESOURCES",
+    "LEGAL",
+    "HEALTH_CARE",
+    "FINANCE",
+    "CUSTOM_CAPP",
+    "AI_ML",
+]
+
+# Indexes built in this process, keyed like the cache files
+_MEMORY = {}
+
+
+def _tenant(client):
+    return tenant_key(
+        getattr(client, "username", None), getattr(client, "env_cloud", None)
+    )
+
+
+def _index_path(tenant, collection):
+    return os.path.join(
+        cache_dir(), "index-%s-%s.json" % (tenant, tenant_key(collection))
+    )
+
+
+def _collection_matches(collection, path):
+    return path == collection or path.startswith((collection + "/", collection + "?"))
+
+
+class ZIAResourceIndex:
+    """
+    Hash indexes over a ZIA resource collection.
+
+    Example:
+        rules = ZIAResourceIndex(client, "url_filtering_rules")
+        existing_rule = rules.get("name", rule_name)
+    """
+
+    def __init__(
+        self, client, resource, scope=None, persistent=None, ttl=None, snapshot=None
+    ):
+        """
+        :param persistent: Whether the index is persisted in the cache
+            directory, defaults to ``ZIA_INDEX_CACHE``.
+        :param ttl: Seconds a persisted index is reused, defaults to
+            ``ZIA_INDEX_CACHE_TTL``.
+        :param snapshot: Whether the index is built from a fresh tenant
+            snapshot, defaults to ``ZIA_SNAPSHOT``.
+        """
+        if resource not in RESOURCES:
+            raise ValueError("Unsupported resource type '%s'" % resource)
+        collection, self._list, self.keys = RESOURCES[resource]
+        self.client = client
+        self.resource = resource
+        self.scope = scope
+        self.collection = collection.format(scope=scope)
+        self._tenant = _tenant(client)
+        self._memory_key = (self._tenant, self.collection)
+        self._persist = self.persistent() if persistent is None else persistent
+        self._ttl = (
+            env_int("ZIA_INDEX_CACHE_TTL", DEFAULT_INDEX_CACHE_TTL)
+            if ttl is None
+            else ttl
+        )
+        self._snapshot = snapshot
+        self._data = None
+
+    @staticmethod
+    def persistent():
+        return env_flag("ZIA_INDEX_CACHE")
+
+    @staticmethod
+    def invalidate_path(client, path):
+        """Drops every index of the client's tenant covering the given API path."""
+        path = path.lstrip("/")
+        tenant = _tenant(client)
+        for resource_tenant, collection in list(_MEMORY):
+            if resource_tenant == tenant and _collection_matches(collection, path):
+                _MEMORY.pop((resource_tenant, collection), None)
+        # Indexes may have been persisted by a lookup plugin even when
+        # ZIA_INDEX_CACHE is not set
+        for collection, unused_list, unused_keys in RESOURCES.values():
+            if "{scope}" in collection:
+                prefix = collection.split("{scope}")[0]
+                if not path.startswith(prefix):
+                    continue
+                scope = path[len(prefix) :].split("/")[0].split("?")[0]
+                collection = prefix + scope
+            if _collection_matches(collection, path):
+                remove_file(_index_path(tenant, collection))
+
+    def _build(self):
+        items = snapshot_items(self.client, self.collection, enabled=self._snapshot)
+        if items is None:
+            result = self._list(self.client, self.scope)
+            if not isinstance(result, list):
+                raise Exception(
+                    "Failed to list %s: %s"
+                    % (self.resource, getattr(result, "status_code", result))
+                )
+            items = result.to_list() if hasattr(result, "to_list") else list(result)
+
+        objects = {}
+        indexes = dict((key, {}) for key in self.keys)
+        for item in items:
+            item_id = str(item.get("id"))
+            objects[item_id] = item
+            for key in self.keys:
+                value = item.get(key)
+                if value is not None:
+                    indexes[key].setdefault(str(value), item_id)
+        return {"created": time.time(), "objects": objects, "indexes": indexes}
+
+    def _load(self):
+        if self._data is not None:
+            return self._data
+        data = _MEMORY.get(self._memory_key)
+        if data is None and self._persist:
+            path = _index_path(self._tenant, self.collection)
+            data = read_json(path)
+            if (
+                not isinstance(data, dict)
+                or time.time() - data.get("created", 0) >= self._ttl
+            ):
+                data = self._build()
+                write_json(path, data)
+        elif data is None:
+            data = self._build()
+        _MEMORY[self._memory_key] = data
+        self._data = data
+        return data
+
+    def get(self, key, value):
+        """
+        Returns a copy of the object whose attribute ``key`` equals ``value``,
+        or None if there is no such object.
+        """
+        if value is None:
+            return None
+        data = self._load()
+        if key == "id":
+            item_id = str(value)
+        elif key in data["indexes"]:
+            item_id = data["indexes"][key].get(str(value))
+        else:
+            raise ValueError("'%s' is not indexed for %s" % (key, self.resource))
+        item = data["objects"].get(item_id)
+        return copy.deepcopy(item) if item is not None else None
+
+    def get_by_name(self, name):
+        return self.get(self.keys[0], name)
+
+    def get_by_id(self, item_id):
+        return self.get("id", item_id)
+
+    def values(self):
+        """Returns all objects of the collection. The objects are shared, do not modify them."""
+        return list(self._load()["objects"].values())
+
+    def invalidate(self):
+        self._data = None
+        _MEMORY.pop(self._memory_key, None)
+        remove_file(_index_path(self._tenant, self.collection))
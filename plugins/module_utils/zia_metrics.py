@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                              MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Opt-in instrumentation of the API calls made by a module.
+
+When ``ZIA_METRICS=true``, ``ZIAClientHelper`` records the endpoint, method,
+status, latency, retries and response size of every request, and the time
+spent logging in. The retries are the rate limited attempts retried by the
+request scheduler; with ``ZIA_RATE_LIMIT=false`` the SDK retries them
+without reporting them, and they are not counted. The module result then carries a ``_zia_metrics`` entry
+that the ``zscaler.ziacloud.zia_metrics`` callback plugin aggregates per play.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import re
+import threading
+import time
+
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_cache import (
+    env_flag,
+)
+
+# Object identifiers in API paths: numbers and predefined or custom names
+# such as CUSTOM_01, so that every object of a collection shares an endpoint.
+_ID_SEGMENT = re.compile(r"^(\d+|CUSTOM_\d+|[A-Z0-9_]+)$")
+
+
+def endpoint(path):
+    """Returns the path without query string and with object IDs replaced by ``{id}``."""
+    path = path.split("?", 1)[0].strip("/")
+    segments = [
+        "{id}" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/")
+    ]
+    return "/".join(segments)
+
+
+class ZIAMetrics:
+    """
+    Records the API calls of a module execution.
+
+    Example:
+        metrics = ZIAMetrics()
+        started = time.time()
+        resp = send()
+        metrics.record("GET", "users", resp.status_code, time.time() - started)
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.calls = []
+        self.login = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def enabled():
+        return env_flag("ZIA_METRICS")
+
+    def record(self, method, path, status, latency, retries=0, size=0):
+        call = {
+            "endpoint": endpoint(path),
+            "method": method,
+            "status": status,
+            "latency": round(latency, 6),
+            "retries": retries,
+            "size": size,
+        }
+        # Paginated listings send requests from several threads
+        with self._lock:
+            self.calls.append(call)
+
+    def record_login(self, source, latency):
+        """Records how the session was obtained: "login", "cache" or "broker"."""
+        self.login = {"source": source, "latency": round(latency, 6)}
+
+    def summary(self):
+        with self._lock:
+            calls = list(self.calls)
+        return {
+            "task_time": round(time.time() - self.started, 6),
+            "login": self.login,
+            "total_calls": len(calls),
+            "total_latency": round(sum(call["latency"] for call in calls), 6),
+            # Rate limited responses, whether they were retried or returned
+            "throttled": sum(
+                call["retries"] + (call["status"] == 429) for call in calls
+            ),
+            "calls": calls,
+        }
+
+    def attach(self, module):
+        """Adds the ``_zia_metrics`` entry to the results returned by the module."""
+        exit_json = module.exit_json
+        fail_json = module.fail_json
+
+        def exit_with_metrics(**kwargs):
+            kwargs["_zia_metrics"] = self.summary()
+            exit_json(**kwargs)
+
+        def fail_with_metrics(**kwargs):
+            kwargs["_zia_metrics"] = self.summary()
+            fail_json(**kwargs)
+
+        module.exit_json = exit_with_metrics
+        module.fail_json = fail_with_metrics
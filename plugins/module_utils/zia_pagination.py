@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                              MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Paginated listing of ZIA collections.
+
+The SDK list functions fetch every page of a collection before returning.
+The helpers below send the filters and the page size to the API and fetch
+the pages lazily, so a caller that needs the first match or a bounded
+number of results stops requesting pages as soon as it has them.
+
+Full listings fetch the pages concurrently. The API does not return the
+number of pages, so after the first page a bounded window of the following
+pages is requested in parallel, up to the first page that is not full.
+The requests are paced by the rate limit scheduler of ``ZIAClientHelper``.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_snapshot import (
+    snapshot_items,
+)
+
+DEFAULT_PAGE_SIZE = 1000
+DEFAULT_CONCURRENCY = 4
+MAX_CONCURRENCY = 16
+
+
+def fetch_page(client, path, params, page, page_size):
+    """Returns one page of a collection as a list of objects with snake_case keys."""
+    from zscaler.utils import convert_keys_to_snake
+
+    query = dict((k, v) for k, v in (params or {}).items() if v is not None)
+    query.update(page=page, pageSize=page_size)
+    resp = client.send("GET", path, params=query)
+    if resp.status_code != 200:
+        raise Exception("Failed to list %s (page %d): %s" % (path, page, resp.text))
+    items = resp.json()
+    if not isinstance(items, list):
+        return []
+    return convert_keys_to_snake(items)
+
+
+def iter_pages(client, path, params=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Yields the pages of a paginated collection as lists of objects with
+    snake_case keys.
+
+    :param client: ``ZIAClientHelper`` instance.
+    :param path: API path of the collection, e.g. ``users``.
+    :param params: Query parameters (filters) sent with every page.
+    :param page_size: Number of objects requested per page.
+    """
+    page = 1
+    while True:
+        items = fetch_page(client, path, params, page, page_size)
+        if items:
+            yield items
+        if len(items) < page_size:
+            return
+        page += 1
+
+
+def iter_items(
+    client, path, params=None, page_size=DEFAULT_PAGE_SIZE, max_results=None
+):
+    """
+    Yields the objects of a paginated collection, stopping after
+    ``max_results`` objects when it is set.
+    """
+    if max_results is not None and max_results < page_size:
+        # Do not request more objects than needed
+        page_size = max(max_results, 1)
+    count = 0
+    for page in iter_pages(client, path, params, page_size):
+        for item in page:
+            yield item
+            count += 1
+            if max_results is not None and count >= max_results:
+                return
+
+
+def list_items(
+    client,
+    path,
+    params=None,
+    page_size=DEFAULT_PAGE_SIZE,
+    max_results=None,
+    concurrency=DEFAULT_CONCURRENCY,
+    snapshot=None,
+):
+    """
+    Returns the objects of a paginated collection as a list, fetching up
+    to ``concurrency`` pages at a time. Unfiltered listings are read from
+    the tenant snapshot when there is a fresh one, unless ``snapshot`` is
+    False.
+    """
+    if not any(value is not None for value in (params or {}).values()):
+        items = snapshot_items(client, path, enabled=snapshot)
+        if items is not None:
+            return items[:max_results]
+    if concurrency <= 1:
+        return list(iter_items(client, path, params, page_size, max_results))
+    if max_results is not None and max_results < page_size:
+        page_size = max(max_results, 1)
+
+    # The first page is fetched alone, it tells whether there are more
+    first = fetch_page(client, path, params, 1, page_size)
+    if len(first) < page_size:
+        return first[:max_results]
+
+    # Last page to request: the first page that is not full, or the page
+    # holding the last of max_results objects
+    last_page = None
+    if max_results is not None:
+        last_page = (max_results + page_size - 1) // page_size
+    pages = {1: first}
+    next_page = 2
+    pending = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        while True:
+            while len(pending) < concurrency and (
+                last_page is None or next_page <= last_page
+            ):
+                future = pool.submit(
+                    fetch_page, client, path, params, next_page, page_size
+                )
+                pending[future] = next_page
+                next_page += 1
+            if not pending:
+                break
+            done, unused = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                page = pending.pop(future)
+                pages[page] = future.result()
+                if len(pages[page]) < page_size and (
+                    last_page is None or page < last_page
+                ):
+                    last_page = page
+
+    items = []
+    for page in sorted(pages):
+        if last_page is None or page <= last_page:
+            items.extend(pages[page])
+    return items[:max_results]
+
+
+def find_first(client, path, predicate, params=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Returns the first object of a paginated collection for which
+    ``predicate`` is true, without fetching the following pages, or None.
+    """
+    for item in iter_items(client, path, params, page_size):
+        if predicate(item):
+            return item
+    return None
+
+
+def paging_argument_spec():
+    """Returns the paging options of the info modules."""
+    return dict(
+        page_size=dict(type="int", required=False, default=DEFAULT_PAGE_SIZE),
+        max_results=dict(type="int", required=False),
+        concurrency=dict(type="int", required=False, default=DEFAULT_CONCURRENCY),
+    )
+
+
+def check_paging_params(module, max_page_size=DEFAULT_PAGE_SIZE):
+    """Fails the module if a paging option is out of range."""
+    page_size = module.params.get("page_size")
+    max_results = module.params.get("max_results")
+    concurrency = module.params.get("concurrency")
+    if page_size is not None and not 1 <= page_size <= max_page_size:
+        module.fail_json(msg="page_size must be between 1 and %d" % max_page_size)
+    if max_results is not None and max_results < 1:
+        module.fail_json(msg="max_results must be greater than 0")
+    if concurrency is not None and not 1 <= concurrency <= MAX_CONCURRENCY:
+        module.fail_json(msg="concurrency must be between 1 and %d" % MAX_CONCURRENCY)
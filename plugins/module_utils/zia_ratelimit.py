@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                              MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Rate limit aware scheduling of ZIA API requests.
+
+Every request sent through ``ZIAClientHelper`` takes a token from a bucket
+for its endpoint class: ``GET`` requests and writes (``POST``, ``PUT``,
+``DELETE``) have separate limits. The buckets live in a small state file
+per tenant in the collection cache directory and are updated under an
+exclusive lock, so concurrent module executions (Ansible forks) and threads
+share the same budget instead of each assuming it has the whole limit.
+
+Rate limited responses (``429``) are retried after ``Retry-After`` or a
+jittered exponential backoff, and pause every other requester of the
+tenant for the same time. The scheduler is the only layer retrying them,
+the client sends each attempt once.
+
+The scheduler is enabled by default and configured through environment
+variables:
+
+* ``ZIA_RATE_LIMIT`` - set to ``false`` to disable it.
+* ``ZIA_RATE_LIMIT_GET`` - ``GET`` requests per second (default 2).
+* ``ZIA_RATE_LIMIT_WRITE`` - write requests per second (default 1).
+* ``ZIA_RATE_LIMIT_MAX_RETRIES`` - retries of a rate limited request
+  (default 5).
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import fcntl
+import json
+import os
+import random
+import time
+
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_cache import (
+    cache_dir,
+    env_flag,
+    env_float,
+    env_int,
+    tenant_key,
+)
+
+DEFAULT_GET_RATE = 2.0
+DEFAULT_WRITE_RATE = 1.0
+DEFAULT_MAX_RETRIES = 5
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+
+GET = "get"
+WRITE = "write"
+
+
+def endpoint_class(method):
+    return GET if method.upper() in ("GET", "HEAD") else WRITE
+
+
+def rate_limit_delay(resp):
+    """
+    Returns the number of seconds the API asks to wait before the next
+    request, according to the status and the rate limit headers of a
+    response, or 0.
+    """
+    headers = resp.headers or {}
+    try:
+        if resp.status_code == 429:
+            return float(headers.get("Retry-After", 0))
+        remaining = headers.get("X-Ratelimit-Remaining-Second")
+        if remaining is None:
+            remaining = headers.get("X-Ratelimit-Remaining")
+        if remaining is not None and int(remaining) <= 0:
+            return float(headers.get("X-Ratelimit-Reset", 1))
+    except (TypeError, ValueError):
+        return 1.0
+    return 0
+
+
+def backoff_delay(attempt, retry_after=0):
+    """
+    Returns the delay before retrying a rate limited request: at least
+    ``Retry-After``, otherwise an exponential backoff, with random jitter
+    so that the retries of concurrent requesters do not collide again.
+    """
+    delay = min(BACKOFF_CAP, BACKOFF_BASE * (2**attempt))
+    if retry_after > 0:
+        return retry_after + random.uniform(0, delay / 2.0)
+    return random.uniform(delay / 2.0, delay)
+
+
+class PassThroughLimiter:
+    """Replaces the SDK's per-process rate limiter while the scheduler is active."""
+
+    def wait(self, method):
+        return False, 0
+
+    def update_limits(self, headers):
+        pass
+
+
+class ZIARequestScheduler:
+    """
+    Token buckets shared by every process sending requests for a tenant.
+
+    Example:
+        scheduler = ZIARequestScheduler(username, cloud)
+        resp = scheduler.send("GET", lambda: session.get(url))
+    """
+
+    def __init__(self, username, cloud):
+        self.rates = {
+            GET: max(env_float("ZIA_RATE_LIMIT_GET", DEFAULT_GET_RATE), 0.01),
+            WRITE: max(env_float("ZIA_RATE_LIMIT_WRITE", DEFAULT_WRITE_RATE), 0.01),
+        }
+        self.max_retries = env_int("ZIA_RATE_LIMIT_MAX_RETRIES", DEFAULT_MAX_RETRIES)
+        self.path = os.path.join(
+            cache_dir(), "ratelimit-%s.json" % tenant_key(username, cloud)
+        )
+
+    @staticmethod
+    def enabled():
+        return env_flag("ZIA_RATE_LIMIT", default=True)
+
+    def _update(self, change):
+        """
+        Applies ``change(state, now)`` to the shared state under the lock
+        and returns its result.
+        """
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            with os.fdopen(os.dup(fd), "r+") as f:
+                try:
+                    state = json.load(f)
+                except ValueError:
+                    state = {}
+                if not isinstance(state, dict):
+                    state = {}
+                result = change(state, time.time())
+                f.seek(0)
+                f.truncate()
+                json.dump(state, f)
+            return result
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def reserve(self, method):
+        """
+        Takes a token for a request and returns the number of seconds to
+        wait before sending it. Tokens are reserved ahead of time, so the
+        waiting requesters are served in order without polling the lock.
+        """
+        kind = endpoint_class(method)
+        rate = self.rates[kind]
+        # One second worth of requests may be sent in a burst
+        burst = max(rate, 1.0)
+
+        def take(state, now):
+            bucket = state.get(kind) or {}
+            tokens = bucket.get("tokens", burst)
+            updated = bucket.get("updated", now)
+            tokens = min(burst, tokens + max(now - updated, 0) * rate)
+            tokens -= 1
+            state[kind] = {"tokens": tokens, "updated": now}
+            delay = -tokens / rate if tokens < 0 else 0
+            return max(delay, state.get("paused_until", 0) - now)
+
+        return self._update(take)
+
+    def pause(self, seconds):
+        """Makes every requester of the tenant wait for ``seconds``."""
+
+        def extend(state, now):
+            state["paused_until"] = max(state.get("paused_until", 0), now + seconds)
+
+        self._update(extend)
+
+    def send(self, method, request):
+        """
+        Sends a request once a token is available and retries it while it
+        is rate limited. ``request`` is a callable sending the request and
+        returning the response.
+        """
+        attempt = 0
+        while True:
+            delay = self.reserve(method)
+            if delay > 0:
+                time.sleep(delay)
+            resp = request()
+            wait = rate_limit_delay(resp)
+            if resp.status_code != 429:
+                if wait > 0:
+                    self.pause(wait)
+                return resp
+            if attempt >= self.max_retries:
+                return resp
+            delay = backoff_delay(attempt, wait)
+            self.pause(delay)
+            attempt += 1
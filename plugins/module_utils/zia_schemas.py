@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                              MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Field specs of the resources compared by their modules and by the drift
+report, for the resource types without a helper module of their own. The
+firewall and URL filtering rule schemas live in ``zia_firewall`` and
+``zia_url_filtering``.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_diff import (
+    DICT,
+    IGNORE,
+    REF,
+    SCALAR,
+    SET,
+    field_spec,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_url_categories import (
+    LIST_FIELDS,
+)
+
+# Attributes compared differently from ``AUTO``, per resource type
+FIELD_SPECS = {
+    "cloud_app_control_rules": dict(
+        enforce_time_validity=field_spec(SCALAR, default=False),
+        cascading_enabled=field_spec(SCALAR, default=False),
+        cbi_profile=field_spec(DICT, ignore=("profile_seq",)),
+    ),
+    "dlp_web_rules": dict(
+        min_size=field_spec(SCALAR, default=0),
+        match_only=field_spec(SCALAR, default=False),
+        dlp_download_scan_enabled=field_spec(SCALAR, default=False),
+        zcc_notifications_enabled=field_spec(SCALAR, default=False),
+        zscaler_incident_receiver=field_spec(SCALAR, default=False),
+        icap_server=field_spec(REF),
+    ),
+    "forwarding_control_rules": dict(
+        proxy_gateway=field_spec(REF),
+        zpa_gateway=field_spec(REF),
+        zpa_app_segments=field_spec(SET, keys=("external_id", "name")),
+    ),
+    "url_categories": dict(
+        id=field_spec(IGNORE),
+        # 'super_category' is excluded from the comparison
+        super_category=field_spec(IGNORE),
+        editable=field_spec(SCALAR, default=True),
+        # Lists left unset keep their current entries
+        **dict((name, field_spec(SET, skip_unset=True)) for name in LIST_FIELDS)
+    ),
+    # Secrets are never returned by the API
+    "vpn_credentials": dict(pre_shared_key=field_spec(IGNORE)),
+}
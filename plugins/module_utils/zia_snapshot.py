@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                              MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Snapshots of a ZIA tenant, shared by consecutive playbooks.
+
+The ``zia_tenant_snapshot`` module lists the rules, URL categories, groups,
+locations and other collections of a tenant once and stores them in
+``ZIA_CACHE_DIR``: one gzip compressed JSON lines file per collection and an
+``index.json`` file describing them. When ``ZIA_SNAPSHOT=true``, the
+resource indexes, the lookup plugins and the info modules read the
+collections from the snapshot instead of the API.
+
+A snapshot is only used while it is fresh: younger than the maximum age it
+was taken with, and taken after the last configuration change and the last
+activation recorded for the tenant (see ``zia_activation``).
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import glob
+import gzip
+import json
+import os
+import time
+
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_activation import (
+    ZIAActivationTracker,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_cache import (
+    cache_dir,
+    env_flag,
+    read_json,
+    remove_file,
+    tenant_key,
+    write_json,
+)
+
+# Version of the files layout, snapshots of another version are ignored
+SNAPSHOT_FORMAT = 1
+DEFAULT_SNAPSHOT_MAX_AGE = 3600
+
+
+def _file_name(collection, serial):
+    return "%s.%d.jsonl.gz" % (collection.replace("/", "_"), serial)
+
+
+class ZIASnapshot:
+    """
+    Snapshot of the collections of a tenant.
+
+    Example:
+        snapshot = ZIASnapshot.for_client(client)
+        if snapshot.fresh():
+            rules = snapshot.items("urlFilteringRules")
+    """
+
+    def __init__(self, username, cloud):
+        self.path = os.path.join(
+            cache_dir(), "snapshot-%s" % tenant_key(username, cloud)
+        )
+        self.index_path = os.path.join(self.path, "index.json")
+        self.tracker = ZIAActivationTracker(username, cloud)
+        self._index = None
+
+    @classmethod
+    def for_client(cls, client):
+        return cls(
+            getattr(client, "username", None), getattr(client, "env_cloud", None)
+        )
+
+    @staticmethod
+    def enabled():
+        return env_flag("ZIA_SNAPSHOT")
+
+    def index(self):
+        """Returns the index of the snapshot, or None if there is none."""
+        if self._index is None:
+            index = read_json(self.index_path)
+            if isinstance(index, dict) and index.get("format") == SNAPSHOT_FORMAT:
+                self._index = index
+        return self._index
+
+    def fresh(self):
+        """Returns True if the snapshot exists and can be used."""
+        index = self.index()
+        if index is None:
+            return False
+        created = index.get("created", 0)
+        if time.time() - created >= index.get("max_age", DEFAULT_SNAPSHOT_MAX_AGE):
+            return False
+        last_change = self.tracker.last_change()
+        return last_change is None or last_change < created
+
+    def items(self, collection):
+        """
+        Returns the objects of a collection, or None if the snapshot does
+        not hold it. Freshness is checked by ``fresh()``.
+        """
+        index = self.index()
+        entry = (index or {}).get("collections", {}).get(collection)
+        if entry is None:
+            return None
+        try:
+            with gzip.open(os.path.join(self.path, entry["file"]), "rt") as f:
+                return [json.loads(line) for line in f]
+        except (IOError, OSError, ValueError):
+            # Replaced by a newer snapshot while it was read
+            return None
+
+    def write(self, collections, created, max_age):
+        """
+        Stores a new snapshot.
+
+        :param collections: Dict of the objects of each collection.
+        :param created: Time the listing of the collections started.
+        :param max_age: Seconds the snapshot can be used for.
+        :return: The index of the new snapshot.
+        """
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path, mode=0o700, exist_ok=True)
+        previous = self.index() or {}
+        serial = previous.get("serial", 0) + 1
+        entries = {}
+        for collection, items in collections.items():
+            name = _file_name(collection, serial)
+            tmp_path = os.path.join(self.path, "%s.%d.tmp" % (name, os.getpid()))
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                with os.fdopen(fd, "wb") as raw:
+                    with gzip.GzipFile(fileobj=raw, mode="wb") as f:
+                        for item in items:
+                            f.write(json.dumps(item).encode("utf-8") + b"\n")
+                os.replace(tmp_path, os.path.join(self.path, name))
+            except Exception:
+                remove_file(tmp_path)
+                raise
+            entries[collection] = {"file": name, "count": len(items)}
+
+        index = {
+            "format": SNAPSHOT_FORMAT,
+            "serial": serial,
+            "created": created,
+            "max_age": max_age,
+            "collections": entries,
+        }
+        write_json(self.index_path, index)
+        self._index = index
+        self._remove_files(keep=set(entry["file"] for entry in entries.values()))
+        return index
+
+    def delete(self):
+        """Removes the snapshot. Returns True if there was one."""
+        existed = os.path.exists(self.index_path)
+        remove_file(self.index_path)
+        self._index = None
+        self._remove_files(keep=set())
+        return existed
+
+    def _remove_files(self, keep):
+        for path in glob.glob(os.path.join(self.path, "*.jsonl.gz")):
+            if os.path.basename(path) not in keep:
+                remove_file(path)
+
+
+def snapshot_items(client, collection, enabled=None):
+    """
+    Returns the objects of a collection from the tenant snapshot when
+    ``enabled`` (defaults to ``ZIA_SNAPSHOT``) and the snapshot is fresh,
+    otherwise None.
+    """
+    if not (ZIASnapshot.enabled() if enabled is None else enabled):
+        return None
+    snapshot = ZIASnapshot.for_client(client)
+    if not snapshot.fresh():
+        return None
+    return snapshot.items(collection)
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                              MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Helpers shared by the URL category modules.
+
+Custom URL categories can hold tens of thousands of URLs and IP ranges.
+The update API replaces the whole category. For that reason, list changes
+are computed as a delta with hash sets and sent in chunks through the
+``ADD_TO_LIST`` and ``REMOVE_FROM_LIST`` actions.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+
+# Category attributes supported by the ADD_TO_LIST / REMOVE_FROM_LIST actions
+LIST_FIELDS = {
+    "urls": "urls",
+    "db_categorized_urls": "dbCategorizedUrls",
+    "keywords": "keywords",
+    "keywords_retaining_parent_category": "keywordsRetainingParentCategory",
+    "ip_ranges": "ipRanges",
+    "ip_ranges_retaining_parent_category": "ipRangesRetainingParentCategory",
+}
+
+DEFAULT_CHUNK_SIZE = 1000
+# Upper bound of the serialized entries of one request, well below the
+# request size accepted by the API
+MAX_CHUNK_BYTES = 256 * 1024
+
+
+def list_delta(desired, current):
+    """
+    Returns the entries to add and to remove to turn ``current`` into
+    ``desired``. The order of the entries is preserved and duplicates
+    are dropped.
+    """
+    desired = desired or []
+    current = current or []
+    desired_set = set(desired)
+    current_set = set(current)
+    seen = set()
+    added = []
+    for entry in desired:
+        if entry not in current_set and entry not in seen:
+            seen.add(entry)
+            added.append(entry)
+    removed = [entry for entry in current if entry not in desired_set]
+    return added, removed
+
+
+def category_list_deltas(category, existing_category):
+    """
+    Returns ``{field: (added, removed)}`` for every list attribute of
+    ``category`` that differs from ``existing_category``. Attributes left
+    unset are not managed and are skipped.
+    """
+    deltas = {}
+    for name in LIST_FIELDS:
+        if category.get(name) is None:
+            continue
+        added, removed = list_delta(category[name], existing_category.get(name))
+        if added or removed:
+            deltas[name] = (added, removed)
+    return deltas
+
+
+def chunk_entries(entries, chunk_size=DEFAULT_CHUNK_SIZE, max_bytes=MAX_CHUNK_BYTES):
+    """
+    Splits a list in chunks of at most ``chunk_size`` entries whose JSON
+    encoding stays under ``max_bytes``.
+    """
+    chunk = []
+    size = 0
+    for entry in entries:
+        entry_size = len(json.dumps(entry)) + 1
+        if chunk and (len(chunk) >= chunk_size or size + entry_size > max_bytes):
+            yield chunk
+            chunk = []
+            size = 0
+        chunk.append(entry)
+        size += entry_size
+    if chunk:
+        yield chunk
+
+
+def apply_list_deltas(client, existing_category, deltas, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Sends the list deltas of a category. Removals go first so that the
+    category never exceeds the URL quota in between. Returns the number of
+    API calls made.
+    """
+    category_id = existing_category.get("id")
+    base_payload = {"configuredName": existing_category.get("configured_name")}
+    if existing_category.get("super_category"):
+        base_payload["superCategory"] = existing_category.get("super_category")
+
+    calls = 0
+    for action, position in (("REMOVE_FROM_LIST", 1), ("ADD_TO_LIST", 0)):
+        for name, delta in deltas.items():
+            for chunk in chunk_entries(delta[position], chunk_size):
+                payload = dict(base_payload)
+                payload[LIST_FIELDS[name]] = chunk
+                resp = client.send(
+                    "PUT",
+                    "urlCategories/%s?action=%s" % (category_id, action),
+                    json=payload,
+                )
+                calls += 1
+                if resp.status_code > 299:
+                    raise Exception(
+                        "Failed to update %s of URL category %s (%s): %s"
+                        % (name, category_id, action, resp.text)
+                    )
+    return calls
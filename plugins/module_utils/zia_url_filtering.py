@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                              MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Helpers shared by the URL Filtering rule modules.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import time
+from datetime import datetime
+
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.utils import (
+    deleteNone,
+    localize,
+    validate_timezone,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_diff import (
+    DICT,
+    SCALAR,
+    changed_fields,
+    clear_unset,
+    field_spec,
+    rule_schema,
+)
+
+URL_FILTERING_RULE_PARAMS = [
+    "id",
+    "name",
+    "order",
+    "protocols",
+    "locations",
+    "groups",
+    "departments",
+    "users",
+    "url_categories",
+    "enabled",
+    "time_windows",
+    "rank",
+    "request_methods",
+    "end_user_notification_url",
+    "override_users",
+    "override_groups",
+    "block_override",
+    "time_quota",
+    "size_quota",
+    "description",
+    "location_groups",
+    "labels",
+    "validity_start_time",
+    "validity_end_time",
+    "validity_time_zone_id",
+    "enforce_time_validity",
+    "action",
+    "ciparule",
+    "user_agent_types",
+    "device_trust_levels",
+    "device_groups",
+    "devices",
+    "user_risk_score_levels",
+    "cbi_profile",
+    "workload_groups",
+]
+
+
+def url_filtering_rule_spec():
+    """Returns the argument spec describing a single URL Filtering rule."""
+    id_spec = dict(
+        type="list",
+        elements="int",
+        required=False,
+    )
+    id_name_url_dict_spec = dict(
+        id=dict(type="str", required=True),
+        name=dict(type="str", required=True),
+        url=dict(type="str", required=True),
+    )
+    return dict(
+        id=dict(type="int", required=False),
+        name=dict(type="str", required=True),
+        description=dict(type="str", required=False),
+        enabled=dict(type="bool", required=False),
+        order=dict(type="int", required=False),
+        rank=dict(type="int", required=False, default=7),
+        locations=id_spec,
+        groups=id_spec,
+        departments=id_spec,
+        device_groups=id_spec,
+        devices=id_spec,
+        users=id_spec,
+        override_users=id_spec,
+        override_groups=id_spec,
+        time_windows=id_spec,
+        location_groups=id_spec,
+        labels=id_spec,
+        workload_groups=id_spec,
+        end_user_notification_url=dict(type="str", required=False),
+        block_override=dict(type="bool", required=False),
+        time_quota=dict(type="int", required=False),
+        size_quota=dict(type="int", required=False),
+        validity_start_time=dict(type="str", required=False),
+        validity_end_time=dict(type="str", required=False),
+        validity_time_zone_id=dict(type="str", required=False),
+        enforce_time_validity=dict(type="bool", required=False),
+        url_categories=dict(type="list", elements="str", required=False),
+        cipa_rule=dict(type="bool", required=False),
+        cbi_profile=dict(
+            type="dict",
+            options=id_name_url_dict_spec,
+            required=False,
+        ),
+        action=dict(
+            type="str",
+            required=False,
+            choices=["ANY", "BLOCK", "CAUTION", "ALLOW", "ISOLATE", "ICAP_RESPONSE"],
+        ),
+        protocols=dict(
+            type="list",
+            elements="str",
+            required=False,
+            choices=[
+                "SMRULEF_ZPA_BROKERS_RULE",
+                "ANY_RULE",
+                "TCP_RULE",
+                "UDP_RULE",
+                "DOHTTPS_RULE",
+                "TUNNELSSL_RULE",
+                "HTTP_PROXY",
+                "FOHTTP_RULE",
+                "FTP_RULE",
+                "HTTPS_RULE",
+                "HTTP_RULE",
+                "SSL_RULE",
+                "TUNNEL_RULE",
+                "WEBSOCKETSSL_RULE",
+                "WEBSOCKET_RULE",
+            ],
+        ),
+        request_methods=dict(
+            type="list",
+            elements="str",
+            required=False,
+            choices=[
+                "OPTIONS",
+                "GET",
+                "HEAD",
+                "POST",
+                "PUT",
+                "DELETE",
+                "TRACE",
+                "CONNECT",
+                "OTHER",
+            ],
+        ),
+        user_agent_types=dict(
+            type="list",
+            elements="str",
+            required=False,
+            choices=[
+                "OPERA",
+                "FIREFOX",
+                "MSIE",
+                "MSEDGE",
+                "CHROME",
+                "SAFARI",
+                "OTHER",
+                "MSCHREDGE",
+            ],
+        ),
+        device_trust_levels=dict(
+            type="list",
+            elements="str",
+            required=False,
+            choices=[
+                "ANY",
+                "UNKNOWN_DEVICETRUSTLEVEL",
+                "LOW_TRUST",
+                "MEDIUM_TRUST",
+                "HIGH_TRUST",
+            ],
+        ),
+        user_risk_score_levels=dict(
+            type="list",
+            elements="str",
+            required=False,
+            choices=["LOW", "MEDIUM", "HIGH", "CRITICAL"],
+        ),
+    )
+
+
+def validate_and_convert_time_fields(rule):
+    enforce_time_validity = rule.get("enforce_time_validity")
+    if enforce_time_validity:
+        for field in [
+            "validity_start_time",
+            "validity_end_time",
+            "validity_time_zone_id",
+        ]:
+            if not rule.get(field):
+                raise ValueError(
+                    f"'{field}' must be set when 'enforce_time_validity' is True"
+                )
+
+        timezone_id = rule["validity_time_zone_id"]
+        if not validate_timezone(timezone_id):
+            raise ValueError(f"Invalid timezone ID: {timezone_id}")
+
+        for time_field in ["validity_start_time", "validity_end_time"]:
+            time_str = rule.get(time_field)
+            if time_str:
+                time_obj = datetime.strptime(time_str, "%m/%d/%Y %I:%M %p")
+                time_with_tz = localize(time_obj, timezone_id)
+                rule[time_field] = int(time.mktime(time_with_tz.timetuple()))
+
+
+def validate_additional_fields(rule):
+    """
+    Validates additional fields in the rule.
+    """
+    # Adjust for action 'CAUTION'
+    if rule.get("action") == "CAUTION":
+        # Set request methods when action is 'CAUTION'
+        rule["request_methods"] = ["CONNECT", "GET", "HEAD"]
+
+    # Validate time_quota
+    time_quota = rule.get("time_quota")
+    if time_quota and (time_quota < 15 or time_quota > 600):
+        raise ValueError("time_quota must be within the range of 15 to 600 minutes")
+
+    # Validate and convert size_quota from MB to KB
+    size_quota_mb = rule.get("size_quota")
+    if size_quota_mb:
+        if size_quota_mb < 10 or size_quota_mb > 100000:
+            raise ValueError(
+                "size_quota must be within the range of 10 MB to 100000 MB"
+            )
+        # Convert MB to KB for API
+        rule["size_quota"] = size_quota_mb * 1024
+
+
+URL_FILTERING_RULE_SCHEMA = rule_schema(
+    URL_FILTERING_RULE_PARAMS,
+    block_override=field_spec(SCALAR, default=False),
+    enforce_time_validity=field_spec(SCALAR, default=False),
+    cbi_profile=field_spec(DICT, ignore=("profile_seq",)),
+)
+
+
+def rule_differences(rule, existing_rule):
+    """
+    Compares a desired rule with the rule returned by the API.
+
+    List attributes left unset in the desired rule are cleared on update, so
+    they are set to an empty list in ``rule`` as a side effect.
+
+    :param rule: Dict of the desired rule, keyed by URL_FILTERING_RULE_PARAMS.
+    :param existing_rule: Dict of the existing rule, or None.
+    :return: List of the attribute names that differ.
+    """
+    differences = changed_fields(rule, existing_rule, URL_FILTERING_RULE_SCHEMA)
+    clear_unset(rule, existing_rule, URL_FILTERING_RULE_SCHEMA)
+    return differences
+
+
+def rule_payload(rule):
+    """Builds the keyword arguments of the SDK add_rule/update_rule calls."""
+    return deleteNone(
+        dict(
+            name=rule.get("name"),
+            order=rule.get("order"),
+            protocols=rule.get("protocols"),
+            locations=rule.get("locations"),
+            groups=rule.get("groups"),
+            departments=rule.get("departments"),
+            users=rule.get("users"),
+            device_groups=rule.get("device_groups"),
+            devices=rule.get("devices"),
+            url_categories=rule.get("url_categories"),
+            enabled=rule.get("enabled"),
+            time_windows=rule.get("time_windows"),
+            rank=rule.get("rank"),
+            request_methods=rule.get("request_methods"),
+            end_user_notification_url=rule.get("end_user_notification_url"),
+            override_users=rule.get("override_users"),
+            override_groups=rule.get("override_groups"),
+            block_override=rule.get("block_override"),
+            time_quota=rule.get("time_quota"),
+            size_quota=rule.get("size_quota"),
+            description=rule.get("description"),
+            location_groups=rule.get("location_groups"),
+            labels=rule.get("labels"),
+            validity_start_time=rule.get("validity_start_time"),
+            validity_end_time=rule.get("validity_end_time"),
+            validity_time_zone_id=rule.get("validity_time_zone_id"),
+            enforce_time_validity=rule.get("enforce_time_validity"),
+            action=rule.get("action"),
+            cipa_rule=rule.get("cipa_rule"),
+            user_agent_types=rule.get("user_agent_types"),
+            user_risk_score_levels=rule.get("user_risk_score_levels"),
+            device_trust_levels=rule.get("device_trust_levels"),
+            cbi_profile=rule.get("cbi_profile"),
+            workload_groups=rule.get("workload_groups"),
+        )
+    )
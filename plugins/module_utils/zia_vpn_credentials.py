@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                              MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Helpers shared by the VPN credential modules.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.utils import (
+    deleteNone,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_pagination import (
+    find_first,
+)
+
+VPN_CREDENTIAL_PARAMS = [
+    "id",
+    "type",
+    "fqdn",
+    "ip_address",
+    "pre_shared_key",
+    "comments",
+]
+
+# Maximum number of IDs accepted by one bulkDelete request
+BULK_DELETE_SIZE = 100
+
+
+def validate_vpn_credential_type(vpn_credentials):
+    """
+    Validate the VPN credential type and ensure required attributes are provided.
+    """
+    vpn_type = vpn_credentials.get("type")
+    ip_address = vpn_credentials.get("ip_address")
+    fqdn = vpn_credentials.get("fqdn")
+
+    if vpn_type == "IP" and not ip_address:
+        raise ValueError(
+            "Invalid input argument, ip_address is required for VPN credentials of type 'IP'."
+        )
+    if vpn_type == "UFQDN" and not fqdn:
+        raise ValueError(
+            "Invalid input argument, fqdn attribute is required for VPN credentials of type 'UFQDN'."
+        )
+
+
+def credential_name(credential):
+    """Returns the FQDN or IP address identifying a VPN credential."""
+    return credential.get("fqdn") or credential.get("ip_address")
+
+
+# Attributes the search parameter of the API is not guaranteed to match
+UNSEARCHABLE_KEYS = ("ip_address",)
+
+
+def find_vpn_credential(client, credential_id=None, fqdn=None, ip_address=None):
+    """
+    Returns the VPN credential with the given ID, FQDN or IP address, or None.
+
+    The credential is fetched by ID, or searched by FQDN or IP address on the
+    API side. The search follows the result pages, so a credential it does
+    not find by FQDN does not exist and nothing else is requested. The
+    search is not guaranteed to match IP addresses, so only a missed IP
+    address is looked up in the VPN credentials index, which lists the whole
+    collection.
+    """
+    if credential_id is not None:
+        credential = client.traffic.get_vpn_credential(credential_id=credential_id)
+        if credential:
+            return credential.to_dict()
+    for key, value in (("fqdn", fqdn), ("ip_address", ip_address)):
+        if value is None:
+            continue
+        credential = find_first(
+            client,
+            "vpnCredentials",
+            lambda item: item.get(key) == value,
+            params={"search": value},
+        )
+        if credential is None and key in UNSEARCHABLE_KEYS:
+            credential = ZIAResourceIndex(client, "vpn_credentials").get(key, value)
+        if credential is not None:
+            return credential
+    return None
+
+
+def create_payload(credential):
+    """Builds the keyword arguments of the SDK add_vpn_credential call."""
+    return deleteNone(
+        {
+            "authentication_type": credential.get("type"),
+            "fqdn": credential.get("fqdn"),
+            "ip_address": credential.get("ip_address"),
+            "pre_shared_key": credential.get("pre_shared_key"),
+            "comments": credential.get("comments"),
+        }
+    )
+
+
+def update_vpn_credential(client, existing_credential, **changes):
+    """
+    Updates a VPN credential with a single request, sending the existing
+    object with ``changes`` applied instead of fetching it again.
+    """
+    from zscaler.utils import convert_keys
+
+    credential_id = existing_credential.get("id")
+    payload = dict(existing_credential)
+    payload.update(deleteNone(changes))
+    resp = client.send(
+        "PUT", "vpnCredentials/%s" % credential_id, json=convert_keys(payload)
+    )
+    if resp.status_code > 299:
+        raise Exception(
+            "Failed to update VPN credential %s: %s" % (credential_id, resp.text)
+        )
+    payload.pop("pre_shared_key", None)
+    return payload
+
+
+def delete_vpn_credentials(client, credential_ids):
+    """Deletes VPN credentials with as few bulkDelete requests as possible."""
+    for start in range(0, len(credential_ids), BULK_DELETE_SIZE):
+        chunk = credential_ids[start : start + BULK_DELETE_SIZE]
+        resp = client.send("POST", "vpnCredentials/bulkDelete", json={"ids": chunk})
+        if resp.status_code > 299:
+            raise Exception(
+                "Failed to delete VPN credentials %s: %s"
+                % (", ".join(str(i) for i in chunk), resp.text)
+            )
@@ -54,6 +54,31 @@ options:
     default: present
     choices: ['present']
     type: str
+
+  only_if_changed:
+    description:
+        - Activate only if a module of the collection changed the configuration of the tenant since the last activation.
+        - Every configuration change records a marker per tenant on the host running the modules, in the
+          directory set by the C(ZIA_CACHE_DIR) environment variable. The marker is cleared once the changes are active.
+        - Use it in a handler or in the last task of the play to activate once for all the changes of the play.
+    default: false
+    type: bool
+    version_added: "1.4.0"
+
+  wait:
+    description:
+        - Wait until the activation status is C(ACTIVE), polling the status with an exponential backoff.
+        - When false, the status read right after the activation request is returned.
+    default: true
+    type: bool
+    version_added: "1.4.0"
+
+  timeout:
+    description:
+        - Maximum number of seconds to wait for the activation when C(wait=true).
+    default: 300
+    type: int
+    version_added: "1.4.0"
 """
 
 EXAMPLES = r"""
@@ -61,6 +86,21 @@ EXAMPLES = r"""
   zscaler.ziacloud.zia_activation_status:
     provider: '{{ provider }}'
     status: 'ACTIVE'
+
+# Activate once at the end of the play, only if a task changed the configuration
+- name: Create Rule Label
+  zscaler.ziacloud.zia_rule_labels:
+    provider: '{{ provider }}'
+    name: Example
+  notify: Activate ZIA changes
+
+# In the handlers section of the play
+- name: Activate ZIA changes
+  zscaler.ziacloud.zia_activation_status:
+    provider: '{{ provider }}'
+    status: 'ACTIVE'
+    only_if_changed: true
+  run_once: true
 """
 
 RETURN = r"""
@@ -74,6 +114,9 @@ import traceback
 zia_client_import_error = None
 
 try:
+    from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_activation import (
+        wait_for_activation,
+    )
     from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
         ZIAClientHelper,
     )
@@ -97,13 +140,35 @@ def core(module):
     if desired_status not in [None, "ACTIVE"]:
         module.fail_json(msg=f"Invalid activation status '{desired_status}'")
 
+    tracker = client.activation_tracker
+    marker = tracker.pending()
+    if module.params.get("only_if_changed") and marker is None:
+        module.exit_json(
+            changed=False,
+            data={
+                "status": None,
+                "message": "No configuration change to activate.",
+            },
+        )
+
     original_activation_status = client.activate.status()
 
     # If state is 'present' and the desired activation status does not match the current one, attempt to activate
     if module.params.get("state") == "present":
         if original_activation_status != desired_status:
+            if module.check_mode:
+                module.exit_json(
+                    changed=True, data={"status": original_activation_status}
+                )
             client.activate.activate()
-            new_status = client.activate.status()
+            if module.params.get("wait"):
+                new_status = wait_for_activation(client, module.params.get("timeout"))
+            else:
+                new_status = client.activate.status()
+
+            if new_status == "ACTIVE":
+                tracker.clear(marker)
+                tracker.mark_activated()
 
             if new_status == "PENDING":
                 message = (
@@ -120,6 +185,10 @@ def core(module):
                     changed=True, data={"status": new_status, "message": message}
                 )
         else:
+            # Nothing is pending: the changes were activated by someone else
+            if not module.check_mode and marker is not None:
+                tracker.clear(marker)
+                tracker.mark_activated()
             message = f"Status remains '{original_activation_status}'."
             module.exit_json(
                 changed=False,
@@ -138,6 +207,9 @@ def main():
     argument_spec.update(
         status=dict(type="str", choices=["ACTIVE"], required=True),
         state=dict(type="str", choices=["present"], default="present"),
+        only_if_changed=dict(type="bool", default=False),
+        wait=dict(type="bool", default=True),
+        timeout=dict(type="int", default=300),
     )
     module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
 
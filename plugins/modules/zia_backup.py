@@ -0,0 +1,233 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                             MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: zia_backup
+short_description: "Backs up the policy of a ZIA tenant to a directory."
+description:
+  - Lists the URL Filtering, Cloud Firewall, DLP Web, Cloud App Control and Forwarding Control rules, the URL
+    categories, the firewall IP and service groups, the network services and the rule labels of the tenant,
+    several resource types at once.
+  - Every collection is streamed to a gzip compressed JSON lines file in C(path) as it is listed, and
+    C(manifest.json) records the number of objects and the SHA-256 hash of every file. The objects are not
+    returned by the module, so the size of the policy does not slow down Ansible.
+  - The backup is only rewritten when the content of a collection changed since the previous backup in C(path).
+  - Use M(zscaler.ziacloud.zia_restore) to restore a backup.
+author:
+  - William Guilherme (@willguibr)
+version_added: "1.4.0"
+requirements:
+    - Zscaler SDK Python can be obtained from PyPI U(https://pypi.org/project/zscaler-sdk-python/)
+notes:
+    - Check mode is supported.
+    - The backup holds the configuration as returned by the API and must be stored securely.
+extends_documentation_fragment:
+  - zscaler.ziacloud.fragments.provider
+  - zscaler.ziacloud.fragments.documentation
+
+options:
+  path:
+    description:
+      - Directory of the backup, on the host running the module. It is created if needed.
+    required: true
+    type: path
+  resources:
+    description:
+      - The resource types backed up. All of them by default.
+    required: false
+    type: list
+    elements: str
+  concurrency:
+    description:
+      - Maximum number of collections listed in parallel.
+      - Requests are delayed when the API reports that the rate limit is reached.
+    type: int
+    required: false
+    default: 4
+"""
+
+EXAMPLES = r"""
+- name: Back up the policy of the tenant
+  zscaler.ziacloud.zia_backup:
+    provider: '{{ provider }}'
+    path: "/var/backups/zia/{{ ansible_date_time.date }}"
+
+- name: Back up the URL Filtering policy only
+  zscaler.ziacloud.zia_backup:
+    provider: '{{ provider }}'
+    path: /var/backups/zia/url_filtering
+    resources:
+      - url_categories
+      - url_filtering_rules
+"""
+
+RETURN = r"""
+backup:
+  description: The manifest of the backup.
+  returned: always
+  type: dict
+  contains:
+    path:
+      description: Directory of the backup.
+      type: str
+      sample: /var/backups/zia/2024-01-31
+    created:
+      description: Time the backup was written, in seconds since the epoch.
+      type: float
+      sample: 1735725600.0
+    resources:
+      description: Number of objects backed up for each resource type.
+      type: dict
+      sample: {"rule_labels": 12, "url_filtering_rules": 85}
+    changed_resources:
+      description: Resource types whose content differs from the previous backup in C(path).
+      type: list
+      elements: str
+      sample: ["url_filtering_rules"]
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from traceback import format_exc
+
+from ansible.module_utils._text import to_native
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_backup import (
+    BACKUP_RESOURCES,
+    ZIABackup,
+    collection_of,
+    content_hash,
+    resource_scopes,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
+    ZIAClientHelper,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    RESOURCES,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_pagination import (
+    MAX_CONCURRENCY,
+)
+
+
+def list_collection(client, resource, scope):
+    # The list functions call the API, not a tenant snapshot
+    result = RESOURCES[resource][1](client, scope)
+    if not isinstance(result, list):
+        raise Exception(
+            "Failed to list %s: %s"
+            % (collection_of(resource, scope), getattr(result, "status_code", result))
+        )
+    return result.to_list() if hasattr(result, "to_list") else list(result)
+
+
+def backup_result(backup, manifest, changed_resources):
+    resources = {}
+    for entry in manifest["collections"]:
+        resources[entry["resource"]] = (
+            resources.get(entry["resource"], 0) + entry["count"]
+        )
+    return dict(
+        path=backup.path,
+        created=manifest["created"],
+        resources=resources,
+        changed_resources=sorted(changed_resources),
+    )
+
+
+def core(module):
+    resources = module.params.get("resources") or BACKUP_RESOURCES
+    concurrency = module.params.get("concurrency")
+    if not 1 <= concurrency <= MAX_CONCURRENCY:
+        module.fail_json(msg="concurrency must be between 1 and %d" % MAX_CONCURRENCY)
+    client = ZIAClientHelper(module)
+    backup = ZIABackup(module.params.get("path"))
+    previous = dict(
+        (entry["collection"], entry["sha256"])
+        for entry in (backup.manifest() or {}).get("collections", [])
+    )
+
+    def back_up(collection):
+        resource, scope = collection
+        items = list_collection(client, resource, scope)
+        if module.check_mode:
+            return dict(
+                resource=resource,
+                scope=scope,
+                collection=collection_of(resource, scope),
+                count=len(items),
+                sha256=content_hash(items),
+            )
+        return backup.write_collection(resource, scope, items)
+
+    collections = [
+        (resource, scope)
+        for resource in BACKUP_RESOURCES
+        if resource in resources
+        for scope in resource_scopes(resource)
+    ]
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        entries = list(pool.map(back_up, collections))
+
+    changed_resources = set(
+        entry["resource"]
+        for entry in entries
+        if previous.get(entry["collection"]) != entry["sha256"]
+    )
+    # Resource types left out of this backup are removed from it
+    changed = bool(changed_resources) or set(previous) != set(
+        entry["collection"] for entry in entries
+    )
+    if module.check_mode or not changed:
+        manifest = dict(created=(backup.manifest() or {}).get("created"))
+        manifest["collections"] = entries
+    else:
+        manifest = backup.write_manifest(entries)
+    module.exit_json(
+        changed=changed, backup=backup_result(backup, manifest, changed_resources)
+    )
+
+
+def main():
+    argument_spec = ZIAClientHelper.zia_argument_spec()
+    argument_spec.update(
+        path=dict(type="path", required=True),
+        resources=dict(
+            type="list", elements="str", required=False, choices=BACKUP_RESOURCES
+        ),
+        concurrency=dict(type="int", required=False, default=4),
+    )
+    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+
+    try:
+        core(module)
+    except Exception as e:
+        module.fail_json(msg=to_native(e), exception=format_exc())
+
+
+if __name__ == "__main__":
+    main()
@@ -317,34 +317,30 @@ import time
 from datetime import datetime
 from traceback import format_exc
 from ansible.module_utils._text import to_native
-from ansible.module_utils.basic import AnsibleModule, missing_required_lib
+from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.utils import (
     deleteNone,
+    localize,
     normalize_boolean_attributes,
+    validate_timezone,
 )
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
-
-try:
-    import pytz
-
-    HAS_PYTZ = True
-    PYTZ_IMPORT_ERROR = None  # Explicitly set to None when import is successful
-except ImportError:
-    pytz = None  # Set to None to indicate the module is unavailable
-    HAS_PYTZ = False
-    PYTZ_IMPORT_ERROR = missing_required_lib(
-        "pytz"
-    )  # Use missing_required_lib for better error messages
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_diff import (
+    clear_unset,
+    diff,
+    rule_schema,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_schemas import (
+    FIELD_SPECS,
+)
 
 
 def validate_and_convert_time_fields(rule):
-    if not HAS_PYTZ:
-        raise ImportError(
-            PYTZ_IMPORT_ERROR
-        )  # Properly handle the case where pytz is not available
-
     enforce_time_validity = rule.get("enforce_time_validity")
     if enforce_time_validity:
         for field in [
@@ -358,15 +354,14 @@ def validate_and_convert_time_fields(rule):
                 )
 
         timezone_id = rule["validity_time_zone_id"]
-        if timezone_id not in pytz.all_timezones:
+        if not validate_timezone(timezone_id):
             raise ValueError(f"Invalid timezone ID: {timezone_id}")
 
         for time_field in ["validity_start_time", "validity_end_time"]:
             time_str = rule.get(time_field)
             if time_str:
                 time_obj = datetime.strptime(time_str, "%m/%d/%Y %I:%M %p")
-                timezone = pytz.timezone(timezone_id)
-                time_with_tz = timezone.localize(time_obj)
+                time_with_tz = localize(time_obj, timezone_id)
                 rule[time_field] = int(time.mktime(time_with_tz.timetuple()))
 
 
@@ -391,28 +386,6 @@ def validate_additional_fields(rule):
         rule["size_quota"] = size_quota_mb * 1024
 
 
-def normalize_rule(rule):
-    """
-    Normalize rule data by setting computed values.
-    """
-    if not rule:
-        return {}
-
-    normalized = rule.copy()
-
-    # Add 'profile_seq' to the list of computed values to be removed
-    computed_values = ["profile_seq"]
-    for attr in computed_values:
-        if (
-            "cbi_profile" in normalized
-            and isinstance(normalized["cbi_profile"], dict)
-            and attr in normalized["cbi_profile"]
-        ):
-            normalized["cbi_profile"].pop(attr, None)
-
-    return normalized
-
-
 def core(module):
     state = module.params.get("state", None)
     client = ZIAClientHelper(module)
@@ -481,72 +454,19 @@ def core(module):
         if ruleBox is not None:
             existing_rule = ruleBox.to_dict()
     elif rule_name is not None:
-        rules = client.cloudappcontrol.list_rules(rule_type=rule_type).to_list()
-        for rule_ in rules:
-            if rule_.get("name") == rule_name:
-                existing_rule = rule_
-
-    # Normalize and compare existing and desired data
-    desired_rule = normalize_rule(rule)
-    current_rule = normalize_rule(existing_rule) if existing_rule else {}
-
-    def preprocess_rules(rule, params):
-        """
-        Preprocess specific attributes in the rule based on their type and structure.
-        :param rule: Dict containing the rule data.
-        :param params: List of attribute names to be processed.
-        :return: Preprocessed rule.
-        """
-        for attr in params:
-            if attr in rule and rule[attr] is not None:
-                # Process list attributes
-                if isinstance(rule[attr], list):
-                    # If list contains dictionaries with 'id', extract IDs
-                    if all(
-                        isinstance(item, dict) and "id" in item for item in rule[attr]
-                    ):
-                        rule[attr] = [item["id"] for item in rule[attr]]
-                    else:
-                        # Sort lists for consistent order
-                        rule[attr] = sorted(rule[attr])
-                # Add more conditions here if needed for other types
-        return rule
-
-    existing_rule_preprocessed = preprocess_rules(current_rule, params)
-    desired_rule_preprocessed = preprocess_rules(desired_rule, params)
-
-    # Then proceed with your comparison logic
-    differences_detected = False
-    for key in params:
-        desired_value = desired_rule_preprocessed.get(key)
-        current_value = existing_rule_preprocessed.get(key)
-
-        # Skip comparison for 'id' if it's not in the desired rule but present in the existing rule
-        if key == "id" and desired_value is None and current_value is not None:
-            continue
-
-        # Convert 'state' in current_rule to boolean 'enabled'
-        if key == "enabled" and "state" in current_rule:
-            current_value = current_rule["state"] == "ENABLED"
-
-        # Handling None values for all attributes
-        if desired_value is None and key != "enabled":
-            # Explicitly setting to empty list or empty value based on type
-            rule[key] = [] if isinstance(current_value, list) else None
-
-        # Special handling for lists of IDs like device_groups
-        if isinstance(desired_value, list) and isinstance(current_value, list):
-            if all(isinstance(x, int) for x in desired_value) and all(
-                isinstance(x, int) for x in current_value
-            ):
-                desired_value = sorted(desired_value)
-                current_value = sorted(current_value)
-
-        if current_value != desired_value:
-            differences_detected = True
-            module.warn(
-                f"Difference detected in {key}. Current: {current_value}, Desired: {desired_value}"
-            )
+        existing_rule = ZIAResourceIndex(
+            client, "cloud_app_control_rules", scope=rule_type
+        ).get_by_name(rule_name)
+
+    # Compare existing and desired data
+    schema = rule_schema(params, **FIELD_SPECS["cloud_app_control_rules"])
+    differences = diff(rule, existing_rule, schema)
+    for difference in differences:
+        module.warn(
+            f"Difference detected in {difference['field']}. Current: {difference['current']}, Desired: {difference['desired']}"
+        )
+    differences_detected = bool(differences)
+    clear_unset(rule, existing_rule, schema)
 
     if module.check_mode:
         # If in check mode, report changes and exit
@@ -789,11 +709,6 @@ def main():
         state=dict(type="str", choices=["present", "absent"], default="present"),
     )
     module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
-    if not HAS_PYTZ:
-        module.fail_json(
-            msg="The 'pytz' library is required by this module.",
-            exception=PYTZ_IMPORT_ERROR,
-        )
 
     try:
         core(module)
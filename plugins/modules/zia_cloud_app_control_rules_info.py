@@ -30,7 +30,9 @@ DOCUMENTATION = r"""
 ---
 module: zia_cloud_app_control_rules_info
 short_description: Gets the list of cloud application rules by the type of rule..
-description: Gets the list of cloud application rules by the type of rule..
+description:
+  - Gets the list of cloud application rules by the type of rule..
+  - Several rule types, or all of them, can be gathered at once. Their rules are listed in parallel.
 author:
   - William Guilherme (@willguibr)
 version_added: "1.3.0"
@@ -55,10 +57,14 @@ options:
     type: str
   rule_type:
     description:
-        - The rule type selected from the available options.
+        - The rule types selected from the available options.
+        - C(ALL) selects every rule type.
+        - A list of rule types is supported since version 1.4.0.
     required: true
-    type: str
+    type: list
+    elements: str
     choices:
+      - ALL
       - SOCIAL_NETWORKING
       - STREAMING_MEDIA
       - WEBMAIL
@@ -78,6 +84,14 @@ options:
       - FINANCE
       - CUSTOM_CAPP
       - AI_ML
+  concurrency:
+    description:
+        - Maximum number of rule types listed in parallel.
+        - Requests are delayed when the API reports that the rate limit is reached.
+    type: int
+    required: false
+    default: 4
+    version_added: "1.4.0"
 """
 
 EXAMPLES = r"""
@@ -86,6 +100,19 @@ EXAMPLES = r"""
     provider: '{{ provider }}'
     name: "Webmail Rule-1"
     rule_type: "WEBMAIL"
+
+- name: Gather the cloud application control rules of several rule types
+  zscaler.ziacloud.zia_cloud_app_control_rules_info:
+    provider: '{{ provider }}'
+    rule_type:
+      - WEBMAIL
+      - AI_ML
+
+- name: Gather every cloud application control rule
+  zscaler.ziacloud.zia_cloud_app_control_rules_info:
+    provider: '{{ provider }}'
+    rule_type: ALL
+  register: cloud_app_rules
 """
 
 RETURN = r"""
@@ -120,8 +147,26 @@ rules:
             "type": "WEBMAIL"
         }
     ]
+rules_by_type:
+    description: The rules that match the specified criteria, keyed by rule type.
+    returned: always
+    type: dict
+    version_added: "1.4.0"
+    sample: {
+        "AI_ML": [],
+        "WEBMAIL": [
+            {
+                "id": 552617,
+                "name": "Webmail Rule-1",
+                "order": 2,
+                "state": "DISABLED",
+                "type": "WEBMAIL"
+            }
+        ]
+    }
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from traceback import format_exc
 
 from ansible.module_utils._text import to_native
@@ -129,42 +174,74 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    CLOUD_APP_CONTROL_RULE_TYPES,
+    ZIAResourceIndex,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_pagination import (
+    MAX_CONCURRENCY,
+)
+
+
+def list_rules(client, rule_type):
+    rules = ZIAResourceIndex(client, "cloud_app_control_rules", scope=rule_type)
+    return rule_type, rules.values()
 
 
 def core(module):
     rule_id = module.params.get("id", None)
     rule_name = module.params.get("name", None)
-    rule_type = module.params.get("rule_type", None)
+    rule_types = module.params.get("rule_type")
+    if "ALL" in rule_types:
+        rule_types = CLOUD_APP_CONTROL_RULE_TYPES
+    else:
+        rule_types = [t for i, t in enumerate(rule_types) if t not in rule_types[:i]]
+    concurrency = module.params.get("concurrency")
+    if not 1 <= concurrency <= MAX_CONCURRENCY:
+        module.fail_json(msg="concurrency must be between 1 and %d" % MAX_CONCURRENCY)
     client = ZIAClientHelper(module)
-    rules = []
 
-    if rule_id is not None:
+    if rule_id is not None and len(rule_types) == 1:
         # Fetch rule by ID directly using rule_type
+        rule_type = rule_types[0]
         rule_box = client.cloudappcontrol.get_rule(rule_type=rule_type, rule_id=rule_id)
         if rule_box is None:
             module.fail_json(
                 msg=f"Failed to retrieve Cloud App Control Rule with ID: '{rule_id}' under rule type: '{rule_type}'"
             )
-        rules = [rule_box]
+        rules_by_type = {rule_type: [rule_box]}
     else:
-        # Fetch all rules for the specified rule_type
-        all_rules = client.cloudappcontrol.list_rules(rule_type=rule_type)
+        # Each rule type is a separate collection, list them in parallel
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(rule_types))) as pool:
+            rules_by_type = dict(
+                pool.map(lambda rule_type: list_rules(client, rule_type), rule_types)
+            )
 
-        if rule_name is not None:
-            # Search for the specific rule by name
-            rule_box = client.cloudappcontrol.get_rule_by_name(
-                rule_type=rule_type, rule_name=rule_name
+        if rule_id is not None or rule_name is not None:
+            rules_by_type = dict(
+                (
+                    rule_type,
+                    [
+                        rule
+                        for rule in rules
+                        if (rule_id is None or str(rule.get("id")) == rule_id)
+                        and (rule_name is None or rule.get("name") == rule_name)
+                    ],
+                )
+                for rule_type, rules in rules_by_type.items()
             )
-            if rule_box is None:
+            if not any(rules_by_type.values()):
+                if rule_id is not None:
+                    criteria = f"ID: '{rule_id}'"
+                else:
+                    criteria = f"Name: '{rule_name}'"
+                searched = ", ".join(rule_types)
                 module.fail_json(
-                    msg=f"Failed to retrieve Cloud App Control Rule with Name: '{rule_name}' under rule type: '{rule_type}'"
+                    msg=f"Failed to retrieve Cloud App Control Rule with {criteria} under rule types: '{searched}'"
                 )
-            rules = [rule_box]
-        else:
-            # Return all rules for the specified rule_type
-            rules = list(all_rules)
 
-    module.exit_json(changed=False, rules=rules)
+    rules = [rule for rule_type in rule_types for rule in rules_by_type[rule_type]]
+    module.exit_json(changed=False, rules=rules, rules_by_type=rules_by_type)
 
 
 def main():
@@ -172,31 +249,13 @@ def main():
     argument_spec.update(
         name=dict(type="str", required=False),
         rule_type=dict(  # This is mapped to `type` in the payload
-            type="str",
+            type="list",
+            elements="str",
             required=True,
-            choices=[
-                "SOCIAL_NETWORKING",
-                "STREAMING_MEDIA",
-                "WEBMAIL",
-                "INSTANT_MESSAGING",
-                "BUSINESS_PRODUCTIVITY",
-                "ENTERPRISE_COLLABORATION",
-                "SALES_AND_MARKETING",
-                "SYSTEM_AND_DEVELOPMENT",
-                "CONSUMER",
-                "HOSTING_PROVIDER",
-                "IT_SERVICES",
-                "FILE_SHARE",
-                "DNS_OVER_HTTPS",
-                "HUMAN_RESOURCES",
-                "LEGAL",
-                "HEALTH_CARE",
-                "FINANCE",
-                "CUSTOM_CAPP",
-                "AI_ML",
-            ],
+            choices=["ALL"] + CLOUD_APP_CONTROL_RULE_TYPES,
         ),
         id=dict(type="str", required=False),
+        concurrency=dict(type="int", required=False, default=4),
     )
     module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
     try:
@@ -0,0 +1,462 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                             MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: zia_cloud_firewall_filtering_rule_bulk
+short_description: "Reconciles a list of Firewall Filtering policy rules."
+description:
+  - Reconciles a whole list of Firewall Filtering policy rules in one task.
+  - The current policy is fetched once, the differences of every rule are computed in memory,
+    and only the create, update and delete calls that are needed are sent.
+  - Rule positions are reconciled with as few moves as possible, so inserting a rule near the top
+    of the policy does not update every rule below it.
+author:
+  - William Guilherme (@willguibr)
+version_added: "1.4.0"
+requirements:
+    - Zscaler SDK Python can be obtained from PyPI U(https://pypi.org/project/zscaler-sdk-python/)
+notes:
+    - Check mode is supported.
+extends_documentation_fragment:
+  - zscaler.ziacloud.fragments.provider
+  - zscaler.ziacloud.fragments.documentation
+
+options:
+  purge:
+    description:
+      - When set to true, Firewall Filtering rules that are not listed in C(rules) are deleted.
+      - Predefined and default rules are never deleted.
+    required: false
+    type: bool
+    default: false
+  rules:
+    description:
+      - List of the desired Firewall Filtering policy rules.
+      - Rules are matched with the existing rules by C(id) if set, otherwise by C(name).
+      - Rules with an C(order) are placed at that position; rules without an C(order) keep their current position.
+    required: true
+    type: list
+    elements: dict
+    suboptions:
+      state:
+        description:
+          - Whether the rule should exist or not.
+        type: str
+        choices:
+          - present
+          - absent
+        default: present
+      id:
+        description: "Unique identifier for the Firewall Filtering policy rule"
+        required: false
+        type: int
+      name:
+        description: "Name of the Firewall Filtering policy rule"
+        required: true
+        type: str
+      order:
+        description: "Rule order number of the Firewall Filtering policy rule"
+        required: false
+        type: int
+      rank:
+        description: "Admin rank of the Firewall Filtering policy rule"
+        required: false
+        default: 7
+        type: int
+      enable_full_logging:
+        description:
+          - Aggregate The service groups together individual sessions based on  user, rule, network service, network application and records them periodically.
+          - Full The service logs all sessions of the rule individually, except HTTPS or HTTPS.
+          - Full logging on all other rules requires the Full Logging license. Only Block rules support full logging.
+        required: false
+        default: false
+        type: bool
+      locations:
+        description: "The locations to which the Firewall Filtering policy rule applies"
+        type: list
+        elements: int
+        required: false
+      location_groups:
+        description: "The location groups to which the Firewall Filtering policy rule applies"
+        type: list
+        elements: int
+        required: false
+      departments:
+        description: "The departments to which the Firewall Filtering policy rule applies"
+        type: list
+        elements: int
+        required: false
+      groups:
+        description: "The groups to which the Firewall Filtering policy rule applies"
+        type: list
+        elements: int
+        required: false
+      users:
+        description: "The users to which the Firewall Filtering policy rule applies"
+        type: list
+        elements: int
+        required: false
+      time_windows:
+        description: "The time interval in which the Firewall Filtering policy rule applies"
+        type: list
+        elements: int
+        required: false
+      workload_groups:
+        description: "The list of preconfigured workload groups to which the policy must be applied."
+        type: list
+        elements: int
+        required: false
+      action:
+        description: "The action the Firewall Filtering policy rule takes when packets match the rule"
+        required: false
+        type: str
+        choices:
+            - ALLOW
+            - BLOCK_DROP
+            - BLOCK_RESET
+            - BLOCK_ICMP
+            - EVAL_NWAPP
+      enabled:
+        description:
+            - Determines whether the Firewall Filtering policy rule is enabled or disabled
+        required: false
+        type: bool
+      description:
+        description: "Additional information about the rule"
+        required: false
+        type: str
+      src_ips:
+        description:
+          - User-defined source IP addresses for which the rule is applicable.
+          - If not set, the rule is not restricted to a specific source IP address.
+        type: list
+        elements: str
+        required: false
+      src_ip_groups:
+        description:
+            - User-defined source IP address groups for which the rule is applicable.
+            - If not set, the rule is not restricted to a specific source IP address group.
+        type: list
+        elements: int
+        required: false
+      dest_addresses:
+        description:
+          - List of destination IP addresses to which this rule will be applied.
+          - CIDR notation can be used for destination IP addresses.
+        type: list
+        elements: str
+        required: false
+      dest_ip_categories:
+        description:
+          - IP address categories of destination for which the DNAT rule is applicable.
+          - If not set, the rule is not restricted to specific destination IP categories.
+        type: list
+        elements: str
+        required: false
+      dest_countries:
+        description:
+          - Destination countries for which the rule is applicable.
+          - If not set, the rule is not restricted to specific destination countries.
+          - Provide a ISO3166 Alpha2 code.  visit the following site for reference U(https://en.wikipedia.org/wiki/List_of_ISO_3166_country_codes)
+        type: list
+        elements: str
+        required: false
+      dest_ip_groups:
+        description:
+            - User-defined destination IP address groups on which the rule is applied.
+            - If not set, the rule is not restricted to a specific destination IP address group.
+        type: list
+        elements: int
+        required: false
+      source_countries:
+        description:
+          - The list of source countries that must be included or excluded from the rule based on the excludeSrcCountries field value.
+          - If no value is set, this field is ignored during policy evaluation and the rule is applied to all source countries.
+          - Provide a ISO3166 Alpha2 code.  visit the following site for reference U(https://en.wikipedia.org/wiki/List_of_ISO_3166_country_codes)
+        type: list
+        elements: str
+        required: false
+      exclude_src_countries:
+        description:
+          - Indicates whether the countries specified in the sourceCountries field are included or excluded from the rule.
+          - A true value denotes that the specified source countries are excluded from the rule.
+          - A false value denotes that the rule is applied to the source countries if there is a match.
+          - Provide a ISO3166 Alpha2 code.  visit the following site for reference U(https://en.wikipedia.org/wiki/List_of_ISO_3166_country_codes)
+        type: bool
+        required: false
+      nw_services:
+        description:
+            - User-defined network services on which the rule is applied.
+            - If not set, the rule is not restricted to a specific network service.
+        type: list
+        elements: int
+        required: false
+      nw_service_groups:
+        description:
+            - User-defined network service group on which the rule is applied.
+            - If not set, the rule is not restricted to a specific network service group.
+        type: list
+        elements: int
+        required: false
+      nw_applications:
+        description:
+          - User-defined network service applications on which the rule is applied.
+          - If not set, the rule is not restricted to a specific network service application.
+        type: list
+        elements: int
+        required: false
+      nw_application_groups:
+        description:
+            - User-defined network service application group on which the rule is applied.
+            - If not set, the rule is not restricted to a specific network service application group.
+        type: list
+        elements: int
+        required: false
+      app_services:
+        description: "Application services on which this rule is applied"
+        type: list
+        elements: int
+        required: false
+      app_service_groups:
+        description: "Application service groups on which this rule is applied"
+        type: list
+        elements: int
+        required: false
+      labels:
+        description: "Labels that are applicable to the rule."
+        type: list
+        elements: int
+        required: false
+      dest_ipv6_groups:
+        description:
+          - Destination IPv6 address groups for which the rule is applicable.
+          - If not set, the rule is not restricted to a specific source IPv6 address group.
+        type: list
+        elements: int
+        required: false
+      src_ipv6_groups:
+        description:
+          - Source IPv6 address groups for which the rule is applicable.
+          - If not set, the rule is not restricted to a specific source IPv6 address group.
+        type: list
+        elements: int
+        required: false
+      device_groups:
+        description:
+          - Name-ID pairs of device groups for which the rule must be applied.
+          - This field is applicable for devices that are managed using Zscaler Client Connector.
+          - If no value is set, this field is ignored during the policy evaluation.
+        type: list
+        elements: int
+        required: false
+      devices:
+        description:
+          - Name-ID pairs of devices for which rule must be applied.
+          - Specifies devices that are managed using Zscaler Client Connector.
+          - If no value is set, this field is ignored during the policy evaluation.
+        type: list
+        elements: int
+        required: false
+      device_trust_levels:
+        description:
+            - List of device trust levels for which the rule must be applied.
+            - This field is applicable for devices that are managed using Zscaler Client Connector.
+            - The trust levels are assigned to the devices based on your posture configurations.
+            - If no value is set, this field is ignored during the policy evaluation.
+        type: list
+        elements: str
+        required: false
+        choices:
+            - ANY
+            - UNKNOWN_DEVICETRUSTLEVEL
+            - LOW_TRUST
+            - MEDIUM_TRUST
+            - HIGH_TRUST
+"""
+
+EXAMPLES = r"""
+- name: Reconcile Firewall Filtering Rules
+  zscaler.ziacloud.zia_cloud_firewall_filtering_rule_bulk:
+    provider: '{{ provider }}'
+    rules:
+      - name: "Block_Risky_Countries"
+        description: "Block traffic to risky countries"
+        action: "BLOCK_DROP"
+        enabled: true
+        order: 1
+        dest_countries:
+          - KP
+          - IR
+      - name: "Allow_DNS"
+        action: "ALLOW"
+        enabled: true
+        order: 2
+        nw_services:
+          - 774003
+      - name: "Legacy_Rule"
+        state: absent
+
+- name: Reconcile Firewall Filtering Rules and delete any other rule
+  zscaler.ziacloud.zia_cloud_firewall_filtering_rule_bulk:
+    provider: '{{ provider }}'
+    purge: true
+    rules: "{{ firewall_rules }}"
+"""
+
+RETURN = r"""
+results:
+  description: One entry per rule that was compared, created, updated or deleted.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    name:
+      description: Name of the rule.
+      type: str
+      sample: Block_Gambling
+    id:
+      description: ID of the rule, null for a rule created in check mode.
+      type: int
+      sample: 1203256
+    action:
+      description: Change applied to the rule.
+      type: str
+      sample: update
+      choices: [create, update, delete, unchanged]
+    changed_fields:
+      description: Attributes that differ from the existing rule.
+      type: list
+      elements: str
+      sample: ["description", "url_categories"]
+    failed:
+      description: Set when the API call of this rule failed.
+      type: bool
+      returned: on failure
+    msg:
+      description: Error returned by the API call of this rule.
+      type: str
+      returned: on failure
+"""
+
+
+from traceback import format_exc
+from ansible.module_utils._text import to_native
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_bulk import (
+    apply_changes,
+    plan_changes,
+    plan_order,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
+    ZIAClientHelper,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_firewall import (
+    FIREWALL_RULE_PARAMS,
+    firewall_rule_spec,
+    is_protected_rule,
+    rule_differences,
+    rule_payload,
+    validate_countries,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
+
+
+def core(module):
+    client = ZIAClientHelper(module)
+    purge = module.params.get("purge")
+
+    desired_rules = []
+    for item in module.params.get("rules"):
+        rule = dict()
+        for param_name in FIREWALL_RULE_PARAMS:
+            rule[param_name] = item.get(param_name, None)
+        if item.get("state") == "present":
+            validate_countries(rule)
+        rule["state"] = item.get("state")
+        desired_rules.append(rule)
+
+    rules_index = ZIAResourceIndex(client, "firewall_rules")
+    changes = plan_changes(
+        desired_rules,
+        rules_index,
+        rule_differences,
+        purge=purge,
+        protected=is_protected_rule,
+    )
+    changes = plan_order(changes, rules_index.values())
+
+    def create(rule):
+        return client.firewall.add_rule(**rule_payload(rule)).to_dict()
+
+    def update(rule, existing_rule):
+        rule_id = existing_rule.get("id")
+        existing_rule.update(rule)
+        update_rule = rule_payload(existing_rule)
+        update_rule["rule_id"] = rule_id
+        return client.firewall.update_rule(**update_rule).to_dict()
+
+    def delete(existing_rule):
+        code = client.firewall.delete_rule(rule_id=existing_rule.get("id"))
+        if code > 299:
+            raise Exception(
+                "Failed to delete rule %s, status code %s"
+                % (existing_rule.get("name"), code)
+            )
+
+    changed, report, failed = apply_changes(module, changes, create, update, delete)
+    if failed:
+        module.fail_json(
+            msg="%d of the Firewall Filtering rule changes failed" % failed,
+            changed=changed,
+            results=report,
+        )
+    module.exit_json(changed=changed, results=report)
+
+
+def main():
+    argument_spec = ZIAClientHelper.zia_argument_spec()
+    rule_spec = firewall_rule_spec()
+    rule_spec.update(
+        state=dict(type="str", choices=["present", "absent"], default="present"),
+    )
+    argument_spec.update(
+        purge=dict(type="bool", required=False, default=False),
+        rules=dict(type="list", elements="dict", required=True, options=rule_spec),
+    )
+    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+    try:
+        core(module)
+    except Exception as e:
+        module.fail_json(msg=to_native(e), exception=format_exc())
+
+
+if __name__ == "__main__":
+    main()
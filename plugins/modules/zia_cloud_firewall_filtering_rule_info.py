@@ -169,6 +169,9 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
 
 
 def core(module):
@@ -185,7 +188,7 @@ def core(module):
         rules = [rule_box]
     else:
         # Fetch all rules from the SDK directly
-        all_rules = client.firewall.list_rules()
+        all_rules = ZIAResourceIndex(client, "firewall_rules").values()
 
         if rule_name is not None:
             # Search for the specific rule by name directly
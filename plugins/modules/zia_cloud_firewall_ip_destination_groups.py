@@ -146,6 +146,9 @@ from ansible_collections.zscaler.ziacloud.plugins.module_utils.utils import (
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
 
 
 def normalize_ip_group(group):
@@ -225,13 +228,10 @@ def core(module):
         existing_dest_ip_group = client.firewall.get_ip_destination_group(
             group_id
         ).to_dict()
-    else:
-        dest_groups = client.firewall.list_ip_destination_groups().to_list()
-        if group_name is not None:
-            for ip in dest_groups:
-                if ip.get("name", None) == group_name:
-                    existing_dest_ip_group = ip
-                    break
+    elif group_name is not None:
+        existing_dest_ip_group = ZIAResourceIndex(
+            client, "ip_destination_groups"
+        ).get_by_name(group_name)
 
     # Normalize and compare existing and desired data
     normalized_group = normalize_ip_group(destination_group)
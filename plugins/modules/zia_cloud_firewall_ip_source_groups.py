@@ -87,6 +87,9 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
 
 
 def normalize_ip_group(group):
@@ -124,13 +127,10 @@ def core(module):
     existing_src_ip_group = None
     if group_id is not None:
         existing_src_ip_group = client.firewall.get_ip_source_group(group_id).to_dict()
-    else:
-        source_groups = client.firewall.list_ip_source_groups().to_list()
-        if group_name is not None:
-            for ip in source_groups:
-                if ip.get("name", None) == group_name:
-                    existing_src_ip_group = ip
-                    break
+    elif group_name is not None:
+        existing_src_ip_group = ZIAResourceIndex(
+            client, "ip_source_groups"
+        ).get_by_name(group_name)
 
     # Normalize and compare existing and desired data
     normalized_group = normalize_ip_group(source_group)
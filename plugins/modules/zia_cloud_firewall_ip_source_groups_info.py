@@ -111,6 +111,9 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
 
 
 def core(module):
@@ -122,7 +125,7 @@ def core(module):
         group = client.firewall.get_ip_source_group(group_id).to_dict()
         groups = [group]
     else:
-        groups = client.firewall.list_ip_source_groups().to_list()
+        groups = ZIAResourceIndex(client, "ip_source_groups").values()
         if group_name is not None:
             group = None
             for dest in groups:
@@ -94,6 +94,9 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
 
 
 def normalize_app_group(group):
@@ -131,13 +134,10 @@ def core(module):
     existing_app_group = None
     if group_id is not None:
         existing_app_group = client.firewall.get_network_app_group(group_id).to_dict()
-    else:
-        app_groups = client.firewall.list_network_app_groups().to_list()
-        if group_name is not None:
-            for app in app_groups:
-                if app.get("name", None) == group_name:
-                    existing_app_group = app
-                    break
+    elif group_name is not None:
+        existing_app_group = ZIAResourceIndex(client, "network_app_groups").get_by_name(
+            group_name
+        )
 
     # Normalize and compare existing and desired data
     normalized_group = normalize_app_group(app_group)
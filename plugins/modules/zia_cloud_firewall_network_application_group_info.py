@@ -112,6 +112,9 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
 
 
 def core(module):
@@ -123,7 +126,7 @@ def core(module):
         app_group = client.firewall.get_network_app_group(app_group_id).to_dict()
         app_groups = [app_group]
     else:
-        app_groups = client.firewall.list_network_app_groups().to_list()
+        app_groups = ZIAResourceIndex(client, "network_app_groups").values()
         if app_group_name is not None:
             app_group = None
             for app in app_groups:
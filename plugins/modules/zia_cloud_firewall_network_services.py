@@ -236,6 +236,9 @@ from ansible_collections.zscaler.ziacloud.plugins.module_utils.utils import (
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
 
 
 def normalize_service(service):
@@ -278,13 +281,10 @@ def core(module):
         existing_network_service = client.firewall.get_network_service(
             service_id
         ).to_dict()
-    else:
-        network_services = client.firewall.list_network_services().to_list()
-        if service_name is not None:
-            for svc in network_services:
-                if svc.get("name", None) == service_name:
-                    existing_network_service = svc
-                    break
+    elif service_name is not None:
+        existing_network_service = ZIAResourceIndex(
+            client, "network_services"
+        ).get_by_name(service_name)
 
     # Normalize and compare existing and desired data
     normalized_service = normalize_service(network_service)
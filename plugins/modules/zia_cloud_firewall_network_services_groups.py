@@ -88,6 +88,9 @@ from ansible_collections.zscaler.ziacloud.plugins.module_utils.utils import (
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
 
 
 def normalize_svc_group(group):
@@ -129,10 +132,9 @@ def core(module):
         if group_box is not None:
             existing_service_group = group_box.to_dict()
     elif group_name is not None:
-        groups = client.firewall.list_network_svc_groups().to_list()
-        for group_ in groups:
-            if group_.get("name") == group_name:
-                existing_service_group = group_
+        existing_service_group = ZIAResourceIndex(
+            client, "network_service_groups"
+        ).get_by_name(group_name)
 
     # Normalize and compare existing and desired data
     desired_group = normalize_svc_group(service_group)
@@ -116,6 +116,9 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
 
 
 def core(module):
@@ -127,7 +130,7 @@ def core(module):
         service = client.firewall.get_network_service(service_id).to_dict()
         services = [service]
     else:
-        services = client.firewall.list_network_services().to_list()
+        services = ZIAResourceIndex(client, "network_services").values()
         if service_name is not None:
             service = None
             for svc in services:
@@ -105,6 +105,9 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
 
 
 def core(module):
@@ -112,7 +115,7 @@ def core(module):
     time_window_name = module.params.get("name")
     client = ZIAClientHelper(module)
 
-    time_windows = client.firewall.list_time_windows()
+    time_windows = ZIAResourceIndex(client, "time_windows").values()
     if time_windows is None:
         module.fail_json(msg="Failed to retrieve time windows list")
 
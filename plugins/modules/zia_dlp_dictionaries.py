@@ -277,6 +277,9 @@ from ansible_collections.zscaler.ziacloud.plugins.module_utils.utils import (
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
 
 
 def normalize_dlp_dictionary(dictionary):
@@ -331,10 +334,9 @@ def core(module):
         if dictBox is not None:
             existing_dictionary = dictBox.to_dict()
     elif dictionary.get("name"):
-        dictionaries = client.dlp.list_dicts().to_list()
-        for dictionary_ in dictionaries:
-            if dictionary_.get("name") == dictionary.get("name"):
-                existing_dictionary = dictionary_
+        existing_dictionary = ZIAResourceIndex(client, "dlp_dictionaries").get_by_name(
+            dictionary.get("name")
+        )
 
     # Normalize and compare existing and desired data
     desired_dictionary = normalize_dlp_dictionary(dictionary)
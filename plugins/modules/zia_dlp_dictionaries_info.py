@@ -152,6 +152,9 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
 
 
 def core(module):
@@ -164,7 +167,7 @@ def core(module):
         dictionary = client.dlp.get_dict(dict_id).to_dict()
         dictionaries = [dictionary]
     else:
-        dictionaries = client.dlp.list_dicts().to_list()
+        dictionaries = ZIAResourceIndex(client, "dlp_dictionaries").values()
         if dict_name is not None:
             dictionary = None
             for dict in dictionaries:
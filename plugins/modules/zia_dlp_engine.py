@@ -100,6 +100,9 @@ from ansible_collections.zscaler.ziacloud.plugins.module_utils.utils import (
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
 
 
 def normalize_dlp_engine(engine):
@@ -136,13 +139,10 @@ def core(module):
     existing_engine = None
     if engine_id is not None:
         existing_engine = client.dlp.get_dlp_engines(engine_id).to_dict()
-    else:
-        dlp_engines = client.dlp.list_dlp_engines().to_list()
-        if engine_name is not None:
-            for dlp in dlp_engines:
-                if dlp.get("name", None) == engine_name:
-                    existing_engine = dlp
-                    break
+    elif engine_name is not None:
+        existing_engine = ZIAResourceIndex(client, "dlp_engines").get_by_name(
+            engine_name
+        )
 
     # Normalize and compare existing and desired data
     desired_engine = normalize_dlp_engine(dlp_engine)
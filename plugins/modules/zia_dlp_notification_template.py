@@ -122,6 +122,9 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
 
 
 def normalize_dlp_template(template):
@@ -156,10 +159,9 @@ def core(module):
         client.dlp.get_dlp_templates(template_id).to_dict() if template_id else None
     )
     if not existing_template and template.get("name"):
-        templates = client.dlp.list_dlp_templates().to_list()
-        existing_template = next(
-            (t for t in templates if t.get("name") == template.get("name")), None
-        )
+        existing_template = ZIAResourceIndex(
+            client, "dlp_notification_templates"
+        ).get_by_name(template.get("name"))
 
     differences_detected = False
     if existing_template:
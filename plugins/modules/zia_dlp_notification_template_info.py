@@ -117,6 +117,9 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
 
 
 def core(module):
@@ -128,7 +131,7 @@ def core(module):
         template = client.dlp.get_dlp_templates(template_id).to_dict()
         templates = [template]
     else:
-        templates = client.dlp.list_dlp_templates().to_list()
+        templates = ZIAResourceIndex(client, "dlp_notification_templates").values()
         if template_name is not None:
             template = None
             for dlp in templates:
@@ -323,19 +323,17 @@ from ansible_collections.zscaler.ziacloud.plugins.module_utils.utils import (
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
-
-
-def normalize_dlp_rule(rule):
-    """
-    Normalize rule data by setting computed values.
-    """
-    normalized = rule.copy()
-
-    computed_values = []
-    for attr in computed_values:
-        normalized.pop(attr, None)
-
-    return normalized
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_diff import (
+    clear_unset,
+    diff,
+    rule_schema,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_schemas import (
+    FIELD_SPECS,
+)
 
 
 def core(module):
@@ -426,101 +424,17 @@ def core(module):
         if ruleBox is not None:
             existing_rule = ruleBox.to_dict()
     elif rule_name is not None:
-        rules = client.web_dlp.list_rules().to_list()
-        for rule_ in rules:
-            if rule_.get("name") == rule_name:
-                existing_rule = rule_
-
-    # Normalize and compare existing and desired data
-    desired_rule = normalize_dlp_rule(rule)
-    current_rule = normalize_dlp_rule(existing_rule) if existing_rule else {}
-
-    def preprocess_rules(rule, params):
-        """
-        Preprocess specific attributes in the rule based on their type and structure.
-        :param rule: Dict containing the rule data.
-        :param params: List of attribute names to be processed.
-        :return: Preprocessed rule.
-        """
-        for attr in params:
-            if attr in rule:
-                value = rule[attr]
-
-                # Handle list attributes
-                if isinstance(value, list):
-                    # Extract IDs if list contains dictionaries with 'id'
-                    if all(isinstance(item, dict) and "id" in item for item in value):
-                        rule[attr] = [item["id"] for item in value]
-                    else:
-                        # Sort lists for consistent order
-                        rule[attr] = sorted(value)
-
-                # Handle dictionary attributes, specifically icap_server
-                elif isinstance(value, dict) and attr == "icap_server":
-                    # Extract ID if present, else set to empty dictionary
-                    rule[attr] = value.get("id", {})
-
-                # Handle attributes that should default to a certain value if not provided
-                elif attr in [
-                    "min_size",
-                    "match_only",
-                    "dlp_download_scan_enabled",
-                    "zcc_notifications_enabled",
-                    "zscaler_incident_receiver",
-                ]:
-                    if value is None:
-                        # Set to default value if not provided
-                        if attr == "min_size":
-                            rule[attr] = 0
-                        elif attr in [
-                            "match_only",
-                            "dlp_download_scan_enabled",
-                            "zcc_notifications_enabled",
-                            "zscaler_incident_receiver",
-                        ]:
-                            rule[attr] = False
-
-        return rule
-
-    existing_rule_preprocessed = preprocess_rules(current_rule, params)
-    desired_rule_preprocessed = preprocess_rules(desired_rule, params)
-
-    # Then proceed with your comparison logic
-    differences_detected = False
-    for key in params:
-        desired_value = desired_rule_preprocessed.get(key)
-        current_value = existing_rule_preprocessed.get(key)
-
-        # Handling for list attributes where None should be treated as an empty list
-        if isinstance(current_value, list) and desired_value is None:
-            desired_value = []
-
-        # Skip comparison for 'id' if it's not in the desired rule but present in the existing rule
-        if key == "id" and desired_value is None and current_value is not None:
-            continue
-
-        # Convert 'state' in current_rule to boolean 'enabled'
-        if key == "enabled" and "state" in current_rule:
-            current_value = current_rule["state"] == "ENABLED"
-
-        # Handling None values for all attributes
-        if desired_value is None and key != "enabled":
-            # Explicitly setting to empty list or empty value based on type
-            rule[key] = [] if isinstance(current_value, list) else None
-
-        # Special handling for lists of IDs like locations and others
-        if isinstance(desired_value, list) and isinstance(current_value, list):
-            if all(isinstance(x, int) for x in desired_value) and all(
-                isinstance(x, int) for x in current_value
-            ):
-                desired_value = sorted(desired_value)
-                current_value = sorted(current_value)
-
-        if current_value != desired_value:
-            differences_detected = True
-            # module.warn(
-            #     f"Difference detected in {key}. Current: {current_value}, Desired: {desired_value}"
-            # )
+        existing_rule = ZIAResourceIndex(client, "dlp_web_rules").get_by_name(rule_name)
+
+    # Compare existing and desired data
+    schema = rule_schema(params, **FIELD_SPECS["dlp_web_rules"])
+    differences = diff(rule, existing_rule, schema)
+    # for difference in differences:
+    #     module.warn(
+    #         f"Difference detected in {difference['field']}. Current: {difference['current']}, Desired: {difference['desired']}"
+    #     )
+    differences_detected = bool(differences)
+    clear_unset(rule, existing_rule, schema)
 
     if module.check_mode:
         # If in check mode, report changes and exit
@@ -166,6 +166,9 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
 
 
 def core(module):
@@ -179,7 +182,7 @@ def core(module):
             module.fail_json(msg="Failed to retrieve DLP Web Rule ID: '%s'" % (rule_id))
         rules = [ruleBox.to_dict()]
     else:
-        rules = client.web_dlp.list_rules().to_list()
+        rules = ZIAResourceIndex(client, "dlp_web_rules").values()
         if rule_name is not None:
             ruleFound = False
             for rule in rules:
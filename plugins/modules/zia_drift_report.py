@@ -0,0 +1,298 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                             MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: zia_drift_report
+short_description: "Reports the drift of a ZIA tenant from desired-state files."
+description:
+  - Compares the objects of desired-state files with the live objects of the tenant and reports the objects that
+    are missing or whose attributes differ, without changing anything.
+  - Each desired-state file maps resource types to lists of objects, written with the options of the matching
+    resource module. Objects with C(state=absent) are reported when they exist.
+  - Every resource type is listed once, in parallel, and the objects are looked up by name in memory, where running
+    each resource module in check mode lists the whole collection once per object.
+  - The attributes are compared like the resource modules do. Only the attributes set in the desired-state files
+    are compared.
+author:
+  - William Guilherme (@willguibr)
+version_added: "1.4.0"
+requirements:
+    - Zscaler SDK Python can be obtained from PyPI U(https://pypi.org/project/zscaler-sdk-python/)
+    - PyYAML
+notes:
+    - Check mode is supported.
+extends_documentation_fragment:
+  - zscaler.ziacloud.fragments.provider
+  - zscaler.ziacloud.fragments.documentation
+options:
+  path:
+    description:
+      - Desired-state file, or directory whose C(.yml), C(.yaml) and C(.json) files are read, recursively.
+      - Each file is a mapping of resource types, such as C(url_filtering_rules), C(firewall_rules),
+        C(url_categories), C(rule_labels) or C(locations), to lists of objects.
+      - The objects are looked up by C(name), URL categories by C(configured_name), GRE tunnels by C(source_ip),
+        static IPs by C(ip_address) and VPN credentials by C(fqdn) or C(ip_address).
+      - Cloud App Control rules also need their C(rule_type).
+    required: true
+    type: path
+  resources:
+    description:
+      - The resource types compared. All the resource types of the files by default.
+    required: false
+    type: list
+    elements: str
+  details:
+    description:
+      - When set to true, the current and desired values of every differing attribute are returned.
+    required: false
+    type: bool
+    default: false
+  concurrency:
+    description:
+      - Maximum number of collections listed in parallel.
+    type: int
+    required: false
+    default: 4
+"""
+
+EXAMPLES = r"""
+- name: Report the drift of the tenant
+  zscaler.ziacloud.zia_drift_report:
+    provider: '{{ provider }}'
+    path: "{{ playbook_dir }}/desired_state"
+  register: drift
+
+- name: Fail when the tenant drifted
+  ansible.builtin.assert:
+    that:
+      - not drift.drifted
+    fail_msg: "{{ drift.drift }}"
+
+- name: Show the values of the URL Filtering rules that drifted
+  zscaler.ziacloud.zia_drift_report:
+    provider: '{{ provider }}'
+    path: "{{ playbook_dir }}/desired_state/url_filtering.yml"
+    resources:
+      - url_filtering_rules
+    details: true
+"""
+
+RETURN = r"""
+drifted:
+  description: Whether any object drifted from the desired state.
+  returned: always
+  type: bool
+  sample: true
+summary:
+  description: Number of objects of each resource type per status.
+  returned: always
+  type: dict
+  sample: {"url_filtering_rules": {"in_sync": 84, "drifted": 1, "missing": 0, "unexpected": 0, "invalid": 0}}
+drift:
+  description: One entry per object that is not in sync with the desired state.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    resource:
+      description: Resource type of the object.
+      type: str
+      sample: url_filtering_rules
+    name:
+      description: Name of the object.
+      type: str
+      sample: Block Gambling
+    id:
+      description: ID of the live object, null when it is missing.
+      type: raw
+      sample: 1203256
+    status:
+      description:
+        - C(drifted) when attributes differ, C(missing) when the object does not exist, C(unexpected) when an
+          object with C(state=absent) exists and C(invalid) when the desired object cannot be compared.
+      type: str
+      sample: drifted
+      choices: [drifted, missing, unexpected, invalid]
+    fields:
+      description: Attributes that differ from the desired state.
+      type: list
+      elements: str
+      sample: ["action", "url_categories"]
+    differences:
+      description: Current and desired values of the attributes that differ.
+      type: list
+      elements: dict
+      returned: when I(details=true)
+      sample: [{"field": "action", "current": "ALLOW", "desired": "BLOCK"}]
+    file:
+      description: Desired-state file of the object.
+      type: str
+      sample: desired_state/url_filtering.yml
+    msg:
+      description: Why the desired object cannot be compared.
+      type: str
+      returned: when I(status=invalid)
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from traceback import format_exc
+
+from ansible.module_utils._text import to_native
+from ansible.module_utils.basic import AnsibleModule, missing_required_lib
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
+    ZIAClientHelper,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_drift import (
+    HAS_YAML,
+    IN_SYNC,
+    INVALID,
+    STATUSES,
+    load_desired_state,
+    name_key,
+    object_drift,
+    object_scope,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    RESOURCES,
+    ZIAResourceIndex,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_pagination import (
+    MAX_CONCURRENCY,
+)
+
+
+def load_index(client, resource, scope):
+    # The tenant is compared with the API, not with a tenant snapshot
+    index = ZIAResourceIndex(
+        client, resource, scope=scope, persistent=False, snapshot=False
+    )
+    index.values()
+    return index
+
+
+def core(module):
+    concurrency = module.params.get("concurrency")
+    if not 1 <= concurrency <= MAX_CONCURRENCY:
+        module.fail_json(msg="concurrency must be between 1 and %d" % MAX_CONCURRENCY)
+    if not HAS_YAML:
+        module.fail_json(msg=missing_required_lib("PyYAML"))
+    path = module.params.get("path")
+    if not os.path.exists(path):
+        module.fail_json(msg="%s does not exist" % path)
+    try:
+        desired_state = load_desired_state(path)
+    except ValueError as e:
+        module.fail_json(msg=to_native(e))
+    resources = module.params.get("resources")
+    if resources:
+        desired_state = dict(
+            (resource, objects)
+            for resource, objects in desired_state.items()
+            if resource in resources
+        )
+
+    # Desired objects with the collection they are looked up in, or the
+    # reason they cannot be compared
+    objects = []
+    for resource in sorted(desired_state):
+        for file_path, obj in desired_state[resource]:
+            key = name_key(resource, obj)
+            entry = dict(
+                resource=resource,
+                name=obj.get(key) if key else None,
+                file=file_path,
+            )
+            if key is None:
+                entry["msg"] = "The object has no %s" % " or ".join(
+                    RESOURCES[resource][2]
+                )
+                objects.append((entry, obj, None))
+                continue
+            try:
+                scope = object_scope(resource, obj)
+            except ValueError as e:
+                entry["msg"] = to_native(e)
+                objects.append((entry, obj, None))
+                continue
+            objects.append((entry, obj, (resource, scope, key)))
+
+    client = ZIAClientHelper(module)
+    collections = list(set(lookup[:2] for entry, obj, lookup in objects if lookup))
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        loaded = pool.map(lambda args: load_index(client, *args), collections)
+        indexes = dict(zip(collections, loaded))
+
+    details = module.params.get("details")
+    summary = dict((resource, dict.fromkeys(STATUSES, 0)) for resource in desired_state)
+    drift = []
+    for entry, obj, lookup in objects:
+        if lookup is None:
+            status, differences = INVALID, []
+        else:
+            resource, scope, key = lookup
+            current = indexes[(resource, scope)].get(key, obj[key])
+            entry["id"] = current.get("id") if current else None
+            try:
+                status, differences = object_drift(resource, obj, current)
+            except ValueError as e:
+                entry["msg"] = to_native(e)
+                status, differences = INVALID, []
+        summary[entry["resource"]][status] += 1
+        if status == IN_SYNC:
+            continue
+        entry["status"] = status
+        entry["fields"] = [difference["field"] for difference in differences]
+        if details:
+            entry["differences"] = differences
+        drift.append(entry)
+
+    module.exit_json(changed=False, drifted=bool(drift), summary=summary, drift=drift)
+
+
+def main():
+    argument_spec = ZIAClientHelper.zia_argument_spec()
+    argument_spec.update(
+        path=dict(type="path", required=True),
+        resources=dict(
+            type="list", elements="str", required=False, choices=sorted(RESOURCES)
+        ),
+        details=dict(type="bool", required=False, default=False),
+        concurrency=dict(type="int", required=False, default=4),
+    )
+    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+
+    try:
+        core(module)
+    except Exception as e:
+        module.fail_json(msg=to_native(e), exception=format_exc())
+
+
+if __name__ == "__main__":
+    main()
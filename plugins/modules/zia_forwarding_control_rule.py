@@ -355,46 +355,17 @@ from ansible_collections.zscaler.ziacloud.plugins.module_utils.utils import (
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
-
-
-def normalize_rule(rule):
-    """
-    Normalize rule data by setting computed values.
-    """
-    normalized = rule.copy()
-
-    computed_values = [
-        "id",
-        "src_ips",
-        "dest_addresses",
-        "dest_countries",
-        "dest_ip_categories",
-        "res_categories",
-        "proxy_gateway",
-        "zpa_gateway",
-        "zpa_app_segments",
-        "zpa_application_segments",
-        "zpa_application_segment_groups",
-    ]
-
-    for attr in computed_values:
-        if attr in normalized and normalized[attr] is None:
-            normalized[attr] = []
-
-        if attr == "zpa_app_segments" and attr in normalized:
-            normalized[attr] = [
-                {
-                    "external_id": segment.get("external_id", ""),
-                    "name": segment.get("name", ""),
-                }
-                for segment in normalized[attr] or []
-            ]
-        elif attr in normalized:
-            normalized[attr] = normalized[attr]
-        else:
-            normalized[attr] = []
-
-    return normalized
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_diff import (
+    clear_unset,
+    diff,
+    rule_schema,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_schemas import (
+    FIELD_SPECS,
+)
 
 
 def validate_forwarding_rule_constraints(module):
@@ -555,82 +526,19 @@ def core(module):
         if ruleBox is not None:
             existing_rule = ruleBox.to_dict()
     elif rule_name is not None:
-        rules = client.forwarding_control.list_rules().to_list()
-        for rule_ in rules:
-            if rule_.get("name") == rule_name:
-                existing_rule = rule_
-
-    # Normalize and compare existing and desired data
-    desired_rule = normalize_rule(rule)
-    current_rule = normalize_rule(existing_rule) if existing_rule else {}
-
-    def preprocess_rules(rule, params):
-        """
-        Preprocess specific attributes in the rule based on their type and structure.
-        :param rule: Dict containing the rule data.
-        :param params: List of attribute names to be processed.
-        :return: Preprocessed rule.
-        """
-        for attr in params:
-            if attr in rule and rule[attr] is not None:
-                # Process list attributes
-                if isinstance(rule[attr], list):
-                    # If list contains dictionaries with 'id', extract IDs
-                    if all(
-                        isinstance(item, dict) and "id" in item for item in rule[attr]
-                    ):
-                        rule[attr] = [item["id"] for item in rule[attr]]
-                    elif all(isinstance(item, dict) for item in rule[attr]):
-                        # Handle lists of dictionaries without sorting
-                        rule[attr] = sorted(
-                            rule[attr],
-                            key=lambda x: (x.get("external_id", ""), x.get("name", "")),
-                        )
-                    else:
-                        # Sort lists for consistent order
-                        rule[attr] = sorted(rule[attr])
-                # Add more conditions here if needed for other types
-        return rule
-
-    existing_rule_preprocessed = preprocess_rules(current_rule, params)
-    desired_rule_preprocessed = preprocess_rules(desired_rule, params)
-
-    # Then proceed with your comparison logic
-    differences_detected = False
-    for key in params:
-        desired_value = desired_rule_preprocessed.get(key)
-        current_value = existing_rule_preprocessed.get(key)
-
-        # Handling for list attributes where None should be treated as an empty list
-        if isinstance(current_value, list) and desired_value is None:
-            desired_value = []
-
-        # Skip comparison for 'id' if it's not in the desired rule but present in the existing rule
-        if key == "id" and desired_value is None and current_value is not None:
-            continue
-
-        # Convert 'state' in current_rule to boolean 'enabled'
-        if key == "enabled" and "state" in current_rule:
-            current_value = current_rule["state"] == "ENABLED"
-
-        # Handling None values for all attributes
-        if desired_value is None and key != "enabled":
-            # Explicitly setting to empty list or empty value based on type
-            rule[key] = [] if isinstance(current_value, list) else None
-
-        # Special handling for lists of IDs
-        if isinstance(desired_value, list) and isinstance(current_value, list):
-            if all(isinstance(x, int) for x in desired_value) and all(
-                isinstance(x, int) for x in current_value
-            ):
-                desired_value = sorted(desired_value)
-                current_value = sorted(current_value)
-
-        if current_value != desired_value:
-            differences_detected = True
-            # module.warn(
-            #     f"Difference detected in {key}. Current: {current_value}, Desired: {desired_value}"
-            # )
+        existing_rule = ZIAResourceIndex(
+            client, "forwarding_control_rules"
+        ).get_by_name(rule_name)
+
+    # Compare existing and desired data
+    schema = rule_schema(params, **FIELD_SPECS["forwarding_control_rules"])
+    differences = diff(rule, existing_rule, schema)
+    # for difference in differences:
+    #     module.warn(
+    #         f"Difference detected in {difference['field']}. Current: {difference['current']}, Desired: {difference['desired']}"
+    #     )
+    differences_detected = bool(differences)
+    clear_unset(rule, existing_rule, schema)
 
     if module.check_mode:
         # If in check mode, report changes and exit
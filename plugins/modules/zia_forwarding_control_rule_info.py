@@ -169,6 +169,9 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
 
 
 def core(module):
@@ -187,7 +190,7 @@ def core(module):
         rules = [ruleBox.to_dict()]
     else:
         # Fetch all rules and search by name
-        all_rules = client.forwarding_control.list_rules().to_list()
+        all_rules = ZIAResourceIndex(client, "forwarding_control_rules").values()
         if rule_name is not None:
             # Iterate over rules to find the matching name
             for rule in all_rules:
@@ -107,6 +107,9 @@ from ansible_collections.zscaler.ziacloud.plugins.module_utils.utils import (
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
 
 
 def normalize_gateway(gateway):
@@ -174,13 +177,10 @@ def core(module):
     existing_gateway = None
     if gateway_id is not None:
         existing_gateway = client.zpa_gateway.get_gateway(gateway_id).to_dict()
-    else:
-        gateways = client.zpa_gateway.list_gateways().to_list()
-        if gateway_name is not None:
-            for gw in gateways:
-                if gw.get("name", None) == gateway_name:
-                    existing_gateway = gw
-                    break
+    elif gateway_name is not None:
+        existing_gateway = ZIAResourceIndex(client, "zpa_gateways").get_by_name(
+            gateway_name
+        )
 
     # Normalize and compare existing and desired data
     desired_gateway = normalize_gateway(gateway)
@@ -82,6 +82,9 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
 
 
 def core(module):
@@ -93,7 +96,7 @@ def core(module):
         gateway = client.zpa_gateway.get_gateway(gateway_id).to_dict()
         gateways = [gateway]
     else:
-        gateways = client.zpa_gateway.list_gateways().to_list()
+        gateways = ZIAResourceIndex(client, "zpa_gateways").values()
         if gateway_name is not None:
             gateway = None
             for gw in gateways:
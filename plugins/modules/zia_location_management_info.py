@@ -42,6 +42,7 @@ notes:
 extends_documentation_fragment:
   - zscaler.ziacloud.fragments.provider
   - zscaler.ziacloud.fragments.documentation
+  - zscaler.ziacloud.fragments.paging
 
 options:
   id:
@@ -52,6 +53,13 @@ options:
     description: "The location name"
     required: false
     type: str
+  search:
+    description:
+      - Returns only the locations whose name or port partially match this string.
+      - The filter is applied by the API.
+    required: false
+    type: str
+    version_added: "1.4.0"
 """
 
 EXAMPLES = r"""
@@ -63,6 +71,12 @@ EXAMPLES = r"""
   zscaler.ziacloud.zia_location_management_info:
     provider: '{{ provider }}'
     name: "USA-SJC37"
+
+- name: Gather Information Details of the ZIA Locations matching a search string
+  zscaler.ziacloud.zia_location_management_info:
+    provider: '{{ provider }}'
+    search: "USA"
+    page_size: 200
 """
 
 RETURN = r"""
@@ -242,9 +256,16 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_pagination import (
+    check_paging_params,
+    find_first,
+    list_items,
+    paging_argument_spec,
+)
 
 
 def core(module):
+    check_paging_params(module)
     client = ZIAClientHelper(module)
     location_name = module.params.get("name", None)
     location_id = module.params.get("id", None)
@@ -257,15 +278,29 @@ def core(module):
             )
         locations = [locationBox.to_dict()]
     elif location_name is not None:
-        locationBox = client.locations.get_location(location_name=location_name)
-        if locationBox is None:
+        # The API search is a partial match, stop at the exact one
+        location = find_first(
+            client,
+            "locations",
+            lambda item: item.get("name", None) == location_name,
+            params=dict(search=location_name),
+            page_size=module.params.get("page_size"),
+        )
+        if location is None:
             module.fail_json(
                 msg="Failed to retrieve location management Name: '%s'"
                 % (location_name)
             )
-        locations = [locationBox.to_dict()]
+        locations = [location]
     else:
-        locations = client.locations.list_locations().to_list()
+        locations = list_items(
+            client,
+            "locations",
+            params=dict(search=module.params.get("search")),
+            page_size=module.params.get("page_size"),
+            max_results=module.params.get("max_results"),
+            concurrency=module.params.get("concurrency"),
+        )
     module.exit_json(changed=False, locations=locations)
 
 
@@ -274,6 +309,8 @@ def main():
     argument_spec.update(
         name=dict(type="str", required=False),
         id=dict(type="int", required=False),
+        search=dict(type="str", required=False),
+        **paging_argument_spec()
     )
     module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
     try:
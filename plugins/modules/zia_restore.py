@@ -0,0 +1,357 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                             MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: zia_restore
+short_description: "Restores the policy of a ZIA tenant from a backup."
+description:
+  - Restores a backup written by M(zscaler.ziacloud.zia_backup), after checking the hash of every file.
+  - The resource types are restored in dependency order; the rule labels, URL categories and firewall objects
+    before the rules referencing them. Objects that no longer exist are created again and the rules restored
+    after them reference their new IDs.
+  - Every resource type is listed once, in parallel, and compared in memory with the backup, so only the objects
+    that drifted from the backup are created or updated.
+  - Predefined objects, such as the default rules and the predefined URL categories, are updated but never
+    created nor deleted.
+author:
+  - William Guilherme (@willguibr)
+version_added: "1.4.0"
+requirements:
+    - Zscaler SDK Python can be obtained from PyPI U(https://pypi.org/project/zscaler-sdk-python/)
+notes:
+    - Check mode is supported.
+    - Changes must be activated, for instance with M(zscaler.ziacloud.zia_activation_status).
+extends_documentation_fragment:
+  - zscaler.ziacloud.fragments.provider
+  - zscaler.ziacloud.fragments.documentation
+
+options:
+  path:
+    description:
+      - Directory of the backup, on the host running the module.
+    required: true
+    type: path
+  resources:
+    description:
+      - The resource types restored. All the resource types of the backup by default.
+    required: false
+    type: list
+    elements: str
+  purge:
+    description:
+      - When set to true, the objects of the restored resource types that are not in the backup are deleted.
+      - They are deleted before the backup is restored, rules first.
+    required: false
+    type: bool
+    default: false
+  concurrency:
+    description:
+      - Maximum number of collections listed in parallel.
+    type: int
+    required: false
+    default: 4
+"""
+
+EXAMPLES = r"""
+- name: Restore the policy of the tenant
+  zscaler.ziacloud.zia_restore:
+    provider: '{{ provider }}'
+    path: /var/backups/zia/2024-01-31
+
+- name: Show the URL Filtering rules that drifted from the backup
+  zscaler.ziacloud.zia_restore:
+    provider: '{{ provider }}'
+    path: /var/backups/zia/2024-01-31
+    resources:
+      - url_filtering_rules
+  check_mode: true
+"""
+
+RETURN = r"""
+resources:
+  description: Number of objects of each resource type per action.
+  returned: always
+  type: dict
+  sample: {"url_filtering_rules": {"create": 1, "update": 2, "delete": 0, "unchanged": 82, "failed": 0}}
+results:
+  description: One entry per object that was created, updated or deleted, or that would be in check mode.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    resource:
+      description: Resource type of the object.
+      type: str
+      sample: url_filtering_rules
+    name:
+      description: Name of the object.
+      type: str
+      sample: Block Gambling
+    id:
+      description: ID of the object in the tenant, null for an object created in check mode.
+      type: raw
+      sample: 1203256
+    action:
+      description: Change applied to the object.
+      type: str
+      sample: update
+      choices: [create, update, delete]
+    changed_fields:
+      description: Attributes that differ from the backup.
+      type: list
+      elements: str
+      sample: ["description"]
+    failed:
+      description: Set when the API call of this object failed.
+      type: bool
+      returned: on failure
+    msg:
+      description: Error returned by the API call of this object.
+      type: str
+      returned: on failure
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from traceback import format_exc
+
+from ansible.module_utils._text import to_native
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_backup import (
+    BACKUP_RESOURCES,
+    ZIABackup,
+    object_differences,
+    object_name,
+    payload,
+    predefined,
+    remap_references,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_bulk import (
+    CREATE,
+    DELETE,
+    UNCHANGED,
+    UPDATE,
+    apply_changes,
+    plan_changes,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
+    ZIAClientHelper,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_pagination import (
+    MAX_CONCURRENCY,
+)
+
+SUMMARY_KEYS = (CREATE, UPDATE, DELETE, UNCHANGED, "failed")
+
+
+class CollectionRestore:
+    """Restores the objects of one collection of the backup."""
+
+    def __init__(self, module, client, entry, items, index):
+        self.module = module
+        self.client = client
+        self.resource = entry["resource"]
+        self.collection = entry["collection"]
+        self.items = items
+        self.index = index
+
+    def send(self, method, path, body=None):
+        resp = self.client.send(method, path, json=body)
+        if resp.status_code > 299:
+            raise Exception("%s %s failed: %s" % (method, path, resp.text))
+        return resp.json() if resp.status_code != 204 and resp.text else None
+
+    def create(self, item):
+        return self.send("POST", self.collection, payload(item))
+
+    def update(self, item, current):
+        body = payload(item)
+        body["id"] = current["id"]
+        self.send("PUT", "%s/%s" % (self.collection, current["id"]), body)
+
+    def delete(self, current):
+        self.send("DELETE", "%s/%s" % (self.collection, current["id"]))
+
+    def stale_changes(self):
+        """Returns the deletions of the live objects missing from the backup."""
+        names = set(object_name(item) for item in self.items)
+        return [
+            dict(
+                action=DELETE,
+                name=object_name(current),
+                id=current.get("id"),
+                changed_fields=[],
+                desired=None,
+                current=current,
+            )
+            for current in self.index.values()
+            if object_name(current) not in names and not predefined(current)
+        ]
+
+    def restore(self, id_maps):
+        """
+        Creates and updates the objects that drifted from the backup.
+
+        :param id_maps: Dict of the old to new IDs of the objects of each
+            resource, updated with the objects of this collection.
+        """
+        backup_ids = {}
+        desired_items = []
+        for item in self.items:
+            remap_references(item, id_maps)
+            backup_ids[object_name(item)] = item.get("id")
+            # Objects are matched by name, their ID differs once recreated
+            if not predefined(item):
+                item.pop("id", None)
+            desired_items.append(item)
+
+        changes = plan_changes(
+            desired_items,
+            self.index,
+            object_differences,
+            name_of=object_name,
+        )
+        changed, report, failed = apply_changes(
+            self.module, changes, self.create, self.update, self.delete
+        )
+        id_map = id_maps.setdefault(self.resource, {})
+        for entry in report:
+            old_id = backup_ids.get(entry["name"])
+            if old_id is not None and entry["id"] is not None:
+                if str(old_id) != str(entry["id"]):
+                    id_map[str(old_id)] = entry["id"]
+        return changed, report, failed
+
+
+def load_index(client, entry):
+    index = ZIAResourceIndex(
+        client,
+        entry["resource"],
+        scope=entry["scope"],
+        persistent=False,
+        # The tenant is compared with the API, not with a tenant snapshot
+        snapshot=False,
+    )
+    index.values()
+    return index
+
+
+def core(module):
+    concurrency = module.params.get("concurrency")
+    if not 1 <= concurrency <= MAX_CONCURRENCY:
+        module.fail_json(msg="concurrency must be between 1 and %d" % MAX_CONCURRENCY)
+    backup = ZIABackup(module.params.get("path"))
+    if backup.manifest() is None:
+        module.fail_json(msg="No backup found in %s" % backup.path)
+    resources = module.params.get("resources") or BACKUP_RESOURCES
+    entries = [
+        entry
+        for resource in BACKUP_RESOURCES
+        if resource in resources
+        for entry in backup.entries(resource)
+    ]
+    # Every file is checked before anything is written
+    items = [backup.read_collection(entry) for entry in entries]
+
+    client = ZIAClientHelper(module)
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        indexes = list(pool.map(lambda entry: load_index(client, entry), entries))
+    restores = [
+        CollectionRestore(module, client, entry, collection_items, index)
+        for entry, collection_items, index in zip(entries, items, indexes)
+    ]
+
+    changed = False
+    failed = 0
+    reports = []
+    if module.params.get("purge"):
+        # Rules are deleted before the objects they reference
+        for restore in reversed(restores):
+            deletions = restore.stale_changes()
+            if not deletions:
+                continue
+            deleted, report, deletions_failed = apply_changes(
+                module, deletions, restore.create, restore.update, restore.delete
+            )
+            changed = changed or deleted
+            failed += deletions_failed
+            reports.append((restore.resource, report))
+
+    id_maps = {}
+    for restore in restores:
+        restored, report, restore_failed = restore.restore(id_maps)
+        changed = changed or restored
+        failed += restore_failed
+        reports.append((restore.resource, report))
+
+    summary = dict(
+        (resource, dict.fromkeys(SUMMARY_KEYS, 0))
+        for resource in set(entry["resource"] for entry in entries)
+    )
+    results = []
+    for resource, report in reports:
+        for entry in report:
+            summary[resource][entry["action"]] += 1
+            if entry.get("failed"):
+                summary[resource]["failed"] += 1
+            if entry["action"] != UNCHANGED:
+                entry["resource"] = resource
+                results.append(entry)
+
+    if failed:
+        module.fail_json(
+            msg="%d of the restored objects failed" % failed,
+            changed=changed,
+            resources=summary,
+            results=results,
+        )
+    module.exit_json(changed=changed, resources=summary, results=results)
+
+
+def main():
+    argument_spec = ZIAClientHelper.zia_argument_spec()
+    argument_spec.update(
+        path=dict(type="path", required=True),
+        resources=dict(
+            type="list", elements="str", required=False, choices=BACKUP_RESOURCES
+        ),
+        purge=dict(type="bool", required=False, default=False),
+        concurrency=dict(type="int", required=False, default=4),
+    )
+    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+
+    try:
+        core(module)
+    except Exception as e:
+        module.fail_json(msg=to_native(e), exception=format_exc())
+
+
+if __name__ == "__main__":
+    main()
@@ -79,18 +79,19 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
 
 
 def normalize_labels(group):
     """
-    Normalize ip source group data by setting computed values.
+    Normalize rule label data by setting computed values.
     """
     normalized = group.copy()
 
     computed_values = [
         "id",
-        "name",
-        "description",
         "last_modified_time",
         "last_modified_by",
         "last_modified_by.id",
@@ -124,13 +125,10 @@ def core(module):
     existing_rule_label = None
     if label_id is not None:
         existing_rule_label = client.labels.get_label(label_id).to_dict()
-    else:
-        rule_labels = client.labels.list_labels().to_list()
-        if label_name is not None:
-            for label in rule_labels:
-                if label.get("name", None) == label_name:
-                    existing_rule_label = label
-                    break
+    elif label_name is not None:
+        existing_rule_label = ZIAResourceIndex(client, "rule_labels").get_by_name(
+            label_name
+        )
 
     # Normalize and compare existing and desired data
     normalized_label = normalize_labels(rule_label)
@@ -141,7 +139,9 @@ def core(module):
     fields_to_exclude = ["id"]
     differences_detected = False
     for key, value in normalized_label.items():
-        if key not in fields_to_exclude and normalized_existing_label.get(key) != value:
+        if value is None or key in fields_to_exclude:
+            continue
+        if normalized_existing_label.get(key) != value:
             differences_detected = True
             module.warn(
                 f"Difference detected in {key}. Current: {normalized_existing_label.get(key)}, Desired: {value}"
@@ -158,7 +158,10 @@ def core(module):
 
     if existing_rule_label is not None:
         id = existing_rule_label.get("id")
-        existing_rule_label.update(normalized_label)
+        # Attributes left unset keep their current value
+        existing_rule_label.update(
+            (key, value) for key, value in normalized_label.items() if value is not None
+        )
         existing_rule_label["id"] = id  # Ensure the ID is not overwritten by the update
 
     if state == "present":
@@ -177,7 +180,7 @@ def core(module):
                 name=rule_label.get("name", ""),
                 description=rule_label.get("description", ""),
             ).to_dict()
-            module.exit_json(changed=False, data=rule_label)
+            module.exit_json(changed=True, data=rule_label)
     elif state == "absent":
         if existing_rule_label is not None:
             code = client.labels.delete_label(existing_rule_label.get("id"))
@@ -136,6 +136,9 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
 
 
 def core(module):
@@ -147,7 +150,7 @@ def core(module):
         label = client.labels.get_label(label_id).to_dict()
         labels = [label]
     else:
-        labels = client.labels.list_labels().to_list()
+        labels = ZIAResourceIndex(client, "rule_labels").values()
         if label_name is not None:
             label = None
             for rule in labels:
@@ -0,0 +1,885 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                             MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: zia_site_onboarding
+short_description: "Onboards a list of sites: static IP, VPN credential, GRE tunnel and location."
+description:
+  - Creates, updates or deletes the static IP address, VPN credential, GRE tunnel and location of a list of
+    sites in one task, instead of one task per object and site.
+  - The objects of a site are provisioned in dependency order; the static IP address before the GRE tunnel and
+    the IP VPN credential, and the location last. Deletions run in the reverse order.
+  - The sites are independent and are provisioned in parallel. All requests share one session and the rate
+    limiter, and the existing objects are listed once for the whole list of sites.
+  - A site whose object fails does not stop the other sites.
+author:
+  - William Guilherme (@willguibr)
+version_added: "1.4.0"
+requirements:
+    - Zscaler SDK Python can be obtained from PyPI U(https://pypi.org/project/zscaler-sdk-python/)
+notes:
+    - Check mode is supported.
+extends_documentation_fragment:
+  - zscaler.ziacloud.fragments.provider
+  - zscaler.ziacloud.fragments.documentation
+
+options:
+  sites:
+    description:
+      - List of the sites to onboard.
+    required: true
+    type: list
+    elements: dict
+    suboptions:
+      name:
+        description:
+          - Name of the location of the site.
+        required: true
+        type: str
+      state:
+        description:
+          - Whether the objects of the site should exist or not.
+        type: str
+        choices:
+          - present
+          - absent
+        default: present
+      static_ip:
+        description:
+          - Static IP address of the site, matched by C(ip_address).
+        required: false
+        type: dict
+        suboptions:
+          ip_address:
+            description: The static IP address.
+            required: true
+            type: str
+          comment:
+            description: Additional information about this static IP address.
+            required: false
+            type: str
+          geo_override:
+            description: If not set, geographic coordinates and city are automatically determined from the IP address.
+            required: false
+            type: bool
+          latitude:
+            description: Required only if the geo_override attribute is set.
+            required: false
+            type: float
+          longitude:
+            description: Required only if the geo_override attribute is set.
+            required: false
+            type: float
+          routable_ip:
+            description: Indicates whether a non-RFC 1918 IP address is publicly routable.
+            required: false
+            type: bool
+      vpn_credential:
+        description:
+          - VPN credential of the site, matched by C(fqdn) or C(ip_address).
+          - The C(ip_address) of an C(IP) credential defaults to the static IP address of the site.
+        required: false
+        type: dict
+        suboptions:
+          type:
+            description:
+              - VPN authentication type.
+            required: false
+            type: str
+            default: UFQDN
+            choices:
+              - UFQDN
+              - IP
+          fqdn:
+            description: Fully Qualified Domain Name, required for the C(UFQDN) type.
+            required: false
+            type: str
+          ip_address:
+            description: Static IP address, for the C(IP) type.
+            required: false
+            type: str
+          pre_shared_key:
+            description: Pre-shared key of the VPN credential.
+            required: false
+            type: str
+          update_psk:
+            description: Updates the pre-shared key of an existing VPN credential.
+            required: false
+            type: bool
+            default: false
+          comments:
+            description: Additional information about this VPN credential.
+            required: false
+            type: str
+      gre_tunnel:
+        description:
+          - GRE tunnel sourced from the static IP address of the site.
+          - Requires C(static_ip).
+          - The closest diverse virtual IP addresses are used unless C(primary_dest_vip_id) and
+            C(secondary_dest_vip_id) are set.
+        required: false
+        type: dict
+        suboptions:
+          comment:
+            description: Additional information about this GRE tunnel.
+            required: false
+            type: str
+          internal_ip_range:
+            description:
+              - The start of the internal IP address in /29 CIDR range.
+              - The first available range is used for a numbered tunnel when it is not set.
+            required: false
+            type: str
+          within_country:
+            description: Restrict the data center virtual IP addresses (VIPs) only to those within the same country as the source IP address.
+            required: false
+            type: bool
+          ip_unnumbered:
+            description: Whether the tunnel is unnumbered.
+            required: false
+            type: bool
+          sub_cloud:
+            description: Restrict the data center virtual IP addresses (VIPs) only to those part of the subcloud.
+            required: false
+            type: str
+          primary_dest_vip_id:
+            description: ID of the primary destination virtual IP address.
+            required: false
+            type: str
+          secondary_dest_vip_id:
+            description: ID of the secondary destination virtual IP address.
+            required: false
+            type: str
+      location:
+        description:
+          - Attributes of the location of the site, matched by C(name).
+          - The C(ip_addresses) default to the static IP address of the site, and the VPN credential of the
+            site is associated to the location.
+        required: false
+        type: dict
+        suboptions:
+          description:
+            description: Additional notes or information regarding the location.
+            required: false
+            type: str
+          country:
+            description: Country of the location.
+            required: false
+            type: str
+          tz:
+            description: Timezone of the location.
+            required: false
+            type: str
+          profile:
+            description: Profile tag that specifies the location traffic type.
+            required: false
+            type: str
+            choices:
+              - NONE
+              - CORPORATE
+              - SERVER
+              - GUESTWIFI
+              - IOT
+          up_bandwidth:
+            description: Upload bandwidth in kbps. The value 0 implies no Bandwidth Control enforcement.
+            required: false
+            type: int
+          dn_bandwidth:
+            description: Download bandwidth in kbps. The value 0 implies no Bandwidth Control enforcement.
+            required: false
+            type: int
+          ip_addresses:
+            description: IP addresses of the location.
+            required: false
+            type: list
+            elements: str
+          ports:
+            description: IP ports that are associated with the location.
+            required: false
+            type: list
+            elements: int
+          auth_required:
+            description: Enforce Authentication.
+            required: false
+            type: bool
+          ssl_scan_enabled:
+            description: Enable SSL Inspection.
+            required: false
+            type: bool
+          zapp_ssl_scan_enabled:
+            description: Enable Zscaler App SSL Setting.
+            required: false
+            type: bool
+          xff_forward_enabled:
+            description: Enable XFF Forwarding for a location.
+            required: false
+            type: bool
+          surrogate_ip:
+            description: Enable Surrogate IP.
+            required: false
+            type: bool
+          idle_time_in_minutes:
+            description: Idle Time to Disassociation.
+            required: false
+            type: int
+          display_time_unit:
+            description: Display Time Unit.
+            required: false
+            type: str
+            choices:
+              - MINUTE
+              - HOUR
+              - DAY
+          ofw_enabled:
+            description: Enable Firewall.
+            required: false
+            type: bool
+          ips_control:
+            description: Enable IPS Control.
+            required: false
+            type: bool
+          aup_enabled:
+            description: Enable AUP.
+            required: false
+            type: bool
+          caution_enabled:
+            description: Enable Caution.
+            required: false
+            type: bool
+          aup_timeout_in_days:
+            description: Custom AUP Frequency.
+            required: false
+            type: int
+          iot_discovery_enabled:
+            description: Enable IOT Discovery at the location.
+            required: false
+            type: bool
+  concurrency:
+    description:
+      - Maximum number of objects provisioned in parallel.
+      - Requests are delayed when the API reports that the rate limit is reached.
+    type: int
+    required: false
+    default: 4
+"""
+
+EXAMPLES = r"""
+- name: Onboard the branch offices
+  zscaler.ziacloud.zia_site_onboarding:
+    provider: '{{ provider }}'
+    sites:
+      - name: Branch 001
+        static_ip:
+          ip_address: 203.0.113.10
+          comment: Branch 001
+        gre_tunnel:
+          comment: Branch 001
+          ip_unnumbered: true
+        location:
+          country: UNITED_STATES
+          tz: UNITED_STATES_AMERICA_LOS_ANGELES
+          profile: CORPORATE
+      - name: Branch 002
+        vpn_credential:
+          type: UFQDN
+          fqdn: branch-002@acme.com
+          pre_shared_key: "{{ branch_psk }}"
+        location:
+          profile: CORPORATE
+
+- name: Offboard a branch office
+  zscaler.ziacloud.zia_site_onboarding:
+    provider: '{{ provider }}'
+    sites:
+      - name: Branch 001
+        state: absent
+        static_ip:
+          ip_address: 203.0.113.10
+        gre_tunnel: {}
+"""
+
+RETURN = r"""
+sites:
+  description: One entry per site, with the change applied to each of its objects.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    name:
+      description: Name of the site.
+      type: str
+      sample: Branch 001
+    failed:
+      description: Set when an object of the site failed or was skipped.
+      type: bool
+      returned: on failure
+    static_ip:
+      description: Change applied to the static IP address, with the C(action), C(id) and C(changed_fields) keys.
+      type: dict
+      returned: when static_ip is set
+      sample: {"action": "create", "id": 2845, "changed_fields": []}
+    vpn_credential:
+      description: Change applied to the VPN credential.
+      type: dict
+      returned: when vpn_credential is set
+    gre_tunnel:
+      description: Change applied to the GRE tunnel.
+      type: dict
+      returned: when gre_tunnel is set
+    location:
+      description:
+        - Change applied to the location.
+        - An object that failed holds C(failed) and C(msg) instead, an object skipped because of a failure holds
+          C(skipped) and C(msg).
+      type: dict
+      returned: always
+      sample: {"action": "update", "id": 5501, "changed_fields": ["ip_addresses"]}
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from traceback import format_exc
+
+from ansible.module_utils._text import to_native
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.utils import (
+    deleteNone,
+    diff_suppress_func_coordinate,
+    validate_latitude,
+    validate_location_mgmt,
+    validate_longitude,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
+    ZIAClientHelper,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_dag import (
+    FAILED,
+    SKIPPED,
+    run_graph,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_gre import (
+    GREInternalRanges,
+    closest_diverse_vips,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_pagination import (
+    MAX_CONCURRENCY,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_vpn_credentials import (
+    create_payload,
+    credential_name,
+    update_vpn_credential,
+    validate_vpn_credential_type,
+)
+
+# Objects of a site, in provisioning order, and their resource index
+SITE_OBJECTS = (
+    ("static_ip", "static_ips"),
+    ("vpn_credential", "vpn_credentials"),
+    ("gre_tunnel", "gre_tunnels"),
+    ("location", "locations"),
+)
+
+STATIC_IP_FIELDS = ("comment", "geo_override", "latitude", "longitude", "routable_ip")
+GRE_TUNNEL_FIELDS = (
+    "comment",
+    "internal_ip_range",
+    "within_country",
+    "ip_unnumbered",
+    "sub_cloud",
+)
+LOCATION_FIELDS = (
+    "description",
+    "country",
+    "tz",
+    "profile",
+    "up_bandwidth",
+    "dn_bandwidth",
+    "ports",
+    "auth_required",
+    "ssl_scan_enabled",
+    "zapp_ssl_scan_enabled",
+    "xff_forward_enabled",
+    "surrogate_ip",
+    "idle_time_in_minutes",
+    "display_time_unit",
+    "ofw_enabled",
+    "ips_control",
+    "aup_enabled",
+    "caution_enabled",
+    "aup_timeout_in_days",
+    "iot_discovery_enabled",
+)
+
+
+def changed_attributes(desired, current, fields):
+    """Returns the fields set in ``desired`` whose value differs in ``current``."""
+    differences = []
+    for key in fields:
+        value = desired.get(key)
+        if value is None:
+            continue
+        if key in ("latitude", "longitude"):
+            if not diff_suppress_func_coordinate(current.get(key), value):
+                differences.append(key)
+        elif current.get(key) != value:
+            differences.append(key)
+    return differences
+
+
+def site_dependencies(site):
+    """
+    Returns the objects of a site mapped to the objects of the same site
+    that must be provisioned, or deleted, before them.
+    """
+    present = [kind for kind, unused in SITE_OBJECTS if site.get(kind) is not None]
+    requires = dict((kind, set()) for kind in present)
+    if "gre_tunnel" in requires and "static_ip" in requires:
+        requires["gre_tunnel"].add("static_ip")
+    if "vpn_credential" in requires and "static_ip" in requires:
+        if site["vpn_credential"].get("type") == "IP":
+            requires["vpn_credential"].add("static_ip")
+    requires["location"].update(kind for kind in present if kind != "location")
+    if site["state"] == "absent":
+        # Objects are deleted before the objects they depend on
+        reverse = dict((kind, set()) for kind in present)
+        for kind, dependencies in requires.items():
+            for dependency in dependencies:
+                reverse[dependency].add(kind)
+        requires = reverse
+    return requires
+
+
+def validate_site(site):
+    static_ip = site.get("static_ip")
+    if static_ip is not None and static_ip.get("geo_override"):
+        if static_ip.get("latitude") is None or static_ip.get("longitude") is None:
+            raise ValueError(
+                "Site %s: latitude and longitude are required with geo_override"
+                % site["name"]
+            )
+        errors = (
+            validate_latitude(static_ip["latitude"])[1]
+            + validate_longitude(static_ip["longitude"])[1]
+        )
+        if errors:
+            raise ValueError("Site %s: %s" % (site["name"], "; ".join(errors)))
+    if site.get("gre_tunnel") is not None and static_ip is None:
+        raise ValueError("Site %s: gre_tunnel requires static_ip" % site["name"])
+    credential = site.get("vpn_credential")
+    if credential is not None:
+        if credential.get("type") == "IP" and not credential.get("ip_address"):
+            if static_ip is None:
+                raise ValueError(
+                    "Site %s: the IP VPN credential needs an ip_address" % site["name"]
+                )
+            credential["ip_address"] = static_ip["ip_address"]
+        validate_vpn_credential_type(credential)
+    if site["state"] == "present":
+        validate_location_mgmt(site["location"])
+
+
+class SiteOnboarding:
+    """
+    Provisions the objects of a list of sites. The existing objects are
+    read from indexes loaded once, before any change is made.
+    """
+
+    def __init__(self, client, indexes, check_mode, gre_ranges=None):
+        self.client = client
+        self.indexes = indexes
+        self.check_mode = check_mode
+        self.gre_ranges = gre_ranges or GREInternalRanges(client)
+        self.objects = {}
+
+    def current(self, resource, key, value):
+        if value is None:
+            return None
+        return self.indexes[resource].get(key, value)
+
+    def run(self, site, kind):
+        current = getattr(self, "current_" + kind)(site)
+        if site["state"] == "absent":
+            return self.delete(site, kind, current)
+        return getattr(self, "apply_" + kind)(site, current)
+
+    def result(self, site, kind, action, obj, changed_fields=None):
+        self.objects[(site["name"], kind)] = obj
+        return dict(
+            action=action,
+            id=obj.get("id") if obj else None,
+            changed_fields=changed_fields or [],
+        )
+
+    def linked(self, site, kind):
+        return self.objects.get((site["name"], kind))
+
+    # Lookups
+
+    def current_static_ip(self, site):
+        return self.current("static_ips", "ip_address", site["static_ip"]["ip_address"])
+
+    def current_vpn_credential(self, site):
+        credential = site["vpn_credential"]
+        for key in ("fqdn", "ip_address"):
+            existing = self.current("vpn_credentials", key, credential.get(key))
+            if existing is not None:
+                return existing
+        return None
+
+    def current_gre_tunnel(self, site):
+        return self.current("gre_tunnels", "source_ip", site["static_ip"]["ip_address"])
+
+    def current_location(self, site):
+        return self.current("locations", "name", site["name"])
+
+    # Provisioning
+
+    def apply_static_ip(self, site, current):
+        desired = site["static_ip"]
+        if current is None:
+            created = None
+            if not self.check_mode:
+                created = self.client.traffic.add_static_ip(
+                    **deleteNone(dict(desired))
+                ).to_dict()
+            return self.result(site, "static_ip", "create", created)
+        fields = changed_attributes(desired, current, STATIC_IP_FIELDS)
+        if fields and not self.check_mode:
+            current = self.client.traffic.update_static_ip(
+                static_ip_id=current["id"],
+                **dict((key, desired[key]) for key in fields),
+            ).to_dict()
+        action = "update" if fields else "unchanged"
+        return self.result(site, "static_ip", action, current, fields)
+
+    def apply_vpn_credential(self, site, current):
+        desired = site["vpn_credential"]
+        if current is None:
+            created = None
+            if not self.check_mode:
+                created = self.client.traffic.add_vpn_credential(
+                    **create_payload(desired)
+                ).to_dict()
+            return self.result(site, "vpn_credential", "create", created)
+        fields = changed_attributes(desired, current, ("comments",))
+        if desired.get("update_psk") and desired.get("pre_shared_key"):
+            fields.append("pre_shared_key")
+        if fields and not self.check_mode:
+            current = update_vpn_credential(
+                self.client,
+                current,
+                **dict((key, desired[key]) for key in fields),
+            )
+        action = "update" if fields else "unchanged"
+        return self.result(site, "vpn_credential", action, current, fields)
+
+    def apply_gre_tunnel(self, site, current):
+        desired = dict(site["gre_tunnel"])
+        source_ip = site["static_ip"]["ip_address"]
+        if current is None:
+            created = None
+            if not self.check_mode:
+                created = self.create_gre_tunnel(source_ip, desired)
+            return self.result(site, "gre_tunnel", "create", created)
+        fields = changed_attributes(desired, current, GRE_TUNNEL_FIELDS)
+        if fields and not self.check_mode:
+            # The tunnel is replaced, so the attributes left unset are kept
+            attributes = dict((key, current.get(key)) for key in GRE_TUNNEL_FIELDS)
+            attributes.update((key, desired[key]) for key in fields)
+            current = self.client.traffic.update_gre_tunnel(
+                tunnel_id=current["id"],
+                source_ip=source_ip,
+                primary_dest_vip_id=(current.get("primary_dest_vip") or {}).get("id"),
+                secondary_dest_vip_id=(current.get("secondary_dest_vip") or {}).get(
+                    "id"
+                ),
+                **deleteNone(attributes),
+            ).to_dict()
+        action = "update" if fields else "unchanged"
+        return self.result(site, "gre_tunnel", action, current, fields)
+
+    def create_gre_tunnel(self, source_ip, desired):
+        if not desired.get("primary_dest_vip_id") or not desired.get(
+            "secondary_dest_vip_id"
+        ):
+            vips = closest_diverse_vips(self.client, source_ip)
+            desired["primary_dest_vip_id"], desired["secondary_dest_vip_id"] = vips
+        if desired.get("ip_unnumbered") is False and not desired.get(
+            "internal_ip_range"
+        ):
+            desired["internal_ip_range"] = self.gre_ranges.allocate()
+        return self.client.traffic.add_gre_tunnel(
+            source_ip=source_ip, **deleteNone(desired)
+        ).to_dict()
+
+    def apply_location(self, site, current):
+        desired = dict(site["location"])
+        if desired.get("ip_addresses") is None and site.get("static_ip") is not None:
+            desired["ip_addresses"] = [site["static_ip"]["ip_address"]]
+        credential = self.linked(site, "vpn_credential")
+        if credential is not None:
+            desired["vpn_credentials"] = [
+                dict(id=credential["id"], type=credential.get("type"))
+            ]
+
+        if current is None:
+            created = None
+            if not self.check_mode:
+                created = self.client.locations.add_location(
+                    name=site["name"], **deleteNone(desired)
+                ).to_dict()
+            return self.result(site, "location", "create", created)
+
+        fields = changed_attributes(desired, current, LOCATION_FIELDS)
+        if desired.get("ip_addresses") is not None and sorted(
+            desired["ip_addresses"]
+        ) != sorted(current.get("ip_addresses") or []):
+            fields.append("ip_addresses")
+        if desired.get("vpn_credentials") is not None and sorted(
+            str(c.get("id")) for c in desired["vpn_credentials"]
+        ) != sorted(str(c.get("id")) for c in current.get("vpn_credentials") or []):
+            fields.append("vpn_credentials")
+        if fields and not self.check_mode:
+            current = self.client.locations.update_location(
+                current["id"], **dict((key, desired[key]) for key in fields)
+            ).to_dict()
+        action = "update" if fields else "unchanged"
+        return self.result(site, "location", action, current, fields)
+
+    # Deletion
+
+    def delete(self, site, kind, current):
+        if current is None:
+            return self.result(site, kind, "unchanged", None)
+        if not self.check_mode:
+            object_id = current["id"]
+            if kind == "static_ip":
+                code = self.client.traffic.delete_static_ip(static_ip_id=object_id)
+            elif kind == "vpn_credential":
+                code = self.client.traffic.delete_vpn_credential(
+                    credential_id=object_id
+                )
+            elif kind == "gre_tunnel":
+                code = self.client.traffic.delete_gre_tunnel(tunnel_id=object_id)
+            else:
+                code = self.client.locations.delete_location(location_id=object_id)
+            if code > 299:
+                raise Exception(
+                    "Failed to delete %s %s, status code %s" % (kind, object_id, code)
+                )
+        return self.result(site, kind, "delete", current)
+
+
+def load_indexes(client, resources):
+    """Lists the collections of the given resources in parallel."""
+
+    def load(resource):
+        index = ZIAResourceIndex(client, resource)
+        index.values()
+        return resource, index
+
+    if not resources:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(resources)) as pool:
+        return dict(pool.map(load, resources))
+
+
+def core(module):
+    concurrency = module.params.get("concurrency")
+    if not 1 <= concurrency <= MAX_CONCURRENCY:
+        module.fail_json(msg="concurrency must be between 1 and %d" % MAX_CONCURRENCY)
+
+    sites = []
+    seen = {}
+    for item in module.params.get("sites"):
+        site = dict(item)
+        site["location"] = deleteNone(dict(site.get("location") or {}))
+        for kind in ("static_ip", "vpn_credential"):
+            if site.get(kind) is not None:
+                site[kind] = dict(site[kind])
+        validate_site(site)
+        keys = [("name", site["name"])]
+        if site.get("static_ip") is not None:
+            keys.append(("static IP", site["static_ip"]["ip_address"]))
+        if site.get("vpn_credential") is not None:
+            keys.append(("VPN credential", credential_name(site["vpn_credential"])))
+        for key in keys:
+            if key in seen:
+                module.fail_json(
+                    msg="Sites %s and %s have the same %s %s"
+                    % (seen[key], site["name"], key[0], key[1])
+                )
+            seen[key] = site["name"]
+        sites.append(site)
+
+    client = ZIAClientHelper(module)
+    resources = sorted(
+        set(
+            resource
+            for site in sites
+            for kind, resource in SITE_OBJECTS
+            if site.get(kind) is not None
+        )
+    )
+    indexes = load_indexes(client, resources)
+    # The internal ranges of the new numbered tunnels come from one listing
+    new_numbered_tunnels = [
+        site
+        for site in sites
+        if site["state"] == "present"
+        and site.get("gre_tunnel") is not None
+        and site["gre_tunnel"].get("ip_unnumbered") is False
+        and not site["gre_tunnel"].get("internal_ip_range")
+        and indexes["gre_tunnels"].get("source_ip", site["static_ip"]["ip_address"])
+        is None
+    ]
+    onboarding = SiteOnboarding(
+        client,
+        indexes,
+        module.check_mode,
+        gre_ranges=GREInternalRanges(client, count=len(new_numbered_tunnels)),
+    )
+
+    tasks = {}
+    dependencies = {}
+    for site in sites:
+        for kind, requires in site_dependencies(site).items():
+            key = (site["name"], kind)
+            tasks[key] = lambda site=site, kind=kind: onboarding.run(site, kind)
+            dependencies[key] = [(site["name"], dependency) for dependency in requires]
+    outcomes = run_graph(tasks, dependencies, concurrency)
+
+    changed = False
+    failed = 0
+    report = []
+    for site in sites:
+        entry = dict(name=site["name"])
+        for kind, unused in SITE_OBJECTS:
+            outcome = outcomes.get((site["name"], kind))
+            if outcome is None:
+                continue
+            if outcome["status"] in (FAILED, SKIPPED):
+                entry["failed"] = True
+                entry[kind] = {outcome["status"]: True, "msg": outcome["msg"]}
+                continue
+            entry[kind] = outcome["result"]
+            if outcome["result"]["action"] != "unchanged":
+                changed = True
+        if entry.get("failed"):
+            failed += 1
+        report.append(entry)
+
+    if failed:
+        module.fail_json(
+            msg="%d of the %d sites failed" % (failed, len(sites)),
+            changed=changed,
+            sites=report,
+        )
+    module.exit_json(changed=changed, sites=report)
+
+
+def main():
+    argument_spec = ZIAClientHelper.zia_argument_spec()
+    static_ip_spec = dict(
+        ip_address=dict(type="str", required=True),
+        comment=dict(type="str", required=False),
+        geo_override=dict(type="bool", required=False),
+        latitude=dict(type="float", required=False),
+        longitude=dict(type="float", required=False),
+        routable_ip=dict(type="bool", required=False),
+    )
+    vpn_credential_spec = dict(
+        type=dict(type="str", required=False, default="UFQDN", choices=["UFQDN", "IP"]),
+        fqdn=dict(type="str", required=False),
+        ip_address=dict(type="str", required=False),
+        pre_shared_key=dict(type="str", required=False, no_log=True),
+        update_psk=dict(type="bool", required=False, default=False),
+        comments=dict(type="str", required=False),
+    )
+    gre_tunnel_spec = dict(
+        comment=dict(type="str", required=False),
+        internal_ip_range=dict(type="str", required=False),
+        within_country=dict(type="bool", required=False),
+        ip_unnumbered=dict(type="bool", required=False),
+        sub_cloud=dict(type="str", required=False),
+        primary_dest_vip_id=dict(type="str", required=False),
+        secondary_dest_vip_id=dict(type="str", required=False),
+    )
+    location_spec = dict(
+        description=dict(type="str", required=False),
+        country=dict(type="str", required=False),
+        tz=dict(type="str", required=False),
+        profile=dict(
+            type="str",
+            required=False,
+            choices=["NONE", "CORPORATE", "SERVER", "GUESTWIFI", "IOT"],
+        ),
+        up_bandwidth=dict(type="int", required=False),
+        dn_bandwidth=dict(type="int", required=False),
+        ip_addresses=dict(type="list", elements="str", required=False),
+        ports=dict(type="list", elements="int", required=False),
+        auth_required=dict(type="bool", required=False),
+        ssl_scan_enabled=dict(type="bool", required=False),
+        zapp_ssl_scan_enabled=dict(type="bool", required=False),
+        xff_forward_enabled=dict(type="bool", required=False),
+        surrogate_ip=dict(type="bool", required=False),
+        idle_time_in_minutes=dict(type="int", required=False),
+        display_time_unit=dict(
+            type="str", required=False, choices=["MINUTE", "HOUR", "DAY"]
+        ),
+        ofw_enabled=dict(type="bool", required=False),
+        ips_control=dict(type="bool", required=False),
+        aup_enabled=dict(type="bool", required=False),
+        caution_enabled=dict(type="bool", required=False),
+        aup_timeout_in_days=dict(type="int", required=False),
+        iot_discovery_enabled=dict(type="bool", required=False),
+    )
+    site_spec = dict(
+        name=dict(type="str", required=True),
+        state=dict(type="str", choices=["present", "absent"], default="present"),
+        static_ip=dict(type="dict", required=False, options=static_ip_spec),
+        vpn_credential=dict(type="dict", required=False, options=vpn_credential_spec),
+        gre_tunnel=dict(type="dict", required=False, options=gre_tunnel_spec),
+        location=dict(type="dict", required=False, options=location_spec),
+    )
+    argument_spec.update(
+        sites=dict(type="list", elements="dict", required=True, options=site_spec),
+        concurrency=dict(type="int", required=False, default=4),
+    )
+    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+
+    try:
+        core(module)
+    except Exception as e:
+        module.fail_json(msg=to_native(e), exception=format_exc())
+
+
+if __name__ == "__main__":
+    main()
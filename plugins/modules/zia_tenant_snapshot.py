@@ -0,0 +1,278 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                             MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: zia_tenant_snapshot
+short_description: "Takes a snapshot of the configuration of a ZIA tenant."
+description:
+  - Lists the rules, URL categories, groups, locations and other collections of the tenant once
+    and stores them on the host running the modules, in the directory set by the C(ZIA_CACHE_DIR)
+    environment variable, as one compressed JSON lines file per collection and an index file.
+  - When the C(ZIA_SNAPSHOT) environment variable is C(true), the following tasks and playbooks read
+    these collections from the snapshot instead of the API, in the info modules, the lookups of
+    existing objects by name of the resource modules and the C(zscaler.ziacloud.zia_id) lookup plugin.
+  - A snapshot is only used while it is younger than C(max_age) and no module of the collection
+    changed or activated the configuration of the tenant since it was taken. Changes made outside
+    of the collection are only visible once it is older than C(max_age).
+author:
+  - William Guilherme (@willguibr)
+version_added: "1.4.0"
+requirements:
+    - Zscaler SDK Python can be obtained from PyPI U(https://pypi.org/project/zscaler-sdk-python/)
+notes:
+    - Check mode is supported.
+    - Cloud App Control rules, which are listed per rule type, are not part of the snapshot.
+extends_documentation_fragment:
+  - zscaler.ziacloud.fragments.provider
+  - zscaler.ziacloud.fragments.documentation
+
+options:
+  state:
+    description:
+      - With C(present) a snapshot is taken unless there is a usable one holding all the C(resources).
+      - With C(absent) the snapshot of the tenant is removed.
+    type: str
+    default: present
+    choices: ["present", "absent"]
+  resources:
+    description:
+      - The collections stored in the snapshot. All of them by default.
+    type: list
+    elements: str
+    required: false
+    choices:
+      - departments
+      - dlp_dictionaries
+      - dlp_engines
+      - dlp_notification_templates
+      - dlp_web_rules
+      - firewall_rules
+      - forwarding_control_rules
+      - gre_tunnels
+      - groups
+      - ip_destination_groups
+      - ip_source_groups
+      - location_groups
+      - locations
+      - network_app_groups
+      - network_service_groups
+      - network_services
+      - rule_labels
+      - static_ips
+      - time_windows
+      - url_categories
+      - url_filtering_rules
+      - vpn_credentials
+      - zpa_gateways
+  max_age:
+    description:
+      - Number of seconds the snapshot can be used for.
+    type: int
+    required: false
+    default: 3600
+  force:
+    description:
+      - Takes a new snapshot even if the current one is usable.
+    type: bool
+    required: false
+    default: false
+  concurrency:
+    description:
+      - Maximum number of collections listed in parallel.
+      - Requests are delayed when the API reports that the rate limit is reached.
+    type: int
+    required: false
+    default: 4
+"""
+
+EXAMPLES = r"""
+# First playbook of the run
+- name: Take a snapshot of the tenant for the following playbooks
+  zscaler.ziacloud.zia_tenant_snapshot:
+    provider: '{{ provider }}'
+    max_age: 1800
+
+# Following playbooks, run with ZIA_SNAPSHOT=true
+- name: Gather the URL Filtering rules from the snapshot
+  zscaler.ziacloud.zia_url_filtering_rule_info:
+    provider: '{{ provider }}'
+
+- name: Snapshot only the rules and the objects they reference
+  zscaler.ziacloud.zia_tenant_snapshot:
+    provider: '{{ provider }}'
+    resources:
+      - firewall_rules
+      - url_filtering_rules
+      - locations
+      - groups
+      - departments
+
+- name: Remove the snapshot
+  zscaler.ziacloud.zia_tenant_snapshot:
+    provider: '{{ provider }}'
+    state: absent
+"""
+
+RETURN = r"""
+snapshot:
+  description: The snapshot of the tenant.
+  returned: when state is present
+  type: dict
+  contains:
+    path:
+      description: Directory of the snapshot.
+      type: str
+      sample: /home/user/.ansible/tmp/zia/snapshot-4f3c0b8e6d0a2b1c9e7f5a3d1b0c8e6f
+    serial:
+      description: Number incremented by every snapshot of the tenant.
+      type: int
+      sample: 3
+    created:
+      description: Time the snapshot was taken, in seconds since the epoch.
+      type: float
+      sample: 1735725600.0
+    max_age:
+      description: Number of seconds the snapshot can be used for.
+      type: int
+      sample: 3600
+    resources:
+      description: Number of objects stored for each collection.
+      type: dict
+      sample: {"locations": 120, "url_filtering_rules": 85}
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from traceback import format_exc
+
+from ansible.module_utils._text import to_native
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
+    ZIAClientHelper,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    RESOURCES,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_pagination import (
+    MAX_CONCURRENCY,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_snapshot import (
+    ZIASnapshot,
+)
+
+# Collections that are not partitioned by a type
+SNAPSHOT_RESOURCES = sorted(
+    resource
+    for resource, (collection, unused_list, unused_keys) in RESOURCES.items()
+    if "{scope}" not in collection
+)
+
+
+def list_resource(client, resource):
+    collection, list_function, unused_keys = RESOURCES[resource]
+    result = list_function(client, None)
+    if not isinstance(result, list):
+        raise Exception(
+            "Failed to list %s: %s" % (resource, getattr(result, "status_code", result))
+        )
+    items = result.to_list() if hasattr(result, "to_list") else list(result)
+    return collection, items
+
+
+def snapshot_result(snapshot, resources):
+    index = snapshot.index()
+    collections = index["collections"]
+    return dict(
+        path=snapshot.path,
+        serial=index["serial"],
+        created=index["created"],
+        max_age=index["max_age"],
+        resources=dict(
+            (resource, collections[RESOURCES[resource][0]]["count"])
+            for resource in resources
+            if RESOURCES[resource][0] in collections
+        ),
+    )
+
+
+def core(module):
+    state = module.params.get("state")
+    resources = module.params.get("resources") or SNAPSHOT_RESOURCES
+    concurrency = module.params.get("concurrency")
+    if not 1 <= concurrency <= MAX_CONCURRENCY:
+        module.fail_json(msg="concurrency must be between 1 and %d" % MAX_CONCURRENCY)
+    client = ZIAClientHelper(module)
+    snapshot = ZIASnapshot.for_client(client)
+
+    if state == "absent":
+        existed = snapshot.index() is not None
+        if existed and not module.check_mode:
+            snapshot.delete()
+        module.exit_json(changed=existed)
+
+    if not module.params.get("force") and snapshot.fresh():
+        collections = snapshot.index()["collections"]
+        if all(RESOURCES[resource][0] in collections for resource in resources):
+            module.exit_json(
+                changed=False, snapshot=snapshot_result(snapshot, resources)
+            )
+    if module.check_mode:
+        module.exit_json(changed=True)
+
+    # The list functions call the API, not the snapshot being replaced
+    created = time.time()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        listed = dict(
+            pool.map(lambda resource: list_resource(client, resource), resources)
+        )
+    snapshot.write(listed, created, module.params.get("max_age"))
+    module.exit_json(changed=True, snapshot=snapshot_result(snapshot, resources))
+
+
+def main():
+    argument_spec = ZIAClientHelper.zia_argument_spec()
+    argument_spec.update(
+        state=dict(type="str", choices=["present", "absent"], default="present"),
+        resources=dict(
+            type="list", elements="str", required=False, choices=SNAPSHOT_RESOURCES
+        ),
+        max_age=dict(type="int", required=False, default=3600),
+        force=dict(type="bool", required=False, default=False),
+        concurrency=dict(type="int", required=False, default=4),
+    )
+    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+
+    try:
+        core(module)
+    except Exception as e:
+        module.fail_json(msg=to_native(e), exception=format_exc())
+
+
+if __name__ == "__main__":
+    main()
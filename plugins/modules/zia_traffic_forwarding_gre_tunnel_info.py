@@ -214,6 +214,9 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
 
 
 def core(module):
@@ -225,7 +228,7 @@ def core(module):
         gre_tunnel = client.traffic.get_gre_tunnel(tunnel_id).to_dict()
         gre_tunnels = [gre_tunnel]
     else:
-        all_gre_tunnels = client.traffic.list_gre_tunnels().to_list()
+        all_gre_tunnels = ZIAResourceIndex(client, "gre_tunnels").values()
         if source_ip is not None:
             gre_tunnel = next(
                 (
@@ -76,12 +76,16 @@ options:
     required: false
     type: str
   primary_dest_vip_id:
-    description: "The primary destination data center and virtual IP address (VIP) of the GRE tunnel"
+    description:
+      - "The primary destination data center and virtual IP address (VIP) of the GRE tunnel"
+      - Defaults to the VIP of the existing tunnel, or to the closest VIP for a new tunnel.
     type: list
     elements: str
     required: false
   secondary_dest_vip_id:
-    description: "The secondary destination data center and virtual IP address (VIP) of the GRE tunnel"
+    description:
+      - "The secondary destination data center and virtual IP address (VIP) of the GRE tunnel"
+      - Defaults to the VIP of the existing tunnel, or to the closest VIP in another city for a new tunnel.
     type: list
     elements: str
     required: false
@@ -126,6 +130,16 @@ from ansible_collections.zscaler.ziacloud.plugins.module_utils.utils import (
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_gre import (
+    GREInternalRanges,
+    closest_diverse_vips,
+    tunnel_vips,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
+
+VIP_KEYS = ("primary_dest_vip_id", "secondary_dest_vip_id")
 
 
 def normalize_gre_tunnel(gre):
@@ -162,51 +176,23 @@ def core(module):
         "within_country",
         "ip_unnumbered",
         "sub_cloud",
-        # "primary_dest_vip_id",
-        # "secondary_dest_vip_id",
+        "primary_dest_vip_id",
+        "secondary_dest_vip_id",
     ]
     for param_name in params:
         gre_tunnel[param_name] = module.params.get(param_name, None)
 
-    # Automatically set primary and secondary VIP IDs if not provided
-    if not gre_tunnel.get("primary_dest_vip_id") or not gre_tunnel.get(
-        "secondary_dest_vip_id"
-    ):
-        if gre_tunnel.get("source_ip"):
-            closest_vips = client.traffic.get_closest_diverse_vip_ids(
-                gre_tunnel["source_ip"]
-            )
-            gre_tunnel["primary_dest_vip_id"] = [closest_vips[0]]
-            gre_tunnel["secondary_dest_vip_id"] = [closest_vips[1]]
-        else:
-            module.fail_json(msg="source_ip is required to determine closest VIPs.")
-
-    # Check if ip_unnumbered is False and internal_ip_range is not set
-    if gre_tunnel.get("ip_unnumbered") is False and not gre_tunnel.get(
-        "internal_ip_range"
-    ):
-        # Fetch the first available IP range
-        available_ranges = client.traffic.list_gre_ranges(limit=1).to_list()
-        if available_ranges:
-            first_range = available_ranges[0]
-            gre_tunnel["internal_ip_range"] = (
-                f"{first_range['start_ip_address']}-{first_range['end_ip_address']}"
-            )
-        else:
-            module.fail_json(msg="No available IP ranges found.")
-
     tunnel_id = gre_tunnel.get("id", None)
     source_ip = gre_tunnel.get("source_ip", None)
+    if not source_ip:
+        module.fail_json(msg="source_ip is required to determine closest VIPs.")
     existing_gre_tunnel = None
     if tunnel_id is not None:
         existing_gre_tunnel = client.traffic.get_gre_tunnel(tunnel_id).to_dict()
     else:
-        source_ips = client.traffic.list_gre_tunnels().to_list()
-        if source_ip is not None:
-            for ip in source_ips:
-                if ip.get("source_ip", None) == source_ip:
-                    existing_gre_tunnel = ip
-                    break
+        existing_gre_tunnel = ZIAResourceIndex(client, "gre_tunnels").get(
+            "source_ip", source_ip
+        )
 
     # Normalize and compare existing and desired data
     desired_gre = normalize_gre_tunnel(gre_tunnel)
@@ -223,6 +209,15 @@ def core(module):
             #     f"Difference detected in {key}. Current: {current_gre.get(key)}, Desired: {value}"
             # )
 
+    # The API returns the VIPs as references, compare their IDs
+    current_vips = None
+    if existing_gre_tunnel is not None:
+        current_vips = tunnel_vips(existing_gre_tunnel)
+        for key, current_vip in zip(VIP_KEYS, current_vips or (None, None)):
+            desired_vip = gre_tunnel.get(key)
+            if desired_vip and desired_vip[0] != str(current_vip):
+                differences_detected = True
+
     if module.check_mode:
         # If in check mode, report changes and exit
         if state == "present" and (existing_gre_tunnel is None or differences_detected):
@@ -232,6 +227,29 @@ def core(module):
         else:
             module.exit_json(changed=False)
 
+    if state == "present" and (existing_gre_tunnel is None or differences_detected):
+        # An existing tunnel keeps its VIPs and internal range, so the
+        # recommendations and the available ranges are only fetched for
+        # new tunnels
+        vips = current_vips
+        if vips is None and not all(gre_tunnel.get(key) for key in VIP_KEYS):
+            vips = closest_diverse_vips(client, source_ip)
+        for key, vip in zip(VIP_KEYS, vips or (None, None)):
+            if not gre_tunnel.get(key):
+                gre_tunnel[key] = [vip]
+
+        if gre_tunnel.get("ip_unnumbered") is False and not gre_tunnel.get(
+            "internal_ip_range"
+        ):
+            if existing_gre_tunnel is not None and existing_gre_tunnel.get(
+                "internal_ip_range"
+            ):
+                gre_tunnel["internal_ip_range"] = existing_gre_tunnel[
+                    "internal_ip_range"
+                ]
+            else:
+                gre_tunnel["internal_ip_range"] = GREInternalRanges(client).allocate()
+
     if existing_gre_tunnel is not None:
         id = existing_gre_tunnel.get("id")
         existing_gre_tunnel.update(desired_gre)
@@ -0,0 +1,372 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                             MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: zia_traffic_forwarding_gre_tunnels_bulk
+short_description: "Reconciles a list of GRE tunnels."
+description:
+  - Reconciles a whole list of GRE tunnels in one task, such as the tunnels of hundreds of branch offices.
+  - The GRE tunnels are listed once, the differences of every tunnel are computed in memory,
+    and only the create, update and delete calls that are needed are sent.
+  - Existing tunnels keep their virtual IP addresses (VIPs) and internal range. The VIP recommendations of the
+    new tunnels are cached per source IP, and their internal ranges are allocated from a single listing of the
+    available ranges, so that no two tunnels get the same range.
+author:
+  - William Guilherme (@willguibr)
+version_added: "1.4.0"
+requirements:
+    - Zscaler SDK Python can be obtained from PyPI U(https://pypi.org/project/zscaler-sdk-python/)
+notes:
+    - Check mode is supported.
+extends_documentation_fragment:
+  - zscaler.ziacloud.fragments.provider
+  - zscaler.ziacloud.fragments.documentation
+
+options:
+  purge:
+    description:
+      - When set to true, GRE tunnels that are not listed in C(tunnels) are deleted.
+    required: false
+    type: bool
+    default: false
+  tunnels:
+    description:
+      - List of the desired GRE tunnels.
+      - Tunnels are matched with the existing tunnels by C(id) if set, otherwise by C(source_ip).
+    required: true
+    type: list
+    elements: dict
+    suboptions:
+      state:
+        description:
+          - Whether the GRE tunnel should exist or not.
+        type: str
+        choices:
+          - present
+          - absent
+        default: present
+      id:
+        description: ID of the GRE tunnel
+        required: false
+        type: int
+      source_ip:
+        description:
+          - The source IP address of the GRE tunnel.
+          - This is typically a static IP address in the organization or SD-WAN.
+        required: true
+        type: str
+      comment:
+        description: Additional information about this GRE tunnel
+        required: false
+        type: str
+      internal_ip_range:
+        description:
+          - The start of the internal IP address in /29 CIDR range.
+          - An available range is allocated to a new numbered tunnel when it is not set.
+        required: false
+        type: str
+      within_country:
+        description: Restrict the data center virtual IP addresses (VIPs) only to those within the same country as the source IP address
+        required: false
+        type: bool
+      ip_unnumbered:
+        description: "This is required to support the automated SD-WAN provisioning of GRE tunnels"
+        required: false
+        type: bool
+      sub_cloud:
+        description: Restrict the data center virtual IP addresses (VIPs) only to those part of the subcloud
+        required: false
+        type: str
+      primary_dest_vip_id:
+        description:
+          - ID of the primary destination virtual IP address (VIP) of the GRE tunnel.
+          - Defaults to the closest VIP for a new tunnel.
+        required: false
+        type: str
+      secondary_dest_vip_id:
+        description:
+          - ID of the secondary destination virtual IP address (VIP) of the GRE tunnel.
+          - Defaults to the closest VIP in another city for a new tunnel.
+        required: false
+        type: str
+"""
+
+EXAMPLES = r"""
+- name: Reconcile the GRE tunnels of the branch offices
+  zscaler.ziacloud.zia_traffic_forwarding_gre_tunnels_bulk:
+    provider: '{{ provider }}'
+    tunnels:
+      - source_ip: "203.0.113.10"
+        comment: "Branch 001"
+        ip_unnumbered: false
+      - source_ip: "203.0.113.11"
+        comment: "Branch 002"
+        ip_unnumbered: true
+      - source_ip: "203.0.113.12"
+        state: absent
+
+- name: Reconcile the GRE tunnels and delete any other tunnel
+  zscaler.ziacloud.zia_traffic_forwarding_gre_tunnels_bulk:
+    provider: '{{ provider }}'
+    purge: true
+    tunnels: "{{ branch_gre_tunnels }}"
+"""
+
+RETURN = r"""
+results:
+  description: One entry per GRE tunnel that was compared, created, updated or deleted.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    name:
+      description: Source IP address of the GRE tunnel.
+      type: str
+      sample: 203.0.113.10
+    id:
+      description: ID of the GRE tunnel, null for a tunnel created in check mode.
+      type: int
+      sample: 1203256
+    action:
+      description: Change applied to the GRE tunnel.
+      type: str
+      sample: update
+      choices: [create, update, delete, unchanged]
+    changed_fields:
+      description: Attributes that differ from the existing GRE tunnel.
+      type: list
+      elements: str
+      sample: ["comment"]
+    failed:
+      description: Set when the API call of this GRE tunnel failed.
+      type: bool
+      returned: on failure
+    msg:
+      description: Error returned by the API call of this GRE tunnel.
+      type: str
+      returned: on failure
+"""
+
+from traceback import format_exc
+
+from ansible.module_utils._text import to_native
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.utils import (
+    deleteNone,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_bulk import (
+    CREATE,
+    UPDATE,
+    apply_changes,
+    plan_changes,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
+    ZIAClientHelper,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_gre import (
+    GREInternalRanges,
+    recommend_vips,
+    tunnel_vips,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
+
+GRE_TUNNEL_PARAMS = [
+    "id",
+    "source_ip",
+    "comment",
+    "internal_ip_range",
+    "within_country",
+    "ip_unnumbered",
+    "sub_cloud",
+    "primary_dest_vip_id",
+    "secondary_dest_vip_id",
+]
+
+# Attributes sent again on update, the API replaces the whole tunnel
+GRE_TUNNEL_ATTRIBUTES = (
+    "comment",
+    "internal_ip_range",
+    "within_country",
+    "ip_unnumbered",
+    "sub_cloud",
+)
+
+
+def tunnel_source_ip(tunnel):
+    return tunnel.get("source_ip")
+
+
+def tunnel_differences(tunnel, existing_tunnel):
+    """Returns the attributes of a GRE tunnel that need to be updated."""
+    differences = [
+        key
+        for key in GRE_TUNNEL_ATTRIBUTES
+        if tunnel.get(key) is not None and tunnel.get(key) != existing_tunnel.get(key)
+    ]
+    current_vips = tunnel_vips(existing_tunnel) or (None, None)
+    for key, current_vip in zip(
+        ("primary_dest_vip_id", "secondary_dest_vip_id"), current_vips
+    ):
+        if tunnel.get(key) is not None and tunnel.get(key) != str(current_vip):
+            differences.append(key)
+    return differences
+
+
+def needs_internal_range(tunnel, existing_tunnel=None):
+    """Whether a numbered tunnel has no internal range yet."""
+    if existing_tunnel is not None and existing_tunnel.get("internal_ip_range"):
+        return False
+    return tunnel.get("ip_unnumbered") is False and not tunnel.get("internal_ip_range")
+
+
+def core(module):
+    client = ZIAClientHelper(module)
+    purge = module.params.get("purge")
+
+    desired_tunnels = []
+    for item in module.params.get("tunnels"):
+        tunnel = dict()
+        for param_name in GRE_TUNNEL_PARAMS:
+            tunnel[param_name] = item.get(param_name, None)
+        tunnel["state"] = item.get("state")
+        desired_tunnels.append(tunnel)
+
+    tunnels_index = ZIAResourceIndex(client, "gre_tunnels")
+    changes = plan_changes(
+        desired_tunnels,
+        tunnels_index,
+        tunnel_differences,
+        purge=purge,
+        name_of=tunnel_source_ip,
+    )
+
+    # The VIPs are only needed by the new tunnels, and the internal ranges
+    # come from one listing so that every tunnel gets its own
+    new_tunnels = [
+        change["desired"] for change in changes if change["action"] == CREATE
+    ]
+    numbered_tunnels = [
+        change
+        for change in changes
+        if change["action"] in (CREATE, UPDATE)
+        and needs_internal_range(change["desired"], change["current"])
+    ]
+    vips = {}
+    internal_ranges = GREInternalRanges(client, count=len(numbered_tunnels))
+    if not module.check_mode:
+        vips = recommend_vips(
+            client,
+            [
+                tunnel["source_ip"]
+                for tunnel in new_tunnels
+                if not tunnel.get("primary_dest_vip_id")
+                or not tunnel.get("secondary_dest_vip_id")
+            ],
+        )
+
+    def create(tunnel):
+        payload = dict(tunnel)
+        payload.pop("id")
+        payload.pop("state")
+        recommended = vips.get(tunnel["source_ip"])
+        if recommended is not None:
+            payload["primary_dest_vip_id"] = (
+                tunnel.get("primary_dest_vip_id") or recommended[0]
+            )
+            payload["secondary_dest_vip_id"] = (
+                tunnel.get("secondary_dest_vip_id") or recommended[1]
+            )
+        if needs_internal_range(tunnel):
+            payload["internal_ip_range"] = internal_ranges.allocate()
+        return client.traffic.add_gre_tunnel(**deleteNone(payload))
+
+    def update(tunnel, existing_tunnel):
+        current_vips = tunnel_vips(existing_tunnel) or (None, None)
+        payload = dict((key, existing_tunnel.get(key)) for key in GRE_TUNNEL_ATTRIBUTES)
+        payload.update(
+            (key, tunnel[key])
+            for key in GRE_TUNNEL_ATTRIBUTES
+            if tunnel.get(key) is not None
+        )
+        if needs_internal_range(tunnel, existing_tunnel):
+            payload["internal_ip_range"] = internal_ranges.allocate()
+        return client.traffic.update_gre_tunnel(
+            tunnel_id=existing_tunnel.get("id"),
+            source_ip=existing_tunnel.get("source_ip"),
+            primary_dest_vip_id=tunnel.get("primary_dest_vip_id") or current_vips[0],
+            secondary_dest_vip_id=(
+                tunnel.get("secondary_dest_vip_id") or current_vips[1]
+            ),
+            **deleteNone(payload),
+        )
+
+    def delete(existing_tunnel):
+        code = client.traffic.delete_gre_tunnel(tunnel_id=existing_tunnel.get("id"))
+        if code > 299:
+            raise Exception("Failed to delete the GRE tunnel, status code %s" % code)
+
+    changed, report, failed = apply_changes(module, changes, create, update, delete)
+    if failed:
+        module.fail_json(
+            msg="%d of the GRE tunnel changes failed" % failed,
+            changed=changed,
+            results=report,
+        )
+    module.exit_json(changed=changed, results=report)
+
+
+def main():
+    argument_spec = ZIAClientHelper.zia_argument_spec()
+    tunnel_spec = dict(
+        state=dict(type="str", choices=["present", "absent"], default="present"),
+        id=dict(type="int", required=False),
+        source_ip=dict(type="str", required=True),
+        comment=dict(type="str", required=False),
+        internal_ip_range=dict(type="str", required=False),
+        within_country=dict(type="bool", required=False),
+        ip_unnumbered=dict(type="bool", required=False),
+        sub_cloud=dict(type="str", required=False),
+        primary_dest_vip_id=dict(type="str", required=False),
+        secondary_dest_vip_id=dict(type="str", required=False),
+    )
+    argument_spec.update(
+        purge=dict(type="bool", required=False, default=False),
+        tunnels=dict(type="list", elements="dict", required=True, options=tunnel_spec),
+    )
+    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+
+    try:
+        core(module)
+    except Exception as e:
+        module.fail_json(msg=to_native(e), exception=format_exc())
+
+
+if __name__ == "__main__":
+    main()
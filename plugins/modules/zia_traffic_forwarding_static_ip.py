@@ -114,6 +114,9 @@ from ansible_collections.zscaler.ziacloud.plugins.module_utils.utils import (
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
 
 
 def normalize_static_ip(static):
@@ -169,13 +172,10 @@ def core(module):
     existing_static_ip = None
     if static_ip_id is not None:
         existing_static_ip = client.traffic.get_static_ip(static_ip_id).to_dict()
-    else:
-        static_ips = client.traffic.list_static_ips().to_list()
-        if ip_address is not None:
-            for ip in static_ips:
-                if ip.get("ip_address", None) == ip_address:
-                    existing_static_ip = ip
-                    break
+    elif ip_address is not None:
+        existing_static_ip = ZIAResourceIndex(client, "static_ips").get(
+            "ip_address", ip_address
+        )
 
     # Normalize and compare existing and desired application data
     desired_static_ip = normalize_static_ip(static_ip)
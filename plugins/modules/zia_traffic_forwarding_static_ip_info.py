@@ -41,6 +41,7 @@ notes:
 extends_documentation_fragment:
   - zscaler.ziacloud.fragments.provider
   - zscaler.ziacloud.fragments.documentation
+  - zscaler.ziacloud.fragments.paging
 
 options:
   ip_address:
@@ -68,6 +69,12 @@ EXAMPLES = r"""
   zscaler.ziacloud.zia_traffic_forwarding_static_ip_info:
     provider: '{{ provider }}'
     id: 82709
+
+- name: Retrieve Details of All Static IPs, fetching 8 pages in parallel.
+  zscaler.ziacloud.zia_traffic_forwarding_static_ip_info:
+    provider: '{{ provider }}'
+    page_size: 500
+    concurrency: 8
 """
 
 RETURN = r"""
@@ -152,9 +159,16 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_pagination import (
+    check_paging_params,
+    find_first,
+    list_items,
+    paging_argument_spec,
+)
 
 
 def core(module):
+    check_paging_params(module)
     static_ip_id = module.params.get("id", None)
     ip_address = module.params.get("ip_address", None)
     client = ZIAClientHelper(module)
@@ -162,19 +176,28 @@ def core(module):
     if static_ip_id is not None:
         static_ip = client.traffic.get_static_ip(static_ip_id).to_dict()
         static_ips = [static_ip]
+    elif ip_address is not None:
+        # The API filter is a partial match, stop at the exact one
+        static_ip = find_first(
+            client,
+            "staticIP",
+            lambda ip: ip.get("ip_address", None) == ip_address,
+            params=dict(ipAddress=ip_address),
+            page_size=module.params.get("page_size"),
+        )
+        if static_ip is None:
+            module.fail_json(
+                msg="Failed to retrieve static ip address: '%s'" % (ip_address)
+            )
+        static_ips = [static_ip]
     else:
-        static_ips = client.traffic.list_static_ips().to_list()
-        if ip_address is not None:
-            static_ip = None
-            for ip in static_ips:
-                if ip.get("ip_address", None) == ip_address:
-                    static_ip = ip
-                    break
-            if static_ip is None:
-                module.fail_json(
-                    msg="Failed to retrieve static ip address: '%s'" % (ip_address)
-                )
-            static_ips = [static_ip]
+        static_ips = list_items(
+            client,
+            "staticIP",
+            page_size=module.params.get("page_size"),
+            max_results=module.params.get("max_results"),
+            concurrency=module.params.get("concurrency"),
+        )
     module.exit_json(changed=False, static_ips=static_ips)
 
 
@@ -183,6 +206,7 @@ def main():
     argument_spec.update(
         ip_address=dict(type="str", required=False),
         id=dict(type="int", required=False),
+        **paging_argument_spec()
     )
     module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
     try:
@@ -114,12 +114,16 @@ from traceback import format_exc
 
 from ansible.module_utils._text import to_native
 from ansible.module_utils.basic import AnsibleModule
-from ansible_collections.zscaler.ziacloud.plugins.module_utils.utils import (
-    deleteNone,
-)
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_vpn_credentials import (
+    VPN_CREDENTIAL_PARAMS,
+    create_payload,
+    find_vpn_credential,
+    update_vpn_credential,
+    validate_vpn_credential_type,
+)
 
 
 def normalize_vpn_creds(vpn, exclude_keys=None):
@@ -136,36 +140,11 @@ def normalize_vpn_creds(vpn, exclude_keys=None):
     return normalized
 
 
-def validate_vpn_credential_type(vpn_credentials):
-    """
-    Validate the VPN credential type and ensure required attributes are provided.
-    """
-    vpn_type = vpn_credentials.get("type")
-    ip_address = vpn_credentials.get("ip_address")
-    fqdn = vpn_credentials.get("fqdn")
-
-    if vpn_type == "IP" and not ip_address:
-        raise ValueError(
-            "Invalid input argument, ip_address is required for VPN credentials of type 'IP'."
-        )
-    if vpn_type == "UFQDN" and not fqdn:
-        raise ValueError(
-            "Invalid input argument, fqdn attribute is required for VPN credentials of type 'UFQDN'."
-        )
-
-
 def core(module):
     client = ZIAClientHelper(module)
     state = module.params.get("state", None)
     vpn_credentials = dict()
-    params = [
-        "id",
-        "type",
-        "fqdn",
-        "ip_address",
-        "pre_shared_key",
-        "comments",
-    ]
+    params = VPN_CREDENTIAL_PARAMS
     for param_name in params:
         vpn_credentials[param_name] = module.params.get(param_name, None)
 
@@ -174,33 +153,12 @@ def core(module):
 
     update_psk_flag = module.params.get("update_psk", False)
 
-    existing_vpn_credentials = None
-    vpn_id = module.params.get("id", None)
-    fqdn = module.params.get("fqdn", None)
-    ip_address = module.params.get("ip_address", None)
-
-    if vpn_id is not None or fqdn is not None or ip_address is not None:
-        # Try to find the VPN credential by ID or FQDN
-        vpn_box = (
-            client.traffic.get_vpn_credential(credential_id=vpn_id)
-            if vpn_id
-            else client.traffic.get_vpn_credential(fqdn=fqdn)
-        )
-        existing_vpn_credentials = vpn_box.to_dict() if vpn_box else None
-
-    if vpn_id is not None or fqdn is not None or ip_address is not None:
-        # If not found, list all VPN credentials and check again
-        all_vpn_credentials = client.traffic.list_vpn_credentials()
-        for vpn_cred in all_vpn_credentials:
-            if vpn_id and vpn_cred.get("id") == vpn_id:
-                existing_vpn_credentials = vpn_cred
-                break
-            if fqdn and vpn_cred.get("fqdn") == fqdn:
-                existing_vpn_credentials = vpn_cred
-                break
-            if ip_address and vpn_cred.get("ip_address") == ip_address:
-                existing_vpn_credentials = vpn_cred
-                break
+    existing_vpn_credentials = find_vpn_credential(
+        client,
+        credential_id=module.params.get("id", None),
+        fqdn=module.params.get("fqdn", None),
+        ip_address=module.params.get("ip_address", None),
+    )
 
     provided_keys = [key for key in params if vpn_credentials.get(key) is not None]
 
@@ -245,8 +203,7 @@ def core(module):
                 if key != "update_psk"
             }
 
-            # Set the credential_id for the update
-            update_payload["credential_id"] = existing_vpn_credentials.get("id")
+            update_payload.pop("id", None)
 
             # Include pre_shared_key in the payload only if update_psk_flag is True
             if update_psk_flag and "pre_shared_key" in vpn_credentials:
@@ -254,9 +211,9 @@ def core(module):
 
             # module.warn(f"Final payload being sent to SDK: {update_payload}")
             if differences_detected:
-                updated_vpn = client.traffic.update_vpn_credential(
-                    **update_payload
-                ).to_dict()
+                updated_vpn = update_vpn_credential(
+                    client, existing_vpn_credentials, **update_payload
+                )
                 module.exit_json(changed=True, data=updated_vpn)
             else:
                 module.exit_json(
@@ -265,15 +222,7 @@ def core(module):
                     msg="No changes detected.",
                 )
         else:
-            create_vpn = deleteNone(
-                {
-                    "authentication_type": vpn_credentials.get("type"),
-                    "fqdn": vpn_credentials.get("fqdn"),
-                    "ip_address": vpn_credentials.get("ip_address"),
-                    "pre_shared_key": vpn_credentials.get("pre_shared_key"),
-                    "comments": vpn_credentials.get("comments"),
-                }
-            )
+            create_vpn = create_payload(vpn_credentials)
             # module.warn("Payload for SDK: {}".format(create_vpn))
             new_vpn = client.traffic.add_vpn_credential(**create_vpn).to_dict()
             module.exit_json(changed=True, data=new_vpn)
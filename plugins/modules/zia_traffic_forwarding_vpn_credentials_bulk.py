@@ -0,0 +1,297 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                             MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: zia_traffic_forwarding_vpn_credentials_bulk
+short_description: "Reconciles a list of VPN credentials."
+description:
+  - Reconciles a whole list of VPN credentials in one task, such as the credentials of hundreds of branch offices.
+  - The VPN credentials are listed once, the differences of every credential are computed in memory,
+    and only the create, update and delete calls that are needed are sent.
+  - Deleted credentials are removed with bulk delete requests.
+author:
+  - William Guilherme (@willguibr)
+version_added: "1.4.0"
+requirements:
+    - Zscaler SDK Python can be obtained from PyPI U(https://pypi.org/project/zscaler-sdk-python/)
+notes:
+    - Check mode is supported.
+extends_documentation_fragment:
+  - zscaler.ziacloud.fragments.provider
+  - zscaler.ziacloud.fragments.documentation
+
+options:
+  purge:
+    description:
+      - When set to true, VPN credentials that are not listed in C(credentials) are deleted.
+    required: false
+    type: bool
+    default: false
+  credentials:
+    description:
+      - List of the desired VPN credentials.
+      - Credentials are matched with the existing credentials by C(id) if set, otherwise by C(fqdn) or C(ip_address).
+    required: true
+    type: list
+    elements: dict
+    suboptions:
+      state:
+        description:
+          - Whether the VPN credential should exist or not.
+        type: str
+        choices:
+          - present
+          - absent
+        default: present
+      id:
+        description:
+          - VPN credential id
+        required: false
+        type: int
+      type:
+        description:
+          - VPN authentication type (i.e., how the VPN credential is sent to the server).
+          - It is not modifiable after VpnCredential is created.
+        required: false
+        type: str
+        choices:
+          - IP
+          - UFQDN
+      fqdn:
+        description: "Fully Qualified Domain Name. Applicable only to UFQDN or XAUTH (or HOSTED_MOBILE_USERS) auth type."
+        required: false
+        type: str
+      ip_address:
+        description:
+          - Static IP address for VPN that is self-provisioned or provisioned by Zscaler.
+          - This is a required field for IP auth type and is not applicable to other auth types.
+        required: false
+        type: str
+      pre_shared_key:
+        description:
+          - This is a required field for UFQDN and IP auth type.
+        required: false
+        type: str
+      update_psk:
+        description:
+          - This is a required when updating the pre_shared_key value.
+        required: false
+        type: bool
+        default: false
+      comments:
+        description:
+          - Additional information about this VPN credential.
+        required: false
+        type: str
+"""
+
+EXAMPLES = r"""
+- name: Reconcile the VPN credentials of the branch offices
+  zscaler.ziacloud.zia_traffic_forwarding_vpn_credentials_bulk:
+    provider: '{{ provider }}'
+    credentials:
+      - type: UFQDN
+        fqdn: "branch-001@acme.com"
+        pre_shared_key: "{{ branch_psk }}"
+        comments: "Branch 001"
+      - type: IP
+        ip_address: "203.0.113.10"
+        pre_shared_key: "{{ branch_psk }}"
+      - fqdn: "branch-legacy@acme.com"
+        state: absent
+
+- name: Reconcile the VPN credentials and delete any other credential
+  zscaler.ziacloud.zia_traffic_forwarding_vpn_credentials_bulk:
+    provider: '{{ provider }}'
+    purge: true
+    credentials: "{{ branch_vpn_credentials }}"
+"""
+
+RETURN = r"""
+results:
+  description: One entry per VPN credential that was compared, created, updated or deleted.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    name:
+      description: FQDN or IP address of the VPN credential.
+      type: str
+      sample: branch-001@acme.com
+    id:
+      description: ID of the VPN credential, null for a credential created in check mode.
+      type: int
+      sample: 1203256
+    action:
+      description: Change applied to the VPN credential.
+      type: str
+      sample: update
+      choices: [create, update, delete, unchanged]
+    changed_fields:
+      description: Attributes that differ from the existing VPN credential.
+      type: list
+      elements: str
+      sample: ["comments"]
+    failed:
+      description: Set when the API call of this VPN credential failed.
+      type: bool
+      returned: on failure
+    msg:
+      description: Error returned by the API call of this VPN credential.
+      type: str
+      returned: on failure
+"""
+
+from traceback import format_exc
+
+from ansible.module_utils._text import to_native
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_bulk import (
+    apply_changes,
+    plan_changes,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
+    ZIAClientHelper,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_vpn_credentials import (
+    VPN_CREDENTIAL_PARAMS,
+    create_payload,
+    credential_name,
+    delete_vpn_credentials,
+    update_vpn_credential,
+    validate_vpn_credential_type,
+)
+
+
+def credential_differences(credential, existing_credential):
+    """Returns the attributes of a VPN credential that need to be updated."""
+    differences = [
+        key
+        for key in ("type", "comments")
+        if credential.get(key) is not None
+        and credential.get(key) != existing_credential.get(key)
+    ]
+    if credential.get("update_psk") and credential.get("pre_shared_key"):
+        differences.append("pre_shared_key")
+    return differences
+
+
+def core(module):
+    client = ZIAClientHelper(module)
+    purge = module.params.get("purge")
+
+    desired_credentials = []
+    for item in module.params.get("credentials"):
+        credential = dict()
+        for param_name in VPN_CREDENTIAL_PARAMS:
+            credential[param_name] = item.get(param_name, None)
+        if not credential_name(credential) and credential.get("id") is None:
+            module.fail_json(
+                msg="Every VPN credential needs an id, an fqdn or an ip_address"
+            )
+        if item.get("state") == "present":
+            validate_vpn_credential_type(credential)
+        credential["update_psk"] = item.get("update_psk")
+        credential["state"] = item.get("state")
+        desired_credentials.append(credential)
+
+    credentials_index = ZIAResourceIndex(client, "vpn_credentials")
+    changes = plan_changes(
+        desired_credentials,
+        credentials_index,
+        credential_differences,
+        purge=purge,
+        name_of=credential_name,
+    )
+
+    def create(credential):
+        return client.traffic.add_vpn_credential(**create_payload(credential))
+
+    def update(credential, existing_credential):
+        return update_vpn_credential(
+            client,
+            existing_credential,
+            comments=credential.get("comments"),
+            pre_shared_key=(
+                credential.get("pre_shared_key")
+                if credential.get("update_psk")
+                else None
+            ),
+        )
+
+    def delete(existing_credential):
+        delete_vpn_credentials(client, [existing_credential.get("id")])
+
+    def delete_many(existing_credentials):
+        delete_vpn_credentials(
+            client, [credential.get("id") for credential in existing_credentials]
+        )
+
+    changed, report, failed = apply_changes(
+        module, changes, create, update, delete, delete_many=delete_many
+    )
+    if failed:
+        module.fail_json(
+            msg="%d of the VPN credential changes failed" % failed,
+            changed=changed,
+            results=report,
+        )
+    module.exit_json(changed=changed, results=report)
+
+
+def main():
+    argument_spec = ZIAClientHelper.zia_argument_spec()
+    credential_spec = dict(
+        state=dict(type="str", choices=["present", "absent"], default="present"),
+        id=dict(type="int", required=False),
+        type=dict(type="str", required=False, choices=["UFQDN", "IP"]),
+        fqdn=dict(type="str", required=False),
+        ip_address=dict(type="str", required=False),
+        pre_shared_key=dict(type="str", required=False, no_log=True),
+        update_psk=dict(type="bool", required=False, default=False),
+        comments=dict(type="str", required=False),
+    )
+    argument_spec.update(
+        purge=dict(type="bool", required=False, default=False),
+        credentials=dict(
+            type="list", elements="dict", required=True, options=credential_spec
+        ),
+    )
+    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+
+    try:
+        core(module)
+    except Exception as e:
+        module.fail_json(msg=to_native(e), exception=format_exc())
+
+
+if __name__ == "__main__":
+    main()
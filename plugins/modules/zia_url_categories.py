@@ -150,6 +150,29 @@ options:
             type: list
             elements: int
             required: false
+  list_update_mode:
+    description:
+        - How changes to C(urls), C(db_categorized_urls), C(keywords), C(keywords_retaining_parent_category),
+          C(ip_ranges) and C(ip_ranges_retaining_parent_category) are sent to an existing category.
+        - C(incremental) computes the added and removed entries and sends only those, in chunks.
+          It is used when no other attribute of the category changes.
+        - C(replace) always sends the whole category.
+        - Lists that are not set are left unchanged in both modes.
+    required: false
+    type: str
+    default: incremental
+    choices:
+        - incremental
+        - replace
+    version_added: "1.4.0"
+  list_chunk_size:
+    description:
+        - Maximum number of list entries sent per API call in C(incremental) mode.
+        - Chunks are also kept under the API payload size limit.
+    required: false
+    type: int
+    default: 1000
+    version_added: "1.4.0"
 """
 
 EXAMPLES = r"""
@@ -194,56 +217,21 @@ from ansible_collections.zscaler.ziacloud.plugins.module_utils.utils import (
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
-
-
-def normalize_url_category(category):
-    """
-    Normalize URL category data by setting computed values and sorting URLs.
-    """
-    normalized = category.copy()
-
-    computed_values = ["id"]
-    for attr in computed_values:
-        normalized.pop(attr, None)
-
-    # Sort URLs for consistent comparison
-    if "urls" in normalized and normalized["urls"] is not None:
-        normalized["urls"] = sorted(normalized["urls"])
-
-    return normalized
-
-
-def preprocess_category(category, params):
-    """
-    Preprocess specific attributes in the category based on their type and structure.
-    :param category: Dict containing the category data.
-    :param params: List of attribute names to be processed.
-    :return: Preprocessed category.
-    """
-    preprocessed = {}
-    for attr in params:
-        if attr in category:
-            value = category[attr]
-
-            # Handling the 'editable' attribute, default to False if not provided
-            if attr == "editable":
-                preprocessed[attr] = True if value is None else value
-
-            # Handle list attributes
-            elif isinstance(value, list):
-                preprocessed[attr] = sorted(value) if value else []
-
-            else:
-                preprocessed[attr] = value
-
-        else:
-            # Assign default values for missing keys
-            if attr == "editable":
-                preprocessed[attr] = False
-            else:
-                preprocessed[attr] = None
-
-    return preprocessed
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_diff import (
+    diff,
+    field_spec,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_schemas import (
+    FIELD_SPECS,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_url_categories import (
+    LIST_FIELDS,
+    apply_list_deltas,
+    category_list_deltas,
+)
 
 
 def core(module):
@@ -276,54 +264,30 @@ def core(module):
         if categoryBox is not None:
             existing_category = categoryBox.to_dict()
     elif category.get("configured_name"):
-        categories = client.url_categories.list_categories().to_list()
-        for category_ in categories:
-            if category_.get("configured_name") == category.get("configured_name"):
-                existing_category = category_
-
-    # Normalize and compare existing and desired data
-    desired_category = normalize_url_category(category)
-    current_category = (
-        normalize_url_category(existing_category) if existing_category else {}
-    )
-
-    existing_category_preprocessed = preprocess_category(current_category, params)
-    desired_category_preprocessed = preprocess_category(desired_category, params)
-
-    # Exclude 'super_category' from the comparison
-    if "super_category" in desired_category_preprocessed:
-        desired_category_preprocessed.pop("super_category")
-    if "super_category" in existing_category_preprocessed:
-        existing_category_preprocessed.pop("super_category")
-
-    # Comparison logic
-    differences_detected = False
-    for key in params:
-        if key == "super_category":
-            continue
-        desired_value = desired_category_preprocessed.get(key)
-        current_value = existing_category_preprocessed.get(key)
-
-        # Handling for list attributes where None should be treated as an empty list
-        if isinstance(current_value, list) and desired_value is None:
-            desired_value = []
-
-        # Skip comparison for 'id' if it's not in the desired category but present in the existing category
-        if key == "id" and desired_value is None and current_value is not None:
-            continue
-
-        if isinstance(desired_value, list) and isinstance(current_value, list):
-            if all(isinstance(x, int) for x in desired_value) and all(
-                isinstance(x, int) for x in current_value
-            ):
-                desired_value = sorted(desired_value)
-                current_value = sorted(current_value)
-
-        if current_value != desired_value:
-            differences_detected = True
-            # module.warn(
-            #     f"Difference detected in {key}. Current: {current_value}, Desired: {desired_value}"
-            # )
+        existing_category = ZIAResourceIndex(client, "url_categories").get(
+            "configured_name", category.get("configured_name")
+        )
+
+    # Compare existing and desired data
+    schema = dict((param_name, field_spec()) for param_name in params)
+    schema.update(FIELD_SPECS["url_categories"])
+    differences = diff(category, existing_category, schema)
+    # for difference in differences:
+    #     module.warn(
+    #         f"Difference detected in {difference['field']}. Current: {difference['current']}, Desired: {difference['desired']}"
+    #     )
+    differences_detected = bool(differences)
+
+    # When only list entries differ, send the added and removed entries
+    # instead of the whole category
+    list_deltas = None
+    if (
+        existing_category is not None
+        and differences_detected
+        and module.params.get("list_update_mode") == "incremental"
+        and all(difference["field"] in LIST_FIELDS for difference in differences)
+    ):
+        list_deltas = category_list_deltas(category, existing_category)
 
     if module.check_mode:
         # If in check mode, report changes and exit
@@ -334,15 +298,21 @@ def core(module):
         else:
             module.exit_json(changed=False)
 
-    if existing_category is not None:
-        id = existing_category.get("id")
-        existing_category.update(category)
-        existing_category["id"] = id
-
     # module.warn(f"Final payload being sent to SDK: {category}")
     if state == "present":
         if existing_category is not None:
-            if differences_detected:
+            if list_deltas:
+                apply_list_deltas(
+                    client,
+                    existing_category,
+                    list_deltas,
+                    chunk_size=module.params.get("list_chunk_size"),
+                )
+                updated_category = client.url_categories.get_category(
+                    category_id=existing_category.get("id")
+                ).to_dict()
+                module.exit_json(changed=True, data=updated_category)
+            elif differences_detected:
                 updated_category = deleteNone(category)
                 updated_category["category_id"] = existing_category.get("id")
                 updated_category = client.url_categories.update_url_category(
@@ -423,9 +393,15 @@ def main():
             type="str",
             required=False,
         ),
+        list_update_mode=dict(
+            type="str", choices=["incremental", "replace"], default="incremental"
+        ),
+        list_chunk_size=dict(type="int", default=1000),
         state=dict(type="str", choices=["present", "absent"], default="present"),
     )
     module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+    if module.params.get("list_chunk_size") < 1:
+        module.fail_json(msg="list_chunk_size must be greater than 0")
     try:
         core(module)
     except Exception as e:
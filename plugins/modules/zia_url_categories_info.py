@@ -51,7 +51,21 @@ options:
     description: "Name of the URL category. This is only required for custom URL categories."
     required: false
     type: str
-
+  custom_only:
+    description:
+      - Returns only the custom URL categories.
+      - The filter is applied by the API.
+    required: false
+    type: bool
+    default: false
+    version_added: "1.4.0"
+  max_results:
+    description:
+      - Maximum number of URL categories returned.
+      - The URL categories API is not paginated, the categories are truncated after being fetched.
+    required: false
+    type: int
+    version_added: "1.4.0"
 """
 
 EXAMPLES = r"""
@@ -63,6 +77,11 @@ EXAMPLES = r"""
   zscaler.ziacloud.zia_url_categories_info:
     provider: '{{ provider }}'
     id: "OTHER_ADULT_MATERIAL"
+
+- name: Gather Information Details of the custom URL Categories only
+  zscaler.ziacloud.zia_url_categories_info:
+    provider: '{{ provider }}'
+    custom_only: true
 """
 
 RETURN = r"""
@@ -171,20 +190,21 @@ from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import
 def core(module):
     category_id = module.params.get("id", None)
     configured_name = module.params.get("configured_name", None)
+    max_results = module.params.get("max_results", None)
     client = ZIAClientHelper(module)
 
-    # Retrieve all categories
-    categories = client.url_categories.list_categories().to_list()
-
     # Search by ID
     if category_id is not None:
-        for category in categories:
-            if category.get("id") == category_id:
-                module.exit_json(changed=False, categories=[category])
-        module.fail_json(msg="Failed to retrieve URL category ID: '%s'" % (category_id))
+        category = client.url_categories.get_category(category_id=category_id)
+        if not isinstance(category, dict) or category.get("id") != category_id:
+            module.fail_json(
+                msg="Failed to retrieve URL category ID: '%s'" % (category_id)
+            )
+        module.exit_json(changed=False, categories=[category.to_dict()])
 
     # Search by Configured Name for Custom Categories
     elif configured_name is not None:
+        categories = client.url_categories.list_categories(custom_only=True).to_list()
         for category in categories:
             if (
                 category.get("custom_category")
@@ -198,6 +218,11 @@ def core(module):
 
     # If neither ID nor Configured Name is provided, return all categories
     else:
+        categories = client.url_categories.list_categories(
+            custom_only=module.params.get("custom_only")
+        ).to_list()
+        if max_results is not None:
+            categories = categories[:max_results]
         module.exit_json(changed=False, categories=categories)
 
 
@@ -206,8 +231,13 @@ def main():
     argument_spec.update(
         id=dict(type="str", required=False),
         configured_name=dict(type="str", required=False),
+        custom_only=dict(type="bool", required=False, default=False),
+        max_results=dict(type="int", required=False),
     )
     module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+    max_results = module.params.get("max_results")
+    if max_results is not None and max_results < 1:
+        module.fail_json(msg="max_results must be greater than 0")
     try:
         core(module)
     except Exception as e:
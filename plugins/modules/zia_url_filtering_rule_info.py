@@ -177,6 +177,9 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
 
 
 def core(module):
@@ -193,7 +196,7 @@ def core(module):
             )
         rules = [ruleBox.to_dict()]
     else:
-        rules = client.url_filtering.list_rules().to_list()
+        rules = ZIAResourceIndex(client, "url_filtering_rules").values()
         if rule_name is not None:
             ruleFound = False
             for rule in rules:
@@ -356,151 +356,30 @@ RETURN = r"""
 # The newly created URL Filtering Rule resource record.
 """
 
-import time
-from datetime import datetime
 from traceback import format_exc
 from ansible.module_utils._text import to_native
-from ansible.module_utils.basic import AnsibleModule, missing_required_lib
-from ansible_collections.zscaler.ziacloud.plugins.module_utils.utils import (
-    deleteNone,
-)
+from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
-
-try:
-    import pytz
-
-    HAS_PYTZ = True
-    PYTZ_IMPORT_ERROR = None  # Explicitly set to None when import is successful
-except ImportError:
-    pytz = None  # Set to None to indicate the module is unavailable
-    HAS_PYTZ = False
-    PYTZ_IMPORT_ERROR = missing_required_lib(
-        "pytz"
-    )  # Use missing_required_lib for better error messages
-
-
-def validate_and_convert_time_fields(rule):
-    if not HAS_PYTZ:
-        raise ImportError(
-            PYTZ_IMPORT_ERROR
-        )  # Properly handle the case where pytz is not available
-
-    enforce_time_validity = rule.get("enforce_time_validity")
-    if enforce_time_validity:
-        for field in [
-            "validity_start_time",
-            "validity_end_time",
-            "validity_time_zone_id",
-        ]:
-            if not rule.get(field):
-                raise ValueError(
-                    f"'{field}' must be set when 'enforce_time_validity' is True"
-                )
-
-        timezone_id = rule["validity_time_zone_id"]
-        if timezone_id not in pytz.all_timezones:
-            raise ValueError(f"Invalid timezone ID: {timezone_id}")
-
-        for time_field in ["validity_start_time", "validity_end_time"]:
-            time_str = rule.get(time_field)
-            if time_str:
-                time_obj = datetime.strptime(time_str, "%m/%d/%Y %I:%M %p")
-                timezone = pytz.timezone(timezone_id)
-                time_with_tz = timezone.localize(time_obj)
-                rule[time_field] = int(time.mktime(time_with_tz.timetuple()))
-
-
-def validate_additional_fields(rule):
-    """
-    Validates additional fields in the rule.
-    """
-    # Adjust for action 'CAUTION'
-    if rule.get("action") == "CAUTION":
-        # Set request methods when action is 'CAUTION'
-        rule["request_methods"] = ["CONNECT", "GET", "HEAD"]
-
-    # Validate time_quota
-    time_quota = rule.get("time_quota")
-    if time_quota and (time_quota < 15 or time_quota > 600):
-        raise ValueError("time_quota must be within the range of 15 to 600 minutes")
-
-    # Validate and convert size_quota from MB to KB
-    size_quota_mb = rule.get("size_quota")
-    if size_quota_mb:
-        if size_quota_mb < 10 or size_quota_mb > 100000:
-            raise ValueError(
-                "size_quota must be within the range of 10 MB to 100000 MB"
-            )
-        # Convert MB to KB for API
-        rule["size_quota"] = size_quota_mb * 1024
-
-
-def normalize_rule(rule):
-    """
-    Normalize rule data by setting computed values.
-    """
-    if not rule:
-        return {}
-
-    normalized = rule.copy()
-
-    # Add 'profile_seq' to the list of computed values to be removed
-    computed_values = ["profile_seq"]
-    for attr in computed_values:
-        if (
-            "cbi_profile" in normalized
-            and isinstance(normalized["cbi_profile"], dict)
-            and attr in normalized["cbi_profile"]
-        ):
-            normalized["cbi_profile"].pop(attr, None)
-
-    return normalized
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_url_filtering import (
+    URL_FILTERING_RULE_PARAMS,
+    rule_differences,
+    rule_payload,
+    url_filtering_rule_spec,
+    validate_additional_fields,
+    validate_and_convert_time_fields,
+)
 
 
 def core(module):
     state = module.params.get("state", None)
     client = ZIAClientHelper(module)
     rule = dict()
-    params = [
-        "id",
-        "name",
-        "order",
-        "protocols",
-        "locations",
-        "groups",
-        "departments",
-        "users",
-        "url_categories",
-        "enabled",
-        "time_windows",
-        "rank",
-        "request_methods",
-        "end_user_notification_url",
-        "override_users",
-        "override_groups",
-        "block_override",
-        "time_quota",
-        "size_quota",
-        "description",
-        "location_groups",
-        "labels",
-        "validity_start_time",
-        "validity_end_time",
-        "validity_time_zone_id",
-        "enforce_time_validity",
-        "action",
-        "ciparule",
-        "user_agent_types",
-        "device_trust_levels",
-        "device_groups",
-        "devices",
-        "user_risk_score_levels",
-        "cbi_profile",
-        "workload_groups",
-    ]
-    for param_name in params:
+    for param_name in URL_FILTERING_RULE_PARAMS:
         rule[param_name] = module.params.get(param_name, None)
 
     # Add the validation and conversion logic here
@@ -518,80 +397,12 @@ def core(module):
         if ruleBox is not None:
             existing_rule = ruleBox.to_dict()
     elif rule_name is not None:
-        rules = client.url_filtering.list_rules().to_list()
-        for rule_ in rules:
-            if rule_.get("name") == rule_name:
-                existing_rule = rule_
+        existing_rule = ZIAResourceIndex(client, "url_filtering_rules").get_by_name(
+            rule_name
+        )
 
     # Normalize and compare existing and desired data
-    desired_rule = normalize_rule(rule)
-    current_rule = normalize_rule(existing_rule) if existing_rule else {}
-
-    def preprocess_rules(rule, params):
-        """
-        Preprocess specific attributes in the rule based on their type and structure.
-        :param rule: Dict containing the rule data.
-        :param params: List of attribute names to be processed.
-        :return: Preprocessed rule.
-        """
-        for attr in params:
-            if attr in rule and rule[attr] is not None:
-                # Process list attributes
-                if isinstance(rule[attr], list):
-                    # If list contains dictionaries with 'id', extract IDs
-                    if all(
-                        isinstance(item, dict) and "id" in item for item in rule[attr]
-                    ):
-                        rule[attr] = [item["id"] for item in rule[attr]]
-                    else:
-                        # Sort lists for consistent order
-                        rule[attr] = sorted(rule[attr])
-                # Add more conditions here if needed for other types
-        return rule
-
-    existing_rule_preprocessed = preprocess_rules(current_rule, params)
-    desired_rule_preprocessed = preprocess_rules(desired_rule, params)
-
-    # Then proceed with your comparison logic
-    differences_detected = False
-    for key in params:
-        desired_value = desired_rule_preprocessed.get(key)
-        current_value = existing_rule_preprocessed.get(key)
-
-        # Handle 'block_override' and 'enforce_time_validity' specifically
-        if key in ["block_override", "enforce_time_validity"]:
-            if desired_value is None:
-                if current_value is False:  # Assuming 'False' is the default value
-                    continue  # Skip as it's the default value
-            elif desired_value == current_value:
-                continue  # Skip as values are the same
-
-        # Skip comparison for 'id' if it's not in the desired rule but present in the existing rule
-        if key == "id" and desired_value is None and current_value is not None:
-            continue
-
-        # Convert 'state' in current_rule to boolean 'enabled'
-        if key == "enabled" and "state" in current_rule:
-            current_value = current_rule["state"] == "ENABLED"
-
-        # Handling None values for all attributes
-        if desired_value is None and key != "enabled":
-            # Explicitly setting to empty list or empty value based on type
-            rule[key] = [] if isinstance(current_value, list) else None
-
-        # Special handling for lists of IDs like device_groups
-        if isinstance(desired_value, list) and isinstance(current_value, list):
-            if all(isinstance(x, int) for x in desired_value) and all(
-                isinstance(x, int) for x in current_value
-            ):
-                desired_value = sorted(desired_value)
-                current_value = sorted(current_value)
-
-        if current_value != desired_value:
-            differences_detected = True
-            # module.warn(
-            #     f"Difference detected in {key}. Current: {current_value}, Desired: {desired_value}"
-            # )
+    differences_detected = bool(rule_differences(rule, existing_rule))
 
     if module.check_mode:
         # If in check mode, report changes and exit
@@ -612,53 +423,8 @@ def core(module):
         if existing_rule is not None:
             if differences_detected:
                 """Update"""
-                update_rule = deleteNone(
-                    dict(
-                        rule_id=existing_rule.get("id"),
-                        name=existing_rule.get("name"),
-                        order=existing_rule.get("order"),
-                        protocols=existing_rule.get("protocols"),
-                        locations=existing_rule.get("locations"),
-                        groups=existing_rule.get("groups"),
-                        departments=existing_rule.get("departments"),
-                        users=existing_rule.get("users"),
-                        device_groups=existing_rule.get("device_groups"),
-                        devices=existing_rule.get("devices"),
-                        url_categories=existing_rule.get("url_categories"),
-                        enabled=existing_rule.get("enabled"),
-                        time_windows=existing_rule.get("time_windows"),
-                        rank=existing_rule.get("rank"),
-                        request_methods=existing_rule.get("request_methods"),
-                        end_user_notification_url=existing_rule.get(
-                            "end_user_notification_url"
-                        ),
-                        override_users=existing_rule.get("override_users"),
-                        override_groups=existing_rule.get("override_groups"),
-                        block_override=existing_rule.get("block_override"),
-                        time_quota=existing_rule.get("time_quota"),
-                        size_quota=existing_rule.get("size_quota"),
-                        description=existing_rule.get("description"),
-                        location_groups=existing_rule.get("location_groups"),
-                        labels=existing_rule.get("labels"),
-                        validity_start_time=existing_rule.get("validity_start_time"),
-                        validity_end_time=existing_rule.get("validity_end_time"),
-                        validity_time_zone_id=existing_rule.get(
-                            "validity_time_zone_id"
-                        ),
-                        enforce_time_validity=existing_rule.get(
-                            "enforce_time_validity"
-                        ),
-                        action=existing_rule.get("action"),
-                        cipa_rule=existing_rule.get("cipa_rule"),
-                        user_agent_types=existing_rule.get("user_agent_types"),
-                        user_risk_score_levels=existing_rule.get(
-                            "user_risk_score_levels"
-                        ),
-                        device_trust_levels=existing_rule.get("device_trust_levels"),
-                        cbi_profile=existing_rule.get("cbi_profile"),
-                        workload_groups=existing_rule.get("workload_groups"),
-                    )
-                )
+                update_rule = rule_payload(existing_rule)
+                update_rule["rule_id"] = existing_rule.get("id")
 
                 # module.warn("Payload Update for SDK: {}".format(update_rule))
                 updated_rule = client.url_filtering.update_rule(**update_rule).to_dict()
@@ -666,44 +432,7 @@ def core(module):
         else:
             # module.warn("Creating new rule as no existing rule found")
             """Create"""
-            create_rule = deleteNone(
-                dict(
-                    name=rule.get("name"),
-                    order=rule.get("order"),
-                    protocols=rule.get("protocols"),
-                    locations=rule.get("locations"),
-                    groups=rule.get("groups"),
-                    departments=rule.get("departments"),
-                    users=rule.get("users"),
-                    device_groups=rule.get("device_groups"),
-                    devices=rule.get("devices"),
-                    url_categories=rule.get("url_categories"),
-                    enabled=rule.get("enabled"),
-                    time_windows=rule.get("time_windows"),
-                    rank=rule.get("rank"),
-                    request_methods=rule.get("request_methods"),
-                    end_user_notification_url=rule.get("end_user_notification_url"),
-                    override_users=rule.get("override_users"),
-                    override_groups=rule.get("override_groups"),
-                    block_override=rule.get("block_override"),
-                    time_quota=rule.get("time_quota"),
-                    size_quota=rule.get("size_quota"),
-                    description=rule.get("description"),
-                    location_groups=rule.get("location_groups"),
-                    labels=rule.get("labels"),
-                    validity_start_time=rule.get("validity_start_time"),
-                    validity_end_time=rule.get("validity_end_time"),
-                    validity_time_zone_id=rule.get("validity_time_zone_id"),
-                    enforce_time_validity=rule.get("enforce_time_validity"),
-                    action=rule.get("action"),
-                    cipa_rule=rule.get("cipa_rule"),
-                    user_agent_types=rule.get("user_agent_types"),
-                    user_risk_score_levels=rule.get("user_risk_score_levels"),
-                    device_trust_levels=rule.get("device_trust_levels"),
-                    cbi_profile=rule.get("cbi_profile"),
-                    workload_groups=rule.get("workload_groups"),
-                )
-            )
+            create_rule = rule_payload(rule)
             # module.warn("Payload for SDK: {}".format(create_rule))
             new_rule = client.url_filtering.add_rule(**create_rule).to_dict()
             module.exit_json(changed=True, data=new_rule)
@@ -721,134 +450,11 @@ def core(module):
 
 def main():
     argument_spec = ZIAClientHelper.zia_argument_spec()
-    id_spec = dict(
-        type="list",
-        elements="int",
-        required=False,
-    )
-    id_name_url_dict_spec = dict(
-        id=dict(type="str", required=True),
-        name=dict(type="str", required=True),
-        url=dict(type="str", required=True),
-    )
     argument_spec.update(
-        id=dict(type="int", required=False),
-        name=dict(type="str", required=True),
-        description=dict(type="str", required=False),
-        enabled=dict(type="bool", required=False),
-        order=dict(type="int", required=False),
-        rank=dict(type="int", required=False, default=7),
-        locations=id_spec,
-        groups=id_spec,
-        departments=id_spec,
-        device_groups=id_spec,
-        devices=id_spec,
-        users=id_spec,
-        override_users=id_spec,
-        override_groups=id_spec,
-        time_windows=id_spec,
-        location_groups=id_spec,
-        labels=id_spec,
-        workload_groups=id_spec,
-        end_user_notification_url=dict(type="str", required=False),
-        block_override=dict(type="bool", required=False),
-        time_quota=dict(type="int", required=False),
-        size_quota=dict(type="int", required=False),
-        validity_start_time=dict(type="str", required=False),
-        validity_end_time=dict(type="str", required=False),
-        validity_time_zone_id=dict(type="str", required=False),
-        enforce_time_validity=dict(type="bool", required=False),
-        url_categories=dict(type="list", elements="str", required=False),
-        cipa_rule=dict(type="bool", required=False),
-        cbi_profile=dict(
-            type="dict",
-            options=id_name_url_dict_spec,
-            required=False,
-        ),
-        action=dict(
-            type="str",
-            required=False,
-            choices=["ANY", "BLOCK", "CAUTION", "ALLOW", "ISOLATE", "ICAP_RESPONSE"],
-        ),
-        protocols=dict(
-            type="list",
-            elements="str",
-            required=False,
-            choices=[
-                "SMRULEF_ZPA_BROKERS_RULE",
-                "ANY_RULE",
-                "TCP_RULE",
-                "UDP_RULE",
-                "DOHTTPS_RULE",
-                "TUNNELSSL_RULE",
-                "HTTP_PROXY",
-                "FOHTTP_RULE",
-                "FTP_RULE",
-                "HTTPS_RULE",
-                "HTTP_RULE",
-                "SSL_RULE",
-                "TUNNEL_RULE",
-                "WEBSOCKETSSL_RULE",
-                "WEBSOCKET_RULE",
-            ],
-        ),
-        request_methods=dict(
-            type="list",
-            elements="str",
-            required=False,
-            choices=[
-                "OPTIONS",
-                "GET",
-                "HEAD",
-                "POST",
-                "PUT",
-                "DELETE",
-                "TRACE",
-                "CONNECT",
-                "OTHER",
-            ],
-        ),
-        user_agent_types=dict(
-            type="list",
-            elements="str",
-            required=False,
-            choices=[
-                "OPERA",
-                "FIREFOX",
-                "MSIE",
-                "MSEDGE",
-                "CHROME",
-                "SAFARI",
-                "OTHER",
-                "MSCHREDGE",
-            ],
-        ),
-        device_trust_levels=dict(
-            type="list",
-            elements="str",
-            required=False,
-            choices=[
-                "ANY",
-                "UNKNOWN_DEVICETRUSTLEVEL",
-                "LOW_TRUST",
-                "MEDIUM_TRUST",
-                "HIGH_TRUST",
-            ],
-        ),
-        user_risk_score_levels=dict(
-            type="list",
-            elements="str",
-            required=False,
-            choices=["LOW", "MEDIUM", "HIGH", "CRITICAL"],
-        ),
+        url_filtering_rule_spec(),
         state=dict(type="str", choices=["present", "absent"], default="present"),
     )
     module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
-    if not HAS_PYTZ:
-        module.fail_json(
-            msg="The 'pytz' library is required by this module.",
-            exception=PYTZ_IMPORT_ERROR,
-        )
 
     try:
         core(module)
@@ -0,0 +1,525 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                             MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: zia_url_filtering_rules_bulk
+short_description: "Reconciles a list of URL Filtering rules."
+description:
+  - Reconciles a whole list of URL Filtering rules in one task.
+  - The current policy is fetched once, the differences of every rule are computed in memory,
+    and only the create, update and delete calls that are needed are sent.
+author:
+  - William Guilherme (@willguibr)
+version_added: "1.4.0"
+requirements:
+    - Zscaler SDK Python can be obtained from PyPI U(https://pypi.org/project/zscaler-sdk-python/)
+notes:
+    - Check mode is supported.
+extends_documentation_fragment:
+  - zscaler.ziacloud.fragments.provider
+  - zscaler.ziacloud.fragments.documentation
+
+options:
+  purge:
+    description:
+      - When set to true, URL Filtering rules that are not listed in C(rules) are deleted.
+      - Predefined and default rules are never deleted.
+    required: false
+    type: bool
+    default: false
+  rules:
+    description:
+      - List of the desired URL Filtering rules.
+      - Rules are matched with the existing rules by C(id) if set, otherwise by C(name).
+      - Rules with an C(order) are placed at that position; rules without an C(order) keep their current position.
+      - Rule positions are reconciled with as few moves as possible.
+    required: true
+    type: list
+    elements: dict
+    suboptions:
+      state:
+        description:
+          - Whether the rule should exist or not.
+        type: str
+        choices:
+          - present
+          - absent
+        default: present
+      id:
+        description: "Unique identifier for the URL Filtering policy rule"
+        required: false
+        type: int
+      name:
+        description: "Name of the URL Filtering policy rule"
+        required: true
+        type: str
+      description:
+        description: "Additional information about the rule"
+        required: false
+        type: str
+      enabled:
+        description:
+            - Determines whether the URL Filtering rule is enabled or disabled
+        required: false
+        type: bool
+      order:
+        description: "Rule order number of the URL Filtering policy rule"
+        required: false
+        type: int
+      action:
+        description:
+          - Action taken when traffic matches rule criteria
+          - When the action is set to CAUTION the attribute request_methods accepts only the following values are CONNECT GET HEAD
+        required: false
+        type: str
+        choices:
+            - ANY
+            - BLOCK
+            - CAUTION
+            - ALLOW
+            - ISOLATE
+            - ICAP_RESPONSE
+      protocols:
+        description:
+            - Protocol criteria
+        required: false
+        type: list
+        elements: str
+        choices:
+            - SMRULEF_ZPA_BROKERS_RULE
+            - ANY_RULE
+            - TCP_RULE
+            - UDP_RULE
+            - DOHTTPS_RULE
+            - TUNNELSSL_RULE
+            - HTTP_PROXY
+            - FOHTTP_RULE
+            - FTP_RULE
+            - HTTPS_RULE
+            - HTTP_RULE
+            - SSL_RULE
+            - TUNNEL_RULE
+            - WEBSOCKETSSL_RULE
+            - WEBSOCKET_RULE
+      locations:
+        description:
+            - Name-ID pairs of locations for which rule must be applied
+        type: list
+        elements: int
+        required: false
+      groups:
+        description:
+            - Name-ID pairs of groups for which rule must be applied
+        type: list
+        elements: int
+        required: false
+      departments:
+        description:
+            - Name-ID pairs of departments for which rule will be applied
+        type: list
+        elements: int
+        required: false
+      users:
+        description:
+            - Name-ID pairs of users for which rule must be applied
+        type: list
+        elements: int
+        required: false
+      workload_groups:
+        description: "The list of preconfigured workload groups to which the policy must be applied."
+        type: list
+        elements: int
+        required: false
+      url_categories:
+        description:
+            - List of URL categories for which rule must be applied
+        type: list
+        elements: str
+        required: false
+      device_groups:
+        description:
+          - Name-ID pairs of device groups for which the rule must be applied.
+          - This field is applicable for devices that are managed using Zscaler Client Connector.
+          - If no value is set, this field is ignored during the policy evaluation.
+        type: list
+        elements: int
+        required: false
+      devices:
+        description:
+          - Name-ID pairs of devices for which rule must be applied.
+          - Specifies devices that are managed using Zscaler Client Connector.
+          - If no value is set, this field is ignored during the policy evaluation.
+        type: list
+        elements: int
+        required: false
+      time_windows:
+        description:
+            - Name-ID pairs of time interval during which rule must be enforced.
+        type: list
+        elements: int
+        required: false
+      rank:
+        description:
+            - Admin rank of the admin who creates this rule
+        required: false
+        default: 7
+        type: int
+      request_methods:
+        description:
+            - Request method for which the rule must be applied.
+            - If not set, rule will be applied to all methods"
+        type: list
+        elements: str
+        required: false
+        choices:
+            - OPTIONS
+            - GET
+            - HEAD
+            - POST
+            - PUT
+            - DELETE
+            - TRACE
+            - CONNECT
+            - OTHER
+      user_agent_types:
+        description:
+            - Any number of user agents to which the rule applies.
+        type: list
+        elements: str
+        required: false
+        choices:
+            - OPERA
+            - FIREFOX
+            - MSIE
+            - MSEDGE
+            - CHROME
+            - SAFARI
+            - OTHER
+            - MSCHREDGE
+      user_risk_score_levels:
+        description: Indicates the user risk level selected for the DLP rule violation.
+        required: false
+        type: list
+        elements: str
+        choices:
+            - LOW
+            - MEDIUM
+            - HIGH
+            - CRITICAL
+      device_trust_levels:
+        description:
+            - List of device trust levels for which the rule must be applied.
+            - This field is applicable for devices that are managed using Zscaler Client Connector.
+            - The trust levels are assigned to the devices based on your posture configurations.
+            - If no value is set, this field is ignored during the policy evaluation.
+        type: list
+        elements: str
+        required: false
+        choices:
+            - ANY
+            - UNKNOWN_DEVICETRUSTLEVEL
+            - LOW_TRUST
+            - MEDIUM_TRUST
+            - HIGH_TRUST
+      end_user_notification_url:
+        description:
+          - URL of end user notification page to be displayed when the rule is matched.
+          - Not applicable if either override_users or override_groups is specified.
+        required: false
+        type: str
+      override_users:
+        description:
+            - Name-ID pairs of users for which this rule can be overridden.
+            - Applicable only if block_override is set to true, action is BLOCK and override_groups is not set.
+            - If this override_users is not set, BLOCK action can be overridden for any user.
+        type: list
+        elements: int
+        required: false
+      override_groups:
+        description:
+            - Name-ID pairs of groups for which this rule can be overridden.
+            - Applicable only if block_override is set to true and action is BLOCK.
+            - If this override_groups is not set, BLOCK action can be overridden for any group.
+        type: list
+        elements: int
+        required: false
+      block_override:
+        description:
+            - When set to true, a BLOCK action triggered by the rule could be overridden.
+            - If true and both override_group and override_users are not set, the BLOCK triggered by this rule could be overridden for any users.
+            - If block_override is not set, BLOCK action cannot be overridden.
+        type: bool
+        required: false
+      time_quota:
+        description:
+            - Action must be set to CAUTION
+            - Time quota in minutes, after which the URL Filtering rule is applied.
+            - The allowed range is between 15 minutes and 600 minutes.
+            - If not set, no quota is enforced. If a policy rule action is set to BLOCK, this field is not applicable.
+        required: false
+        type: int
+      size_quota:
+        description:
+            - Action must be set to CAUTION
+            - Size quota in MB beyond which the URL Filtering rule is applied.
+            - The allowed range is between 10 MB and 100000 MB
+            - If not set, no quota is enforced. If a policy rule action is set to BLOCK, this field is not applicable.
+        required: false
+        type: int
+      location_groups:
+        description:
+            - Name-ID pairs of the location groups to which the rule must be applied.
+        type: list
+        elements: int
+        required: false
+      labels:
+        description:
+            - The URL Filtering rule label. Rule labels allow you to logically group your organization policy rules.
+            - Policy rules that are not associated with a rule label are grouped under the Untagged label.
+        type: list
+        elements: int
+        required: false
+      enforce_time_validity:
+        description:
+            - Enforce a set a validity time period for the URL Filtering rule.
+        type: bool
+      validity_start_time:
+        description:
+          - If enforce_time_validity is set to true, the URL Filtering rule will be valid starting on this date and time.
+          - Example ( 11/20/2023 11:59 PM )
+          - Notice that validity_start_time cannot be in the past
+        required: false
+        type: str
+      validity_time_zone_id:
+        description:
+          - If enforceTimeValidity is set to true, the URL Filtering rule date and time is valid based on this time zone ID.
+        required: false
+        type: str
+      validity_end_time:
+        description:
+          - If enforce_time_validity is set to true, the URL Filtering rule will cease to be valid on this end date and time.
+          - Example ( 12/21/2023 12:00 AM )
+        required: false
+        type: str
+      cipa_rule:
+        description:
+            - If set to true, the CIPA Compliance rule is enabled
+        type: bool
+      cbi_profile:
+          description:
+            - The cloud browser isolation profile to which the ISOLATE action is applied in the URL Filtering Policy rules.
+            - This parameter is required for the ISOLATE action and is not applicable to other actions.
+          type: dict
+          suboptions:
+              id:
+                  description:
+                      - The universally unique identifier (UUID) for the browser isolation profile.
+                  type: str
+                  required: True
+              name:
+                  description:
+                      - Name of the browser isolation profile.
+                  type: str
+                  required: True
+              url:
+                  description:
+                      - The browser isolation profile URL.
+                  type: str
+                  required: True
+"""
+
+EXAMPLES = r"""
+- name: Reconcile URL Filtering Rules
+  zscaler.ziacloud.zia_url_filtering_rules_bulk:
+    provider: '{{ provider }}'
+    rules:
+      - name: "Block_Gambling"
+        description: "Block gambling sites"
+        enabled: true
+        action: "BLOCK"
+        order: 1
+        url_categories:
+          - "GAMBLING"
+        protocols:
+          - "ANY_RULE"
+      - name: "Caution_Social"
+        enabled: true
+        action: "CAUTION"
+        order: 2
+        url_categories:
+          - "SOCIAL_NETWORKING"
+        protocols:
+          - "ANY_RULE"
+      - name: "Legacy_Rule"
+        state: absent
+
+- name: Reconcile URL Filtering Rules and delete any other rule
+  zscaler.ziacloud.zia_url_filtering_rules_bulk:
+    provider: '{{ provider }}'
+    purge: true
+    rules: "{{ url_filtering_rules }}"
+"""
+
+RETURN = r"""
+results:
+  description: One entry per rule that was compared, created, updated or deleted.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    name:
+      description: Name of the rule.
+      type: str
+      sample: Block_Gambling
+    id:
+      description: ID of the rule, null for a rule created in check mode.
+      type: int
+      sample: 1203256
+    action:
+      description: Change applied to the rule.
+      type: str
+      sample: update
+      choices: [create, update, delete, unchanged]
+    changed_fields:
+      description: Attributes that differ from the existing rule.
+      type: list
+      elements: str
+      sample: ["description", "url_categories"]
+    failed:
+      description: Set when the API call of this rule failed.
+      type: bool
+      returned: on failure
+    msg:
+      description: Error returned by the API call of this rule.
+      type: str
+      returned: on failure
+"""
+
+from traceback import format_exc
+from ansible.module_utils._text import to_native
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_bulk import (
+    apply_changes,
+    plan_changes,
+    plan_order,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
+    ZIAClientHelper,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_index import (
+    ZIAResourceIndex,
+)
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_url_filtering import (
+    URL_FILTERING_RULE_PARAMS,
+    rule_differences,
+    rule_payload,
+    url_filtering_rule_spec,
+    validate_additional_fields,
+    validate_and_convert_time_fields,
+)
+
+
+def is_protected_rule(rule):
+    """Predefined and default rules cannot be deleted."""
+    return bool(rule.get("predefined") or rule.get("default_rule"))
+
+
+def core(module):
+    client = ZIAClientHelper(module)
+    purge = module.params.get("purge")
+
+    desired_rules = []
+    for item in module.params.get("rules"):
+        rule = dict()
+        for param_name in URL_FILTERING_RULE_PARAMS:
+            rule[param_name] = item.get(param_name, None)
+        if item.get("state") == "present":
+            validate_and_convert_time_fields(rule)
+            validate_additional_fields(rule)
+        rule["state"] = item.get("state")
+        desired_rules.append(rule)
+
+    rules_index = ZIAResourceIndex(client, "url_filtering_rules")
+    changes = plan_changes(
+        desired_rules,
+        rules_index,
+        rule_differences,
+        purge=purge,
+        protected=is_protected_rule,
+    )
+    changes = plan_order(changes, rules_index.values())
+
+    def create(rule):
+        return client.url_filtering.add_rule(**rule_payload(rule)).to_dict()
+
+    def update(rule, existing_rule):
+        rule_id = existing_rule.get("id")
+        existing_rule.update(rule)
+        update_rule = rule_payload(existing_rule)
+        update_rule["rule_id"] = rule_id
+        return client.url_filtering.update_rule(**update_rule).to_dict()
+
+    def delete(existing_rule):
+        code = client.url_filtering.delete_rule(rule_id=existing_rule.get("id"))
+        if code > 299:
+            raise Exception(
+                "Failed to delete rule %s, status code %s"
+                % (existing_rule.get("name"), code)
+            )
+
+    changed, report, failed = apply_changes(module, changes, create, update, delete)
+    if failed:
+        module.fail_json(
+            msg="%d of the URL Filtering rule changes failed" % failed,
+            changed=changed,
+            results=report,
+        )
+    module.exit_json(changed=changed, results=report)
+
+
+def main():
+    argument_spec = ZIAClientHelper.zia_argument_spec()
+    rule_spec = url_filtering_rule_spec()
+    rule_spec.update(
+        state=dict(type="str", choices=["present", "absent"], default="present"),
+    )
+    argument_spec.update(
+        purge=dict(type="bool", required=False, default=False),
+        rules=dict(type="list", elements="dict", required=True, options=rule_spec),
+    )
+    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+
+    try:
+        core(module)
+    except Exception as e:
+        module.fail_json(msg=to_native(e), exception=format_exc())
+
+
+if __name__ == "__main__":
+    main()
@@ -42,6 +42,7 @@ notes:
 extends_documentation_fragment:
   - zscaler.ziacloud.fragments.provider
   - zscaler.ziacloud.fragments.documentation
+  - zscaler.ziacloud.fragments.paging
 
 options:
   id:
@@ -52,6 +53,13 @@ options:
     description: "Department name."
     required: false
     type: str
+  search:
+    description:
+      - Returns only the departments whose name or comments partially match this string.
+      - The filter is applied by the API.
+    required: false
+    type: str
+    version_added: "1.4.0"
 """
 
 EXAMPLES = r"""
@@ -63,6 +71,12 @@ EXAMPLES = r"""
   zscaler.ziacloud.zia_user_management_department_info:
     provider: '{{ provider }}'
     name: "marketing"
+
+- name: Gets the first 20 departments matching a search string
+  zscaler.ziacloud.zia_user_management_department_info:
+    provider: '{{ provider }}'
+    search: "eng"
+    max_results: 20
 """
 
 RETURN = r"""
@@ -100,29 +114,47 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_pagination import (
+    check_paging_params,
+    find_first,
+    list_items,
+    paging_argument_spec,
+)
 
 
 def core(module):
+    check_paging_params(module)
     department_id = module.params.get("id", None)
     department_name = module.params.get("name", None)
+    page_size = module.params.get("page_size")
     client = ZIAClientHelper(module)
     departments = []
     if department_id is not None:
         department = client.users.get_department(department_id).to_dict()
         departments = [department]
+    elif department_name is not None:
+        # The API search is a partial match, stop at the exact one
+        department = find_first(
+            client,
+            "departments",
+            lambda item: item.get("name", None) == department_name,
+            params=dict(search=department_name),
+            page_size=page_size,
+        )
+        if department is None:
+            module.fail_json(
+                msg="Failed to retrieve department: '%s'" % (department_name)
+            )
+        departments = [department]
     else:
-        departments = client.users.list_departments().to_list()
-        if department_name is not None:
-            department = None
-            for dept in departments:
-                if dept.get("name", None) == department_name:
-                    department = dept
-                    break
-            if department is None:
-                module.fail_json(
-                    msg="Failed to retrieve department: '%s'" % (department_name)
-                )
-            departments = [department]
+        departments = list_items(
+            client,
+            "departments",
+            params=dict(search=module.params.get("search")),
+            page_size=page_size,
+            max_results=module.params.get("max_results"),
+            concurrency=module.params.get("concurrency"),
+        )
     module.exit_json(changed=False, departments=departments)
 
 
@@ -131,6 +163,8 @@ def main():
     argument_spec.update(
         name=dict(type="str", required=False),
         id=dict(type="int", required=False),
+        search=dict(type="str", required=False),
+        **paging_argument_spec()
     )
     module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
     try:
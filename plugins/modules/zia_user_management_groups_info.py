@@ -42,6 +42,7 @@ notes:
 extends_documentation_fragment:
   - zscaler.ziacloud.fragments.provider
   - zscaler.ziacloud.fragments.documentation
+  - zscaler.ziacloud.fragments.paging
 
 options:
   id:
@@ -52,6 +53,13 @@ options:
     description: "Group name."
     required: false
     type: str
+  search:
+    description:
+      - Returns only the groups whose name or comments partially match this string.
+      - The filter is applied by the API.
+    required: false
+    type: str
+    version_added: "1.4.0"
 """
 
 EXAMPLES = r"""
@@ -63,6 +71,12 @@ EXAMPLES = r"""
   zscaler.ziacloud.zia_user_management_groups_info:
     provider: '{{ provider }}'
     name: "marketing"
+
+- name: Gets the first 20 groups matching a search string
+  zscaler.ziacloud.zia_user_management_groups_info:
+    provider: '{{ provider }}'
+    search: "eng"
+    max_results: 20
 """
 
 RETURN = r"""
@@ -94,28 +108,45 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_pagination import (
+    check_paging_params,
+    find_first,
+    list_items,
+    paging_argument_spec,
+)
 
 
 def core(module):
+    check_paging_params(module)
     group_id = module.params.get("id", None)
     group_name = module.params.get("name", None)
+    page_size = module.params.get("page_size")
     client = ZIAClientHelper(module)
     groups = []
-
     if group_id is not None:
         group = client.users.get_group(group_id).to_dict()
         groups = [group]
+    elif group_name is not None:
+        # The API search is a partial match, stop at the exact one
+        group = find_first(
+            client,
+            "groups",
+            lambda item: item.get("name", None) == group_name,
+            params=dict(search=group_name),
+            page_size=page_size,
+        )
+        if group is None:
+            module.fail_json(msg=f"Failed to retrieve group: '{group_name}'")
+        groups = [group]
     else:
-        groups = client.users.list_groups().to_list()
-        if group_name is not None:
-            group = None
-            for grp in groups:
-                if grp.get("name", None) == group_name:
-                    group = grp
-                    break
-            if group is None:
-                module.fail_json(msg=f"Failed to retrieve group: '{group_name}'")
-            groups = [group]
+        groups = list_items(
+            client,
+            "groups",
+            params=dict(search=module.params.get("search")),
+            page_size=page_size,
+            max_results=module.params.get("max_results"),
+            concurrency=module.params.get("concurrency"),
+        )
     module.exit_json(changed=False, groups=groups)
 
 
@@ -124,9 +155,10 @@ def main():
     argument_spec.update(
         name=dict(type="str", required=False),
         id=dict(type="int", required=False),
+        search=dict(type="str", required=False),
+        **paging_argument_spec(),
     )
     module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
-
     try:
         core(module)
     except Exception as e:
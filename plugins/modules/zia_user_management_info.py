@@ -42,6 +42,7 @@ notes:
 extends_documentation_fragment:
   - zscaler.ziacloud.fragments.provider
   - zscaler.ziacloud.fragments.documentation
+  - zscaler.ziacloud.fragments.paging
 
 options:
   id:
@@ -52,6 +53,25 @@ options:
     description: "User name. This appears when choosing users for policies."
     required: false
     type: str
+  search:
+    description:
+      - Returns only the users whose name partially matches this string.
+      - The filter is applied by the API.
+    required: false
+    type: str
+    version_added: "1.4.0"
+  department:
+    description:
+      - Returns only the users of the departments whose name starts with this string.
+    required: false
+    type: str
+    version_added: "1.4.0"
+  group:
+    description:
+      - Returns only the users of the groups whose name starts with this string.
+    required: false
+    type: str
+    version_added: "1.4.0"
 """
 
 EXAMPLES = r"""
@@ -63,6 +83,12 @@ EXAMPLES = r"""
   zscaler.ziacloud.zia_user_management_info:
     provider: '{{ provider }}'
     name: "Adam Ashcroft"
+
+- name: Gets the first 50 users of the Engineering department
+  zscaler.ziacloud.zia_user_management_info:
+    provider: '{{ provider }}'
+    department: "Engineering"
+    max_results: 50
 """
 
 RETURN = r"""
@@ -137,27 +163,49 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
     ZIAClientHelper,
 )
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_pagination import (
+    check_paging_params,
+    find_first,
+    list_items,
+    paging_argument_spec,
+)
 
 
 def core(module):
+    check_paging_params(module, max_page_size=10000)
     user_id = module.params.get("id", None)
     user_name = module.params.get("name", None)
+    page_size = module.params.get("page_size")
     client = ZIAClientHelper(module)
     users = []
     if user_id is not None:
         user = client.users.get_user(user_id).to_dict()
         users = [user]
+    elif user_name is not None:
+        # The API name filter is a partial match, stop at the exact one
+        user = find_first(
+            client,
+            "users",
+            lambda usr: usr.get("name", None) == user_name,
+            params=dict(name=user_name),
+            page_size=page_size,
+        )
+        if user is None:
+            module.fail_json(msg="Failed to retrieve user: '%s'" % (user_name))
+        users = [user]
     else:
-        users = client.users.list_users().to_list()
-        if user_name is not None:
-            user = None
-            for usr in users:
-                if usr.get("name", None) == user_name:
-                    user = usr
-                    break
-            if user is None:
-                module.fail_json(msg="Failed to retrieve user: '%s'" % (user_name))
-            users = [user]
+        users = list_items(
+            client,
+            "users",
+            params=dict(
+                name=module.params.get("search"),
+                dept=module.params.get("department"),
+                group=module.params.get("group"),
+            ),
+            page_size=page_size,
+            max_results=module.params.get("max_results"),
+            concurrency=module.params.get("concurrency"),
+        )
     module.exit_json(changed=False, users=users)
 
 
@@ -166,6 +214,10 @@ def main():
     argument_spec.update(
         name=dict(type="str", required=False),
         id=dict(type="int", required=False),
+        search=dict(type="str", required=False),
+        department=dict(type="str", required=False),
+        group=dict(type="str", required=False),
+        **paging_argument_spec()
     )
     module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
     try:
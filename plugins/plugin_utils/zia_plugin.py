@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                              MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Helpers shared by the controller side plugins of the collection, which use
+the API client of the modules without an ``AnsibleModule``.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import logging
+import os
+from contextlib import contextmanager
+
+from ansible.errors import AnsibleError
+from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
+    ZIAClientHelper,
+)
+
+
+class PluginModule:
+    """
+    Stands in for the ``AnsibleModule`` that ``ZIAClientHelper`` expects,
+    failures raise an ``AnsibleError``.
+    """
+
+    def __init__(self, params):
+        self.params = params
+
+    def fail_json(self, msg, **kwargs):
+        raise AnsibleError(msg)
+
+    def exit_json(self, **kwargs):
+        pass
+
+
+def plugin_client(plugin):
+    """Returns a ``ZIAClientHelper`` using the credential options of the plugin."""
+    return ZIAClientHelper(
+        PluginModule(
+            dict(
+                provider=None,
+                username=plugin.get_option("username"),
+                password=plugin.get_option("password"),
+                api_key=plugin.get_option("api_key"),
+                cloud=plugin.get_option("cloud"),
+            )
+        )
+    )
+
+
+class LazyClient:
+    """
+    ``ZIAClientHelper`` of a plugin created, and logged in, on first use.
+
+    The tenant attributes are available without a client, so that the
+    resource indexes can be read from the cache without logging in.
+    """
+
+    def __init__(self, plugin):
+        self._plugin = plugin
+        self._client = None
+        self.username = plugin.get_option("username")
+        self.env_cloud = (plugin.get_option("cloud") or "").lower() or None
+
+    def __getattr__(self, name):
+        if self._client is None:
+            self._client = plugin_client(self._plugin)
+        return getattr(self._client, name)
+
+
+class _SDKRootRecords(logging.Filter):
+    def filter(self, record):
+        return os.sep + "zscaler" + os.sep not in record.pathname
+
+
+@contextmanager
+def quiet_sdk():
+    """
+    Drops the warnings the SDK logs on the root logger for every response,
+    which the ansible commands would print.
+    """
+    root = logging.getLogger()
+    records_filter = _SDKRootRecords()
+    root.addFilter(records_filter)
+    try:
+        yield
+    finally:
+        root.removeFilter(records_filter)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                              MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Measures how long importing each module of the collection takes.
+
+Every module is imported in a fresh interpreter, after
+``ansible.module_utils.basic`` which every module needs anyway, and the
+best of ``--repeat`` runs is reported. The script also lists the heavy
+dependencies loaded by the import: the SDK, netaddr, pytz and pycountry
+are meant to be imported on first use only, and ``--check`` fails when a
+module loads one of them at import time or takes longer than ``--max-ms``.
+
+    python tests/benchmarks/import_time.py --output import_time.json
+    python tests/benchmarks/import_time.py --check --max-ms 100
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+from run_benchmarks import _collection_paths, _environment  # noqa: E402
+
+HEAVY_DEPENDENCIES = ("zscaler", "requests", "netaddr", "pytz", "pycountry")
+
+# Run in the child interpreter, prints the import time in seconds and the
+# heavy dependencies that were loaded.
+_PROBE = """
+import json, sys, time
+sys.path[:0] = %(paths)r
+import ansible.module_utils.basic
+before = set(sys.modules)
+started = time.perf_counter()
+import %(module)s
+elapsed = time.perf_counter() - started
+loaded = [name for name in %(heavy)r if name in sys.modules and name not in before]
+print(json.dumps({"time": elapsed, "loaded": loaded}))
+"""
+
+
+def measure(module, repeat):
+    code = _PROBE % {
+        "paths": _collection_paths(),
+        "module": module,
+        "heavy": HEAVY_DEPENDENCIES,
+    }
+    best = None
+    for unused in range(repeat):
+        output = subprocess.check_output([sys.executable, "-c", code])
+        result = json.loads(output.decode("utf-8").strip().splitlines()[-1])
+        if best is None or result["time"] < best["time"]:
+            best = result
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modules", nargs="*", help="only measure these modules")
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="runs per module (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--output", help="write the JSON report to this file instead of stdout"
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="fail if a module loads a heavy dependency at import time or is slower than --max-ms",
+    )
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        default=None,
+        help="maximum import time of a module in milliseconds",
+    )
+    options = parser.parse_args()
+
+    modules = options.modules or sorted(
+        os.path.splitext(os.path.basename(path))[0]
+        for path in glob.glob(os.path.join(ROOT, "plugins", "modules", "zia_*.py"))
+    )
+    results = []
+    failures = 0
+    for name in modules:
+        result = measure(
+            "ansible_collections.zscaler.ziacloud.plugins.modules." + name,
+            options.repeat,
+        )
+        result = {
+            "module": name,
+            "import_ms": round(result["time"] * 1000, 3),
+            "loaded": result["loaded"],
+        }
+        results.append(result)
+        problems = []
+        if result["loaded"]:
+            problems.append("loads %s" % ", ".join(result["loaded"]))
+        if options.max_ms is not None and result["import_ms"] > options.max_ms:
+            problems.append("slower than %sms" % options.max_ms)
+        if options.check and problems:
+            failures += 1
+        print(
+            "%-50s %8.1f ms%s"
+            % (
+                name,
+                result["import_ms"],
+                "  " + "; ".join(problems) if problems else "",
+            ),
+            file=sys.stderr,
+        )
+
+    report = {"environment": _environment(), "results": results}
+    data = json.dumps(report, indent=2, sort_keys=True)
+    if options.output:
+        with open(options.output, "w") as f:
+            f.write(data + "\n")
+    else:
+        print(data)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                              MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Checks that rate limited requests are retried by the request scheduler.
+
+The mock ZIA API answers ``429`` with ``Retry-After`` to a random share of
+the requests. The script sends ``--calls`` requests through
+``ZIAClientHelper`` with the scheduler and the metrics enabled, and fails
+unless every rate limited response was retried by the scheduler, paused the
+other requesters of the tenant and was counted in the metrics: the SDK must
+not retry it out of sight.
+
+    python tests/benchmarks/rate_limit.py --calls 20 --throttle-rate 0.5
+    python tests/benchmarks/rate_limit.py --persistent-connection
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+from run_benchmarks import CREDENTIALS, _collection_paths  # noqa: E402
+import zia_mock_server  # noqa: E402
+
+ENDPOINT = "GET ruleLabels"
+
+
+class _Module:
+    """The parts of ``AnsibleModule`` used by ``ZIAClientHelper``."""
+
+    params = {}
+
+    def exit_json(self, **kwargs):
+        pass
+
+    def fail_json(self, **kwargs):
+        raise SystemExit(kwargs.get("msg"))
+
+
+def run(options):
+    server = zia_mock_server.start(
+        throttle_rate=options.throttle_rate, retry_after=options.retry_after
+    )
+    cache_dir = tempfile.mkdtemp(prefix="zia-ratelimit-")
+    os.environ.update(
+        CREDENTIALS,
+        ZIA_OVERRIDE_URL="http://127.0.0.1:%d/api/v1" % server.server_port,
+        ZIA_CACHE_DIR=cache_dir,
+        ZIA_METRICS="true",
+        ZIA_RATE_LIMIT="true",
+        ZIA_RATE_LIMIT_GET="1000",
+        ZIA_RATE_LIMIT_MAX_RETRIES=str(options.max_retries),
+        ZIA_PERSISTENT_CONNECTION=str(options.persistent_connection).lower(),
+    )
+    sys.path[:0] = _collection_paths()
+    from ansible_collections.zscaler.ziacloud.plugins.module_utils import (
+        zia_ratelimit,
+    )
+    from ansible_collections.zscaler.ziacloud.plugins.module_utils.zia_client import (
+        ZIAClientHelper,
+    )
+
+    pauses = []
+    pause = zia_ratelimit.ZIARequestScheduler.pause
+
+    def counted_pause(self, seconds):
+        pauses.append(seconds)
+        pause(self, seconds)
+
+    zia_ratelimit.ZIARequestScheduler.pause = counted_pause
+    try:
+        client = ZIAClientHelper(_Module())
+        before = json.loads(json.dumps(server.tenant.stats))
+        # Distinct queries, the SDK caches the responses of GET requests
+        statuses = [
+            client.send("GET", "ruleLabels", params={"search": str(i)}).status_code
+            for i in range(options.calls)
+        ]
+        after = server.tenant.stats
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    summary = client.metrics.summary()
+    return {
+        "calls": options.calls,
+        # Requests answered by the mock, the rate limited ones and the login
+        # of the persistent connection daemon are not counted
+        "served": after["by_endpoint"].get(ENDPOINT, 0)
+        - before["by_endpoint"].get(ENDPOINT, 0),
+        "throttled": after["throttled"] - before["throttled"],
+        "pauses": len(pauses),
+        "metrics_retries": sum(call["retries"] for call in summary["calls"]),
+        "metrics_throttled": summary["throttled"],
+        "failed_calls": sum(1 for status in statuses if status != 200),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--calls", type=int, default=20, help="requests sent (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--throttle-rate",
+        type=float,
+        default=0.5,
+        help="share of the requests answered with 429 (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--retry-after",
+        type=int,
+        default=0,
+        help="Retry-After of the 429 responses in seconds (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=10,
+        help="retries of a rate limited request (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--persistent-connection",
+        action="store_true",
+        help="send the requests through the persistent connection daemon",
+    )
+    options = parser.parse_args()
+
+    result = run(options)
+    problems = []
+    if not result["throttled"]:
+        problems.append("no request was rate limited, raise --throttle-rate")
+    if result["served"] != result["calls"]:
+        problems.append("%(served)d requests served for %(calls)d calls" % result)
+    if result["metrics_retries"] != result["throttled"]:
+        problems.append("rate limited requests were retried outside of the scheduler")
+    if result["pauses"] < result["throttled"]:
+        problems.append("rate limited requests did not pause the scheduler")
+    if result["metrics_throttled"] != result["throttled"]:
+        problems.append("the metrics do not count every rate limited request")
+    if result["failed_calls"]:
+        problems.append("requests still rate limited after the retries")
+    print(json.dumps(result, indent=2, sort_keys=True))
+    for problem in problems:
+        print("FAILED: %s" % problem, file=sys.stderr)
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,482 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                              MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Benchmarks of the collection's modules against the local mock ZIA API.
+
+For every dataset size, the mock tenant is seeded with that many users, rules
+and custom URL categories. Each scenario then runs a module's ``main()`` for
+its phases (create, no-op, update and delete for resource modules, read for
+info modules) and records the wall time, the number of API calls, the bytes
+exchanged with the API and the peak RSS of the module process.
+
+Every module run happens in a fresh interpreter, like an Ansible task, so
+in-process caches never carry over between runs.
+
+    python tests/benchmarks/run_benchmarks.py --sizes 1000,10000 --output bench.json
+    python tests/benchmarks/run_benchmarks.py --baseline bench.json --threshold 0.2
+
+The collection must be importable as ``ansible_collections.zscaler.ziacloud``,
+either from its checkout location or through ``ANSIBLE_COLLECTIONS_PATH``.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import platform
+import queue as queue_module
+import shutil
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(os.path.dirname(HERE))
+sys.path.insert(0, os.path.join(ROOT, "tests", "mock"))
+
+import zia_mock_server  # noqa: E402
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+URLS_PER_CATEGORY = 10
+CREDENTIALS = {
+    "ZIA_USERNAME": "benchmark@example.com",
+    "ZIA_PASSWORD": "benchmark",
+    "ZIA_API_KEY": "abcdefghijkl",
+    "ZIA_CLOUD": "zscaler",
+}
+
+
+# Value of ``changed`` each phase of a resource module must report, a run
+# that does not is a failure rather than a timing of the wrong code path
+EXPECTED_CHANGED = {"create": True, "noop": False, "update": True, "delete": True}
+
+
+def _resource(name, create, update, absent=None):
+    """Create, no-op, update and delete phases of a resource module."""
+    absent = dict(absent or create, state="absent")
+    return (
+        name,
+        [
+            ("create", dict(create, state="present")),
+            ("noop", dict(create, state="present")),
+            ("update", dict(create, state="present", **update)),
+            ("delete", absent),
+        ],
+    )
+
+
+def scenarios(size):
+    """Returns (module, [(phase, module args)]) tuples for a dataset size."""
+    last_user = "User %d" % (size - 1)
+    last_location = "Location %d" % (max(size // 10, 1) - 1)
+    return [
+        _resource(
+            "zia_rule_labels",
+            {"name": "bench_label", "description": "benchmark"},
+            {"description": "benchmark update"},
+        ),
+        _resource(
+            "zia_cloud_firewall_ip_source_groups",
+            {
+                "name": "bench_source_group",
+                "description": "benchmark",
+                "ip_addresses": ["192.0.2.1", "192.0.2.2"],
+            },
+            {"description": "benchmark update"},
+        ),
+        _resource(
+            "zia_cloud_firewall_filtering_rule",
+            {
+                "name": "bench_firewall_rule",
+                "description": "benchmark",
+                "order": 1,
+                "action": "ALLOW",
+                "enabled": True,
+                "src_ips": ["192.0.2.0/24"],
+            },
+            {"action": "BLOCK_DROP"},
+        ),
+        _resource(
+            "zia_url_filtering_rules",
+            {
+                "name": "bench_url_rule",
+                "description": "benchmark",
+                "order": 1,
+                "action": "ALLOW",
+                "enabled": True,
+                "url_categories": ["ANY"],
+                "protocols": ["ANY_RULE"],
+            },
+            {"action": "BLOCK"},
+        ),
+        _resource(
+            "zia_url_categories",
+            {
+                "configured_name": "bench_category",
+                "description": "benchmark",
+                "super_category": "USER_DEFINED",
+                "type": "URL_CATEGORY",
+                "custom_category": True,
+                "urls": ["bench%d.example.com" % i for i in range(100)],
+            },
+            {"urls": ["bench%d.example.com" % i for i in range(101)]},
+            {"configured_name": "bench_category"},
+        ),
+        _resource(
+            "zia_traffic_forwarding_static_ip",
+            {"ip_address": "203.0.113.10", "comment": "benchmark"},
+            {"comment": "benchmark update"},
+        ),
+        (
+            "zia_user_management_info",
+            [("read", {}), ("read_name", {"name": last_user})],
+        ),
+        ("zia_location_management_info", [("read_name", {"name": last_location})]),
+        ("zia_url_categories_info", [("read", {"custom_only": True})]),
+        (
+            "zia_traffic_forwarding_static_ip_info",
+            [("read", {}), ("read_ip", {"ip_address": "198.18.0.5"})],
+        ),
+    ]
+
+
+def _collection_paths():
+    """Directories that make ``ansible_collections.zscaler.ziacloud`` importable."""
+    paths = []
+    parts = ROOT.split(os.sep)
+    if parts[-3:-1] == ["ansible_collections", "zscaler"]:
+        paths.append(os.sep.join(parts[:-3]))
+    for path in os.environ.get("ANSIBLE_COLLECTIONS_PATH", "").split(os.pathsep):
+        if path:
+            path = os.path.expanduser(path)
+            if os.path.basename(path.rstrip(os.sep)) == "ansible_collections":
+                path = os.path.dirname(path.rstrip(os.sep))
+            paths.append(path)
+    return paths
+
+
+def _peak_rss():
+    """Peak RSS of the current process in KB."""
+    # ru_maxrss survives exec on Linux and would report the benchmark's own
+    # peak, the high water mark of the process' memory map does not.
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except (IOError, OSError):
+        pass
+    import resource
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak_rss // 1024 if sys.platform == "darwin" else peak_rss
+
+
+def _run_module(module_name, args, env, queue):
+    """Runs a module in the current (child) process and reports its metrics."""
+    # The result is read from stdout, like Ansible does. The SDK logs every
+    # cache access as a warning on stderr.
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 2)
+    os.environ.update(env)
+    sys.path[:0] = _collection_paths()
+
+    started = time.time()
+    import importlib
+
+    try:
+        from ansible.module_utils import basic
+
+        module = importlib.import_module(
+            "ansible_collections.zscaler.ziacloud.plugins.modules." + module_name
+        )
+    except ImportError as e:
+        queue.put({"failed": True, "msg": "Cannot import the module: %s" % e})
+        return
+    imported = time.time()
+
+    basic._ANSIBLE_ARGS = json.dumps({"ANSIBLE_MODULE_ARGS": args}).encode("utf-8")
+    if hasattr(basic, "_ANSIBLE_PROFILE"):
+        basic._ANSIBLE_PROFILE = "legacy"
+    stdout, sys.stdout = sys.stdout, io.StringIO()
+    try:
+        module.main()
+    except SystemExit:
+        pass
+    except Exception as e:
+        sys.stdout.write(json.dumps({"failed": True, "msg": repr(e)}))
+    finally:
+        output, sys.stdout = sys.stdout.getvalue(), stdout
+    finished = time.time()
+
+    try:
+        result = json.loads(output.strip().splitlines()[-1])
+    except (ValueError, IndexError):
+        result = {"failed": True, "msg": output[-500:]}
+
+    queue.put(
+        {
+            "import_time": imported - started,
+            "wall_time": finished - imported,
+            "peak_rss_kb": _peak_rss(),
+            "changed": result.get("changed"),
+            "failed": bool(result.get("failed")),
+            "msg": result.get("msg"),
+        }
+    )
+
+
+def _stats(server):
+    with server.tenant.lock:
+        return json.loads(json.dumps(server.tenant.stats))
+
+
+def run_phase(server, module_name, phase, args, env, timeout):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    before = _stats(server)
+    process = ctx.Process(target=_run_module, args=(module_name, args, env, queue))
+    process.start()
+    deadline = time.time() + timeout
+    metrics = None
+    while metrics is None:
+        try:
+            metrics = queue.get(timeout=1)
+        except queue_module.Empty:
+            if not process.is_alive():
+                metrics = {"failed": True, "msg": "exited with %s" % process.exitcode}
+            elif time.time() > deadline:
+                process.terminate()
+                metrics = {"failed": True, "msg": "timed out after %ss" % timeout}
+    process.join()
+    after = _stats(server)
+    expected = EXPECTED_CHANGED.get(phase)
+    if not metrics["failed"] and expected is not None:
+        if metrics.get("changed") != expected:
+            metrics["failed"] = True
+            metrics["msg"] = "expected changed=%s, got changed=%s" % (
+                expected,
+                metrics.get("changed"),
+            )
+
+    calls = {}
+    for key, count in after["by_endpoint"].items():
+        delta = count - before["by_endpoint"].get(key, 0)
+        if delta:
+            calls[key] = delta
+    metrics.update(
+        module=module_name,
+        phase=phase,
+        api_calls=after["requests"] - before["requests"],
+        api_calls_by_endpoint=calls,
+        bytes_sent=after["bytes_received"] - before["bytes_received"],
+        bytes_received=after["bytes_sent"] - before["bytes_sent"],
+        throttled=after["throttled"] - before["throttled"],
+    )
+    return metrics
+
+
+def run(options):
+    results = []
+    modules = set(options.modules or [])
+    for size in options.sizes:
+        server = zia_mock_server.start(
+            dataset_size=size,
+            urls_per_category=URLS_PER_CATEGORY,
+            rule_count=size,
+            category_count=size,
+            latency=options.latency,
+        )
+        cache_dir = tempfile.mkdtemp(prefix="zia-bench-")
+        env = dict(
+            CREDENTIALS,
+            ZIA_OVERRIDE_URL="http://127.0.0.1:%d/api/v1" % server.server_port,
+            ZIA_CACHE_DIR=cache_dir,
+            ZIA_RATE_LIMIT_GET=str(options.rate_limit),
+            ZIA_RATE_LIMIT_WRITE=str(options.rate_limit),
+        )
+        try:
+            for module_name, phases in scenarios(size):
+                if modules and module_name not in modules:
+                    continue
+                for phase, args in phases:
+                    metrics = run_phase(
+                        server, module_name, phase, args, env, options.timeout
+                    )
+                    metrics["size"] = size
+                    results.append(metrics)
+                    print(
+                        "%7d %-40s %-9s %8.2fs %6d calls %10d bytes %8d KB%s"
+                        % (
+                            size,
+                            module_name,
+                            phase,
+                            metrics.get("wall_time", 0),
+                            metrics["api_calls"],
+                            metrics["bytes_sent"] + metrics["bytes_received"],
+                            metrics.get("peak_rss_kb", 0),
+                            (
+                                "  FAILED: %s" % metrics["msg"]
+                                if metrics["failed"]
+                                else ""
+                            ),
+                        ),
+                        file=sys.stderr,
+                    )
+        finally:
+            server.shutdown()
+            server.server_close()
+            shutil.rmtree(cache_dir, ignore_errors=True)
+    return results
+
+
+def _environment():
+    versions = {"python": platform.python_version()}
+    try:
+        from ansible import release
+
+        versions["ansible_core"] = release.__version__
+    except ImportError:
+        pass
+    try:
+        import zscaler
+
+        versions["zscaler"] = zscaler.__version__
+    except ImportError:
+        pass
+    with open(os.path.join(ROOT, "galaxy.yml")) as f:
+        for line in f:
+            if line.startswith("version:"):
+                versions["collection"] = line.split(":", 1)[1].strip().strip("\"'")
+    return versions
+
+
+def compare(results, baseline, threshold):
+    """Prints the runs that got slower or chattier than the baseline, returns their count."""
+    previous = dict(
+        ((r["size"], r["module"], r["phase"]), r) for r in baseline.get("results", [])
+    )
+    regressions = 0
+    for result in results:
+        old = previous.get((result["size"], result["module"], result["phase"]))
+        if old is None or old.get("failed") or result.get("failed"):
+            continue
+        reasons = []
+        if result["api_calls"] > old["api_calls"]:
+            reasons.append(
+                "api calls %d -> %d" % (old["api_calls"], result["api_calls"])
+            )
+        if (
+            result["wall_time"] > old["wall_time"] * (1 + threshold)
+            and result["wall_time"] - old["wall_time"] > 0.1
+        ):
+            reasons.append(
+                "wall time %.2fs -> %.2fs" % (old["wall_time"], result["wall_time"])
+            )
+        if reasons:
+            regressions += 1
+            print(
+                "REGRESSION %d %s %s: %s"
+                % (
+                    result["size"],
+                    result["module"],
+                    result["phase"],
+                    ", ".join(reasons),
+                ),
+                file=sys.stderr,
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="comma separated dataset sizes (default: %(default)s)",
+    )
+    parser.add_argument("--modules", nargs="*", help="only run these modules")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="mock API latency in seconds"
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=1000,
+        help="requests per second allowed by the collection's scheduler (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--timeout", type=int, default=900, help="seconds allowed per module run"
+    )
+    parser.add_argument(
+        "--output", help="write the JSON report to this file instead of stdout"
+    )
+    parser.add_argument(
+        "--baseline", help="JSON report of a previous run to compare with"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="relative wall time increase reported as a regression (default: %(default)s)",
+    )
+    options = parser.parse_args()
+    options.sizes = [int(size) for size in options.sizes.split(",") if size]
+
+    started = time.time()
+    results = run(options)
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(started)),
+        "duration": time.time() - started,
+        "environment": _environment(),
+        "options": {
+            "sizes": options.sizes,
+            "latency": options.latency,
+            "rate_limit": options.rate_limit,
+        },
+        "results": results,
+    }
+    data = json.dumps(report, indent=2, sort_keys=True)
+    if options.output:
+        with open(options.output, "w") as f:
+            f.write(data + "\n")
+    else:
+        print(data)
+
+    failed = sum(1 for result in results if result["failed"])
+    regressions = 0
+    if options.baseline:
+        with open(options.baseline) as f:
+            regressions = compare(results, json.load(f), options.threshold)
+    sys.exit(1 if failed or regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
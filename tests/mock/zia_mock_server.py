@@ -0,0 +1,1053 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Zscaler Inc, <devrel@zscaler.com>
+
+#                              MIT License
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Local stand-in for the ZIA API, for offline integration and performance tests.
+
+The server keeps an in-memory tenant and emulates the endpoints used by the
+collection: authentication, activation, firewall, URL filtering, forwarding
+control and DLP rules, URL categories, DLP objects, locations and
+sub-locations, users, groups, departments and traffic forwarding (static IPs,
+GRE tunnels, VIPs and VPN credentials). Paths it does not model are served by
+a generic store, so every module gets a plausible answer.
+
+Point the modules at it with the SDK's override URL; any credentials are
+accepted:
+
+    python tests/mock/zia_mock_server.py --port 8080 --dataset-size 5000
+    export ZIA_OVERRIDE_URL=http://127.0.0.1:8080/api/v1
+    export ZIA_USERNAME=admin@example.com ZIA_PASSWORD=x ZIA_API_KEY=abcdefghijkl ZIA_CLOUD=zscaler
+
+``--latency`` delays every response, ``--max-rps`` answers ``429`` with
+``Retry-After`` above the given rate and ``--throttle-rate`` answers ``429`` to
+a random share of the requests. ``GET /__mock__/stats`` returns the request
+counters and ``POST /__mock__/reset`` restores the seeded dataset.
+
+The server can also be started in-process:
+
+    server = start(port=0, dataset_size=1000)
+    url = "http://127.0.0.1:%d/api/v1" % server.server_port
+    ...
+    server.shutdown()
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import binascii
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+API_PREFIX = "/api/v1/"
+ADMIN_PREFIX = "/__mock__/"
+
+# collection path -> (paginated, search fields, ordered rules)
+COLLECTIONS = {
+    "firewallFilteringRules": (False, ("name",), True),
+    "urlFilteringRules": (False, ("name",), True),
+    "forwardingRules": (False, ("name",), True),
+    "webDlpRules": (False, ("name",), True),
+    "ruleLabels": (True, ("name",), False),
+    "ipSourceGroups": (False, ("name",), False),
+    "ipDestinationGroups": (False, ("name",), False),
+    "networkServices": (False, ("name",), False),
+    "networkServiceGroups": (False, ("name",), False),
+    "networkApplicationGroups": (False, ("name",), False),
+    "timeWindows": (False, ("name",), False),
+    "dlpDictionaries": (False, ("name",), False),
+    "dlpEngines": (False, ("name",), False),
+    "dlpNotificationTemplates": (False, ("name",), False),
+    "icapServers": (False, ("name",), False),
+    "incidentReceiverServers": (False, ("name",), False),
+    "locations": (True, ("name",), False),
+    "locations/groups": (True, ("name",), False),
+    "users": (True, ("name",), False),
+    "groups": (True, ("name", "comments"), False),
+    "departments": (True, ("name", "comments"), False),
+    "staticIP": (True, ("ipAddress",), False),
+    "greTunnels": (True, ("sourceIp",), False),
+    "vpnCredentials": (True, ("fqdn", "ipAddress"), False),
+    "vips": (True, ("city", "datacenter"), False),
+    "zpaGateways": (False, ("name",), False),
+}
+
+# Attribute that must be unique within a collection, "name" otherwise
+UNIQUE_KEYS = {
+    "staticIP": "ipAddress",
+    "greTunnels": "sourceIp",
+    "vips": "virtualIp",
+}
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 10000
+ACTIVATION_DELAY = 1.0
+URL_CATEGORY_LISTS = (
+    "urls",
+    "dbCategorizedUrls",
+    "keywords",
+    "keywordsRetainingParentCategory",
+    "ipRanges",
+    "ipRangesRetainingParentCategory",
+)
+
+
+class MockError(Exception):
+    def __init__(self, status, code, message=""):
+        super(MockError, self).__init__(message)
+        self.status = status
+        self.body = {"code": code, "message": message}
+
+
+class MockTenant:
+    """In-memory state of the emulated tenant."""
+
+    def __init__(
+        self,
+        dataset_size=100,
+        urls_per_category=100,
+        seed=0,
+        rule_count=None,
+        category_count=3,
+    ):
+        self.dataset_size = dataset_size
+        self.urls_per_category = urls_per_category
+        self.rule_count = (
+            rule_count if rule_count is not None else min(dataset_size // 50, 200) or 1
+        )
+        self.category_count = category_count
+        self.seed = seed
+        self.lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.collections = dict((name, {}) for name in COLLECTIONS)
+            self.url_categories = {}
+            self.cloud_app_rules = {}
+            self.documents = {}
+            self.sessions = set()
+            self.next_id = 1000
+            self.status = "ACTIVE"
+            self.activated_at = None
+            self.stats = {
+                "requests": 0,
+                "throttled": 0,
+                "bytes_received": 0,
+                "bytes_sent": 0,
+                "by_endpoint": {},
+            }
+            self._seed()
+
+    # Dataset
+
+    def _new_id(self):
+        self.next_id += 1
+        return self.next_id
+
+    def _add(self, collection, obj):
+        obj.setdefault("id", self._new_id())
+        self.collections[collection][str(obj["id"])] = obj
+        return obj
+
+    def _seed(self):
+        rnd = random.Random(self.seed)
+        size = self.dataset_size
+        departments = [
+            self._add("departments", {"name": "Department %d" % i})
+            for i in range(max(size // 50, 1))
+        ]
+        groups = [
+            self._add("groups", {"name": "Group %d" % i, "comments": ""})
+            for i in range(max(size // 50, 1))
+        ]
+        for i in range(size):
+            department = departments[i % len(departments)]
+            group = groups[i % len(groups)]
+            self._add(
+                "users",
+                {
+                    "name": "User %d" % i,
+                    "email": "user%d@example.com" % i,
+                    "department": {"id": department["id"], "name": department["name"]},
+                    "groups": [{"id": group["id"], "name": group["name"]}],
+                    "adminUser": False,
+                },
+            )
+        countries = (
+            ("UNITED_STATES", "UNITED_STATES_AMERICA_LOS_ANGELES"),
+            ("GERMANY", "GERMANY_EUROPE_BERLIN"),
+            ("JAPAN", "JAPAN_ASIA_TOKYO"),
+        )
+        for i in range(max(size // 10, 1)):
+            ip_address = "198.%d.%d.%d" % (18 + i // 65536, (i // 256) % 256, i % 256)
+            static_ip = self._add(
+                "staticIP",
+                {"ipAddress": ip_address, "geoOverride": False, "comment": ""},
+            )
+            country, tz = countries[i % len(countries)]
+            location = self._add(
+                "locations",
+                {
+                    "name": "Location %d" % i,
+                    "country": country,
+                    "tz": tz,
+                    "profile": "SERVER" if i % 4 == 3 else "CORPORATE",
+                    "ipAddresses": [static_ip["ipAddress"]],
+                    "authRequired": False,
+                },
+            )
+            if i % 5 == 0:
+                self._add(
+                    "locations",
+                    {
+                        "name": "Guest Wi-Fi",
+                        "parentId": location["id"],
+                        "country": country,
+                        "tz": tz,
+                        "profile": "GUESTWIFI",
+                        "ipAddresses": [
+                            "10.%d.%d.0-10.%d.%d.255"
+                            % ((i // 256) % 256, i % 256, (i // 256) % 256, i % 256)
+                        ],
+                        "authRequired": False,
+                    },
+                )
+            if i % 10 == 0:
+                self._add(
+                    "greTunnels",
+                    {
+                        "sourceIp": ip_address,
+                        "comment": "",
+                        "withinCountry": False,
+                        "ipUnnumbered": True,
+                    },
+                )
+        for i in range(8):
+            self._add(
+                "vips",
+                {
+                    "cloudName": "zscaler.net",
+                    "datacenter": "DC%d" % i,
+                    "region": "Americas",
+                    "city": "City %d" % i,
+                    "virtualIp": "165.225.%d.1" % i,
+                    "greDomainName": "gre%d.example.net" % i,
+                    "latitude": 37.0 + i,
+                    "longitude": -122.0 - i,
+                },
+            )
+        for name in ("Work hours", "Weekends", "Off hours"):
+            self._add("timeWindows", {"name": name, "dayOfWeek": ["EVERYDAY"]})
+        for collection in ("firewallFilteringRules", "urlFilteringRules"):
+            for i in range(self.rule_count):
+                rule = {
+                    "name": "Rule %d" % i,
+                    "order": i + 1,
+                    "rank": 7,
+                    "state": "ENABLED",
+                    "action": (
+                        rnd.choice(["ALLOW", "BLOCK"])
+                        if collection == "urlFilteringRules"
+                        else rnd.choice(["ALLOW", "BLOCK_DROP"])
+                    ),
+                }
+                if collection == "urlFilteringRules":
+                    rule["protocols"] = ["ANY_RULE"]
+                self._add(collection, rule)
+        for i in range(self.category_count):
+            category_id = "CUSTOM_%02d" % (i + 1)
+            self.url_categories[category_id] = {
+                "id": category_id,
+                "configuredName": "Custom Category %d" % i,
+                "superCategory": "USER_DEFINED",
+                "customCategory": True,
+                "editable": True,
+                "type": "URL_CATEGORY",
+                "urls": [
+                    "site%d-%d.example.com" % (i, n)
+                    for n in range(self.urls_per_category)
+                ],
+                "dbCategorizedUrls": [],
+                "keywords": [],
+                "keywordsRetainingParentCategory": [],
+                "ipRanges": [],
+                "ipRangesRetainingParentCategory": [],
+            }
+        for category_id in (
+            "OTHER_ADULT_MATERIAL",
+            "SOCIAL_NETWORKING",
+            "NEWS_AND_MEDIA",
+        ):
+            self.url_categories[category_id] = {
+                "id": category_id,
+                "superCategory": "USER_DEFINED",
+                "customCategory": False,
+                "editable": True,
+                "type": "URL_CATEGORY",
+                "urls": [],
+                "dbCategorizedUrls": [],
+            }
+
+    # Helpers
+
+    def record(self, method, endpoint):
+        key = "%s %s" % (method, endpoint)
+        self.stats["requests"] += 1
+        self.stats["by_endpoint"][key] = self.stats["by_endpoint"].get(key, 0) + 1
+
+    def changed(self):
+        self.status = "PENDING"
+
+    def activation_status(self):
+        if (
+            self.status == "INPROGRESS"
+            and time.time() - self.activated_at >= ACTIVATION_DELAY
+        ):
+            self.status = "ACTIVE"
+        return self.status
+
+    @staticmethod
+    def _paginate(items, query, paginated):
+        if not paginated:
+            return items
+        try:
+            page = int(query.get("page", 1))
+            page_size = int(query.get("pageSize", DEFAULT_PAGE_SIZE))
+        except ValueError:
+            raise MockError(400, "INVALID_INPUT_ARGUMENT", "invalid paging parameters")
+        page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+        start = (max(page, 1) - 1) * page_size
+        return items[start : start + page_size]
+
+    @staticmethod
+    def _matches(obj, fields, needle):
+        needle = needle.lower()
+        for field in fields:
+            value = obj.get(field)
+            if isinstance(value, str) and needle in value.lower():
+                return True
+        return False
+
+    def _reorder(self, collection, rule):
+        """Moves a rule to its order and renumbers the rules after it, like ZIA."""
+        rules = sorted(
+            (
+                r
+                for r in self.collections[collection].values()
+                if r is not rule and r.get("order", 0) > 0
+            ),
+            key=lambda r: r["order"],
+        )
+        position = max(min(int(rule.get("order") or len(rules) + 1), len(rules) + 1), 1)
+        rules.insert(position - 1, rule)
+        for index, item in enumerate(rules):
+            item["order"] = index + 1
+
+    def _check_unique(self, collection, obj, exclude=None):
+        key = UNIQUE_KEYS.get(collection, "name")
+        value = obj.get(key)
+        if not value:
+            return
+        for other in self.collections[collection].values():
+            if other.get(key) == value and other is not exclude:
+                raise MockError(
+                    409,
+                    "DUPLICATE_ITEM",
+                    "%s '%s' already exists" % (collection, value),
+                )
+
+    # Generic collections
+
+    def list_collection(self, collection, query):
+        paginated, search_fields, ordered = COLLECTIONS[collection]
+        items = list(self.collections[collection].values())
+        if ordered:
+            items.sort(key=lambda r: r.get("order", 0))
+        search = query.get("search") or (
+            query.get("name") if collection == "users" else None
+        )
+        if collection == "staticIP" and query.get("ipAddress"):
+            search = query.get("ipAddress")
+        if search:
+            items = [obj for obj in items if self._matches(obj, search_fields, search)]
+        if collection == "locations":
+            # Sub-locations are listed with their parent only
+            items = [obj for obj in items if not obj.get("parentId")]
+        if collection == "users":
+            if query.get("dept"):
+                items = [
+                    u
+                    for u in items
+                    if (u.get("department") or {})
+                    .get("name", "")
+                    .startswith(query["dept"])
+                ]
+            if query.get("group"):
+                items = [
+                    u
+                    for u in items
+                    if any(
+                        g.get("name", "").startswith(query["group"])
+                        for g in u.get("groups") or []
+                    )
+                ]
+        return self._paginate(items, query, paginated)
+
+    def list_locations_lite(self, query):
+        locations = list(self.collections["locations"].values())
+        parents = set(obj.get("parentId") for obj in locations)
+        include_subs = query.get("includeSubLocations") == "true"
+        include_parents = query.get("includeParentLocations") == "true"
+        items = [
+            {"id": obj["id"], "name": obj["name"], "parentId": obj.get("parentId", 0)}
+            for obj in locations
+            if (include_subs or not obj.get("parentId"))
+            and (include_parents or obj["id"] not in parents)
+        ]
+        return self._paginate(items, query, True)
+
+    def list_sub_locations(self, parent_id, query):
+        self.get_object("locations", parent_id)
+        items = [
+            obj
+            for obj in self.collections["locations"].values()
+            if str(obj.get("parentId")) == parent_id
+        ]
+        return self._paginate(items, query, True)
+
+    def get_object(self, collection, obj_id):
+        obj = self.collections[collection].get(obj_id)
+        if obj is None:
+            raise MockError(
+                404, "RESOURCE_NOT_FOUND", "%s %s not found" % (collection, obj_id)
+            )
+        return obj
+
+    def create_object(self, collection, body):
+        if not isinstance(body, dict):
+            raise MockError(400, "INVALID_INPUT_ARGUMENT", "a JSON object is required")
+        self._check_unique(collection, body)
+        obj = dict(body)
+        obj["id"] = self._new_id()
+        self.collections[collection][str(obj["id"])] = obj
+        if COLLECTIONS[collection][2]:
+            self._reorder(collection, obj)
+        self.changed()
+        return obj
+
+    def update_object(self, collection, obj_id, body):
+        current = self.get_object(collection, obj_id)
+        if not isinstance(body, dict):
+            raise MockError(400, "INVALID_INPUT_ARGUMENT", "a JSON object is required")
+        self._check_unique(collection, body, exclude=current)
+        obj = dict(body)
+        obj["id"] = current["id"]
+        self.collections[collection][obj_id] = obj
+        if COLLECTIONS[collection][2]:
+            self._reorder(collection, obj)
+        self.changed()
+        return obj
+
+    def delete_object(self, collection, obj_id):
+        self.get_object(collection, obj_id)
+        del self.collections[collection][obj_id]
+        if COLLECTIONS[collection][2]:
+            rules = sorted(
+                (
+                    r
+                    for r in self.collections[collection].values()
+                    if r.get("order", 0) > 0
+                ),
+                key=lambda r: r["order"],
+            )
+            for index, rule in enumerate(rules):
+                rule["order"] = index + 1
+        self.changed()
+
+    # URL categories
+
+    def list_url_categories(self, query):
+        items = list(self.url_categories.values())
+        if query.get("customOnly", "false").lower() == "true":
+            items = [c for c in items if c.get("customCategory")]
+        if query.get("includeOnlyUrlKeywordCounts", "false").lower() == "true":
+            counted = []
+            for category in items:
+                category = dict(category)
+                category["customUrlsCount"] = len(category.pop("urls", None) or [])
+                category["urlsRetainingParentCategoryCount"] = len(
+                    category.pop("dbCategorizedUrls", None) or []
+                )
+                counted.append(category)
+            items = counted
+        return items
+
+    def get_url_category(self, category_id):
+        category = self.url_categories.get(category_id)
+        if category is None:
+            raise MockError(
+                404, "RESOURCE_NOT_FOUND", "URL category %s not found" % category_id
+            )
+        return category
+
+    def create_url_category(self, body):
+        for category in self.url_categories.values():
+            if body.get("configuredName") and category.get(
+                "configuredName"
+            ) == body.get("configuredName"):
+                raise MockError(409, "DUPLICATE_ITEM", "URL category already exists")
+        number = 1
+        while "CUSTOM_%02d" % number in self.url_categories:
+            number += 1
+        category = dict(body)
+        category["id"] = "CUSTOM_%02d" % number
+        category.setdefault("customCategory", True)
+        category.setdefault("editable", True)
+        self.url_categories[category["id"]] = category
+        self.changed()
+        return category
+
+    def update_url_category(self, category_id, body, action):
+        category = self.get_url_category(category_id)
+        if action == "ADD_TO_LIST":
+            for key in URL_CATEGORY_LISTS:
+                if body.get(key):
+                    existing = category.setdefault(key, [])
+                    present = set(existing)
+                    existing.extend(v for v in body[key] if v not in present)
+        elif action == "REMOVE_FROM_LIST":
+            for key in URL_CATEGORY_LISTS:
+                if body.get(key):
+                    removed = set(body[key])
+                    category[key] = [
+                        v for v in category.get(key) or [] if v not in removed
+                    ]
+        elif action:
+            raise MockError(400, "INVALID_INPUT_ARGUMENT", "unknown action %s" % action)
+        else:
+            category = dict(body)
+            category["id"] = category_id
+            self.url_categories[category_id] = category
+        self.changed()
+        return category
+
+    def delete_url_category(self, category_id):
+        self.get_url_category(category_id)
+        del self.url_categories[category_id]
+        self.changed()
+
+    def available_gre_ranges(self, limit):
+        """Free /29 internal ranges of numbered GRE tunnels, in 172.17.0.0/16."""
+        used = set(
+            t.get("internalIpRange", "").split("-")[0]
+            for t in self.collections["greTunnels"].values()
+        )
+        ranges = []
+        for i in range(8192):
+            start = "172.17.%d.%d" % (i // 32, (i % 32) * 8)
+            if start in used:
+                continue
+            end = "172.17.%d.%d" % (i // 32, (i % 32) * 8 + 7)
+            ranges.append({"startIpAddress": start, "endIpAddress": end})
+            if len(ranges) >= limit:
+                break
+        return ranges
+
+    # Cloud app control rules, partitioned by rule type
+
+    def cloud_app_rules_of(self, rule_type):
+        return self.cloud_app_rules.setdefault(rule_type, {})
+
+    # Documents: settings and paths without a dedicated model
+
+    def document(self, path):
+        return self.documents.get(path)
+
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    server_version = "ZIAMock/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            BaseHTTPRequestHandler.log_message(self, fmt, *args)
+
+    def _reply(self, status, body=None, headers=None):
+        data = b"" if body is None else json.dumps(body).encode("utf-8")
+        with self.server.tenant.lock:
+            self.server.tenant.stats["bytes_sent"] += len(data)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return None
+        raw = self.rfile.read(length)
+        with self.server.tenant.lock:
+            self.server.tenant.stats["bytes_received"] += length
+        try:
+            return json.loads(raw.decode("utf-8"))
+        except ValueError:
+            raise MockError(400, "INVALID_INPUT_ARGUMENT", "invalid JSON body")
+
+    def _session(self):
+        cookie = self.headers.get("Cookie") or ""
+        for part in cookie.split(";"):
+            key, _, value = part.strip().partition("=")
+            if key == "JSESSIONID":
+                return value
+        return None
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    def _handle(self, method):
+        server = self.server
+        url = urlparse(self.path)
+        query = dict((k, v[-1]) for k, v in parse_qs(url.query).items())
+        try:
+            body = self._body()
+        except MockError as e:
+            return self._reply(e.status, e.body)
+
+        if url.path.startswith(ADMIN_PREFIX):
+            return self._admin(method, url.path[len(ADMIN_PREFIX) :])
+        if not url.path.startswith(API_PREFIX):
+            return self._reply(404, {"code": "RESOURCE_NOT_FOUND"})
+        path = url.path[len(API_PREFIX) :].strip("/")
+
+        if server.latency:
+            time.sleep(server.latency)
+        if server.throttled():
+            with server.tenant.lock:
+                server.tenant.stats["throttled"] += 1
+            return self._reply(
+                429,
+                {
+                    "code": "RATE_LIMIT_EXCEEDED",
+                    "message": "Rate Limit (1/SECOND) exceeded",
+                },
+                {"Retry-After": str(server.retry_after)},
+            )
+
+        tenant = server.tenant
+        with tenant.lock:
+            try:
+                if path == "authenticatedSession":
+                    return self._authenticate(method, body)
+                if self._session() not in tenant.sessions:
+                    raise MockError(
+                        401, "AUTHENTICATION_FAILED", "session is not valid"
+                    )
+                status, result = self._dispatch(method, path, query, body)
+            except MockError as e:
+                tenant.record(method, path.split("/")[0])
+                return self._reply(e.status, e.body)
+            tenant.record(method, path.split("/")[0])
+        self._reply(status, result)
+
+    def _admin(self, method, path):
+        tenant = self.server.tenant
+        with tenant.lock:
+            if method == "GET" and path == "stats":
+                return self._reply(200, tenant.stats)
+            if method == "POST" and path == "reset":
+                tenant.reset()
+                return self._reply(204)
+        self._reply(404, {"code": "RESOURCE_NOT_FOUND"})
+
+    def _authenticate(self, method, body):
+        tenant = self.server.tenant
+        tenant.record(method, "authenticatedSession")
+        if method == "POST":
+            if (
+                not isinstance(body, dict)
+                or not body.get("username")
+                or not body.get("apiKey")
+            ):
+                raise MockError(
+                    400, "INVALID_INPUT_ARGUMENT", "username and apiKey are required"
+                )
+            session = binascii.hexlify(os.urandom(16)).decode("ascii").upper()
+            tenant.sessions.add(session)
+            self._reply(
+                200,
+                {
+                    "authType": "ADMIN_LOGIN",
+                    "obfuscateApiKey": False,
+                    "passwordExpiryTime": 0,
+                    "passwordExpiryDays": 0,
+                },
+                {"Set-Cookie": "JSESSIONID=%s; Path=/; Secure; HttpOnly" % session},
+            )
+        elif method == "DELETE":
+            tenant.sessions.discard(self._session())
+            self._reply(204)
+        else:
+            if self._session() not in tenant.sessions:
+                raise MockError(401, "AUTHENTICATION_FAILED", "session is not valid")
+            self._reply(200, {"authType": "ADMIN_LOGIN"})
+
+    def _dispatch(self, method, path, query, body):
+        tenant = self.server.tenant
+        parts = path.split("/")
+
+        if path == "status" and method == "GET":
+            return 200, {"status": tenant.activation_status()}
+        if path == "status/activate" and method == "POST":
+            tenant.activation_status()
+            if tenant.status == "PENDING":
+                tenant.status = "INPROGRESS"
+                tenant.activated_at = time.time()
+            return 200, {"status": tenant.status}
+
+        if parts[0] == "urlCategories":
+            return self._url_categories(method, parts[1:], query, body)
+        if parts[0] == "webApplicationRules" and len(parts) >= 2:
+            return self._cloud_app_rules(method, parts[1], parts[2:], body)
+        if path == "vips/recommendedList" and method == "GET":
+            vips = tenant.list_collection("vips", {})
+            return 200, [
+                {
+                    "id": v["id"],
+                    "virtualIp": v["virtualIp"],
+                    "datacenter": v["datacenter"],
+                    "city": v["city"],
+                    "greDomainName": v["greDomainName"],
+                }
+                for v in vips[:4]
+            ]
+        if path == "greTunnels/availableInternalIpRanges" and method == "GET":
+            return 200, tenant.available_gre_ranges(int(query.get("limit", 10)))
+        if path == "vpnCredentials/bulkDelete" and method == "POST":
+            for obj_id in (body or {}).get("ids") or []:
+                tenant.delete_object("vpnCredentials", str(obj_id))
+            return 204, None
+        if path == "locations/lite" and method == "GET":
+            return 200, tenant.list_locations_lite(query)
+        if (
+            len(parts) == 3
+            and parts[0] == "locations"
+            and parts[2] == "sublocations"
+            and method == "GET"
+        ):
+            return 200, tenant.list_sub_locations(parts[1], query)
+
+        collection, obj_id = self._split(path)
+        if collection in COLLECTIONS:
+            if obj_id is None:
+                if method == "GET":
+                    return 200, tenant.list_collection(collection, query)
+                if method == "POST":
+                    return 200, tenant.create_object(collection, body)
+            else:
+                if method == "GET":
+                    return 200, tenant.get_object(collection, obj_id)
+                if method == "PUT":
+                    return 200, tenant.update_object(collection, obj_id, body)
+                if method == "DELETE":
+                    tenant.delete_object(collection, obj_id)
+                    return 204, None
+            raise MockError(405, "METHOD_NOT_ALLOWED", "%s %s" % (method, path))
+        return self._documents(method, path, body)
+
+    @staticmethod
+    def _split(path):
+        """Splits ``collection/id`` paths, the collection may contain a slash."""
+        if path in COLLECTIONS:
+            return path, None
+        collection, _, obj_id = path.rpartition("/")
+        if collection in COLLECTIONS:
+            return collection, obj_id
+        return path, None
+
+    def _url_categories(self, method, parts, query, body):
+        tenant = self.server.tenant
+        if not parts:
+            if method == "GET":
+                return 200, tenant.list_url_categories(query)
+            if method == "POST":
+                return 200, tenant.create_url_category(body or {})
+        elif parts == ["urlQuota"] and method == "GET":
+            used = sum(len(c.get("urls") or []) for c in tenant.url_categories.values())
+            return 200, {
+                "uniqueUrlsProvisioned": used,
+                "remainingUrlsQuota": max(25000 - used, 0),
+            }
+        elif len(parts) == 1:
+            if method == "GET":
+                return 200, tenant.get_url_category(parts[0])
+            if method == "PUT":
+                return 200, tenant.update_url_category(
+                    parts[0], body or {}, query.get("action")
+                )
+            if method == "DELETE":
+                tenant.delete_url_category(parts[0])
+                return 204, None
+        raise MockError(405, "METHOD_NOT_ALLOWED", "%s urlCategories" % method)
+
+    def _cloud_app_rules(self, method, rule_type, parts, body):
+        tenant = self.server.tenant
+        rules = tenant.cloud_app_rules_of(rule_type)
+        if not parts:
+            if method == "GET":
+                return 200, sorted(rules.values(), key=lambda r: r.get("order", 0))
+            if method == "POST":
+                rule = dict(body or {})
+                rule["id"] = tenant._new_id()
+                rules[str(rule["id"])] = rule
+                tenant.changed()
+                return 200, rule
+        elif len(parts) == 1:
+            rule = rules.get(parts[0])
+            if rule is None:
+                raise MockError(
+                    404, "RESOURCE_NOT_FOUND", "rule %s not found" % parts[0]
+                )
+            if method == "GET":
+                return 200, rule
+            if method == "PUT":
+                rule = dict(body or {})
+                rule["id"] = int(parts[0])
+                rules[parts[0]] = rule
+                tenant.changed()
+                return 200, rule
+            if method == "DELETE":
+                del rules[parts[0]]
+                tenant.changed()
+                return 204, None
+        raise MockError(405, "METHOD_NOT_ALLOWED", "%s webApplicationRules" % method)
+
+    def _documents(self, method, path, body):
+        """
+        Generic store for the paths without a dedicated model: settings
+        documents (GET/PUT on the path) and simple collections (POST on the
+        path, GET/PUT/DELETE on ``path/id``).
+        """
+        tenant = self.server.tenant
+        documents = tenant.documents
+        parent, _, obj_id = path.rpartition("/")
+        if method == "GET":
+            if path in documents:
+                return 200, documents[path]
+            if parent in documents and isinstance(documents[parent], list):
+                for obj in documents[parent]:
+                    if str(obj.get("id")) == obj_id:
+                        return 200, obj
+                raise MockError(404, "RESOURCE_NOT_FOUND", path)
+            return 200, []
+        if method == "PUT":
+            if parent in documents and isinstance(documents[parent], list):
+                items = documents[parent]
+                for index, obj in enumerate(items):
+                    if str(obj.get("id")) == obj_id:
+                        items[index] = dict(body or {}, id=obj.get("id"))
+                        tenant.changed()
+                        return 200, items[index]
+                raise MockError(404, "RESOURCE_NOT_FOUND", path)
+            documents[path] = body
+            tenant.changed()
+            return 200, body
+        if method == "POST":
+            obj = dict(body or {}) if isinstance(body, dict) else {"value": body}
+            obj["id"] = tenant._new_id()
+            items = documents.setdefault(path, [])
+            if not isinstance(items, list):
+                return 200, obj
+            items.append(obj)
+            tenant.changed()
+            return 200, obj
+        if method == "DELETE":
+            items = documents.get(parent)
+            if isinstance(items, list):
+                for obj in items:
+                    if str(obj.get("id")) == obj_id:
+                        items.remove(obj)
+                        tenant.changed()
+                        return 204, None
+            raise MockError(404, "RESOURCE_NOT_FOUND", path)
+        raise MockError(405, "METHOD_NOT_ALLOWED", "%s %s" % (method, path))
+
+
+class MockZIAServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address,
+        tenant,
+        latency=0.0,
+        max_rps=None,
+        throttle_rate=0.0,
+        retry_after=1,
+        verbose=False,
+    ):
+        ThreadingHTTPServer.__init__(self, address, MockRequestHandler)
+        self.tenant = tenant
+        self.latency = latency
+        self.max_rps = max_rps
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.verbose = verbose
+        self._throttle_lock = threading.Lock()
+        self._window = []
+        self._random = random.Random(tenant.seed)
+
+    def throttled(self):
+        """Decides whether a request is answered with 429."""
+        with self._throttle_lock:
+            if self.throttle_rate and self._random.random() < self.throttle_rate:
+                return True
+            if not self.max_rps:
+                return False
+            now = time.time()
+            self._window = [t for t in self._window if now - t < 1.0]
+            if len(self._window) >= self.max_rps:
+                return True
+            self._window.append(now)
+            return False
+
+
+def start(
+    host="127.0.0.1",
+    port=0,
+    dataset_size=100,
+    urls_per_category=100,
+    rule_count=None,
+    category_count=3,
+    latency=0.0,
+    max_rps=None,
+    throttle_rate=0.0,
+    retry_after=1,
+    seed=0,
+    verbose=False,
+):
+    """Starts the server in a background thread and returns it."""
+    tenant = MockTenant(
+        dataset_size, urls_per_category, seed, rule_count, category_count
+    )
+    server = MockZIAServer(
+        (host, port), tenant, latency, max_rps, throttle_rate, retry_after, verbose
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock of the ZIA API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--dataset-size",
+        type=int,
+        default=100,
+        help="number of seeded users (locations, static IPs and groups scale with it)",
+    )
+    parser.add_argument("--urls-per-category", type=int, default=100)
+    parser.add_argument(
+        "--rules",
+        type=int,
+        default=None,
+        help="number of seeded firewall and URL filtering rules",
+    )
+    parser.add_argument(
+        "--categories",
+        type=int,
+        default=3,
+        help="number of seeded custom URL categories",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds added to every response"
+    )
+    parser.add_argument(
+        "--max-rps",
+        type=int,
+        default=None,
+        help="answer 429 above this number of requests per second",
+    )
+    parser.add_argument(
+        "--throttle-rate",
+        type=float,
+        default=0.0,
+        help="share of requests answered with 429",
+    )
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    tenant = MockTenant(
+        args.dataset_size,
+        args.urls_per_category,
+        args.seed,
+        args.rules,
+        args.categories,
+    )
+    server = MockZIAServer(
+        (args.host, args.port),
+        tenant,
+        args.latency,
+        args.max_rps,
+        args.throttle_rate,
+        args.retry_after,
+        args.verbose,
+    )
+    print(
+        "ZIA mock listening, export ZIA_OVERRIDE_URL=http://%s:%d/api/v1"
+        % (args.host, server.server_port)
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
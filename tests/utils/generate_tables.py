@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+"""
+Regenerates plugins/module_utils/zia_tables.py, the country code and time
+zone tables the modules validate their parameters against, from pycountry
+and pytz. Run it from the root of the collection after upgrading either
+library:
+
+    python tests/utils/generate_tables.py
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+
+import pycountry
+import pytz
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+OUTPUT = os.path.join(ROOT, "plugins", "module_utils", "zia_tables.py")
+HEADER = os.path.join(ROOT, "plugins", "module_utils", "zia_firewall.py")
+
+TEMPLATE = '''
+"""
+Lookup tables generated by tests/utils/generate_tables.py from pycountry
+%(pycountry)s and pytz %(pytz)s, so that the modules do not load these libraries
+and their data at run time. Do not edit, regenerate the file instead.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+# ISO 3166-1 alpha-2 country codes
+ISO3166_ALPHA2 = frozenset(
+    (
+%(countries)s
+    )
+)
+
+# IANA time zone IDs
+TIMEZONES = frozenset(
+    (
+%(timezones)s
+    )
+)
+'''
+
+
+def _items(values):
+    return "\n".join('        "%s",' % value for value in sorted(values))
+
+
+def _version(module, distribution):
+    version = getattr(module, "__version__", None)
+    if version is None:
+        from importlib.metadata import version as distribution_version
+
+        version = distribution_version(distribution)
+    return version
+
+
+def main():
+    # The generated file carries the collection's license header
+    with open(HEADER) as f:
+        header = "".join(f.readlines()[:23])
+    content = header + TEMPLATE.lstrip("\n") % {
+        "pycountry": _version(pycountry, "pycountry"),
+        "pytz": _version(pytz, "pytz"),
+        "countries": _items(country.alpha_2 for country in pycountry.countries),
+        "timezones": _items(pytz.all_timezones),
+    }
+    with open(OUTPUT, "w") as f:
+        f.write(content)
+    print("Wrote %s" % OUTPUT)
+
+
+if __name__ == "__main__":
+    main()